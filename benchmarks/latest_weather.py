@@ -0,0 +1,90 @@
+"""
+"Latest reading per district" against a large seeded weather_data table.
+
+Requires PostgreSQL (seeding uses generate_series). Compares one query per
+district against ``WeatherData.objects.latest_for`` and prints the plan.
+
+Usage::
+
+    DJANGO_SETTINGS_MODULE=config.settings.local python -m benchmarks.latest_weather --rows 10000000
+"""
+
+import argparse
+import os
+import time
+
+import django
+
+
+def seed(rows: int, districts: int) -> None:
+    from django.conf import settings
+    from django.db import connection
+
+    # latest_for는 recent() 구간만 보므로 모든 측정값을 WEATHER_RECENT_WINDOW 안에 고르게 둔다
+    per_district = -(-rows // districts)
+    step = settings.WEATHER_RECENT_WINDOW * 0.99 / per_district
+
+    with connection.cursor() as cursor:
+        cursor.execute("TRUNCATE weather_data CASCADE")
+        # 구마다 시간 순으로 rows / districts개의 측정값을 만든다
+        cursor.execute(
+            """
+            INSERT INTO weather_data (
+                district, neighborhood, aqi, temperature, humidity, wind_speed, pm10, pm25,
+                precipitation, walking_score, forecast_time, created_at, updated_at
+            )
+            SELECT
+                'district-' || (n %% %(districts)s), '',
+                (random() * 300)::int, random() * 40, random() * 100, random() * 10,
+                random() * 150, random() * 150, 0, (random() * 100)::int,
+                now() - make_interval(secs => (n / %(districts)s) * %(step)s), now(), now()
+            FROM generate_series(1, %(rows)s) AS n
+            """,
+            {"rows": rows, "districts": districts, "step": step},
+        )
+        cursor.execute("ANALYZE weather_data")
+
+
+def timed(label: str, func, repeat: int) -> None:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label:<24} {elapsed * 1000:8.2f} ms")  # noqa: T201
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--districts", type=int, default=500)
+    parser.add_argument("--lookup", type=int, default=50, help="Districts per lookup.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+    django.setup()
+
+    from main_project.apps.weather.models import WeatherData
+
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed(args.rows, args.districts)
+        print(f"seeded {args.rows:,} rows in {time.perf_counter() - started:.1f}s")  # noqa: T201
+
+    locations = [(f"district-{n}", "") for n in range(args.lookup)]
+
+    def per_district():
+        for district, neighborhood in locations:
+            WeatherData.objects.filter(district=district, neighborhood=neighborhood).order_by("-forecast_time").first()
+
+    def latest_for():
+        list(WeatherData.objects.latest_for(locations))
+
+    timed("query per district", per_district, args.repeat)
+    timed("latest_for", latest_for, args.repeat)
+    print(WeatherData.objects.latest_for(locations).explain(analyze=True))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Load test for ``/api/weather/current/`` running under gunicorn against the local
+WAQI stub (main_project.apps.weather.tests.waqi_stub).
+
+Scenarios:
+
+- cold:     every request is a new location, so each one is a cache miss and an upstream fetch
+- warm:     a pool of locations is fetched once, then hammered (cache hits)
+- degraded: the same pool with the cache emptied and the stub slow and failing,
+            so requests go through the circuit breaker and DB fallback
+
+Each scenario starts a fresh gunicorn, so per-process caches (LocMemCache) start
+empty. With Redis the harness also clears the shared cache. The database must
+already be migrated. Results can be saved and compared against a baseline::
+
+    DJANGO_SETTINGS_MODULE=config.settings.local python -m benchmarks.load_test --json baseline.json
+    DJANGO_SETTINGS_MODULE=config.settings.local python -m benchmarks.load_test --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+
+import django
+import httpx
+
+from main_project.apps.weather.tests.waqi_stub import WaqiStubServer
+
+SCENARIOS = ("cold", "warm", "degraded")
+
+
+@dataclass
+class Result:
+    scenario: str
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def percentile(values: list, fraction: float) -> float:
+    return values[max(0, math.ceil(fraction * len(values)) - 1)] * 1000 if values else 0.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def gunicorn(args, stub: WaqiStubServer):
+    port = free_port()
+    env = {
+        **os.environ,
+        "WEATHER_API_BASE_URL": stub.base_url,
+        "WEATHER_API_KEY": "load-test",
+        "REQUEST_TIMING_SLOW_THRESHOLD_MS": "60000",
+    }
+    process = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable, "-m", "gunicorn", "config.wsgi",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(args.workers),
+            "--log-level", "warning",
+        ],
+        cwd=Path(__file__).resolve().parent.parent,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/api/weather/", timeout=1)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("gunicorn did not start") from None
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def drive(base_url: str, token: str, locations: list, concurrency: int) -> tuple[list, int, float]:
+    latencies, errors = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers={"Authorization": f"Token {token}"},
+                                 limits=limits, timeout=60) as client:
+        async def one(district: str, neighborhood: str) -> None:
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(
+                        "/api/weather/current/", params={"district": district, "neighborhood": neighborhood},
+                    )
+                    failed = response.status_code != 200  # noqa: PLR2004
+                except httpx.HTTPError:
+                    failed = True
+                latencies.append(time.perf_counter() - started)
+                errors += failed
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(*location) for location in locations))
+        elapsed = time.perf_counter() - started
+    return sorted(latencies), errors, elapsed
+
+
+def clear_shared_cache() -> None:
+    from django.core.cache import cache
+
+    cache.clear()
+
+
+def run_scenario(name: str, args, stub: WaqiStubServer, token: str) -> Result:
+    pool = [(f"load-{name}-{n}", "동") for n in range(args.locations)]
+    if name == "cold":
+        stamp = int(time.time())
+        locations = [(f"load-cold-{stamp}-{n}", "동") for n in range(args.requests)]
+    else:
+        locations = [pool[n % len(pool)] for n in range(args.requests)]
+
+    clear_shared_cache()
+    if name == "degraded":
+        # 풀의 위치를 한 번씩 조회해 DB에 대체 응답용 값을 만든 뒤 캐시를 비우고 업스트림을 망가뜨린다
+        with gunicorn(args, stub) as base_url:
+            asyncio.run(drive(base_url, token, pool, args.concurrency))
+        clear_shared_cache()
+        stub.latency, stub.error_rate = args.degraded_latency_ms / 1000, args.degraded_error_rate
+
+    try:
+        with gunicorn(args, stub) as base_url:
+            if name == "warm":
+                # 워커별 LocMemCache도 채워지도록 풀을 워커 수만큼 반복해서 조회한다
+                asyncio.run(drive(base_url, token, pool * args.workers, args.concurrency))
+            latencies, errors, elapsed = asyncio.run(drive(base_url, token, locations, args.concurrency))
+    finally:
+        stub.latency, stub.error_rate = args.upstream_latency_ms / 1000, 0.0
+
+    return Result(
+        scenario=name,
+        requests=len(latencies),
+        errors=errors,
+        rps=round(len(latencies) / elapsed, 1),
+        p50_ms=round(percentile(latencies, 0.50), 2),
+        p95_ms=round(percentile(latencies, 0.95), 2),
+        p99_ms=round(percentile(latencies, 0.99), 2),
+    )
+
+
+def report(results: list, baseline: dict) -> None:
+    header = f"{'scenario':<10}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)  # noqa: T201
+    for result in results:
+        print(  # noqa: T201
+            f"{result.scenario:<10}{result.requests:>10}{result.errors:>8}{result.rps:>10}"
+            f"{result.p50_ms:>10}{result.p95_ms:>10}{result.p99_ms:>10}",
+        )
+        base = baseline.get(result.scenario)
+        if base:
+            changes = "".join(
+                f"{(getattr(result, key) / base[key] - 1) * 100 if base[key] else 0:>+9.1f}%"
+                for key in ("rps", "p50_ms", "p95_ms", "p99_ms")
+            )
+            print(f"{'  vs base':<28}{changes}")  # noqa: T201
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--locations", type=int, default=50, help="Location pool for warm/degraded.")
+    parser.add_argument("--upstream-latency-ms", type=float, default=80.0)
+    parser.add_argument("--degraded-latency-ms", type=float, default=2000.0)
+    parser.add_argument("--degraded-error-rate", type=float, default=0.5)
+    parser.add_argument("--json", type=Path, help="Write results to this file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against results written by --json.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+    django.setup()
+
+    from rest_framework.authtoken.models import Token
+
+    from main_project.apps.users.models import User
+
+    user, _ = User.objects.get_or_create(email="loadtest@example.com", defaults={"nickname": "loadtest"})
+    token, _ = Token.objects.get_or_create(user=user)
+    baseline = (
+        {result["scenario"]: result for result in json.loads(args.baseline.read_text())}
+        if args.baseline else {}
+    )
+
+    with WaqiStubServer(serve_any=True, latency=args.upstream_latency_ms / 1000) as stub:
+        results = [run_scenario(name, args, stub, token.key) for name in args.scenarios]
+
+    report(results, baseline)
+    if args.json:
+        args.json.write_text(json.dumps([asdict(result) for result in results], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Logging cost on the request thread: the old verbose StreamHandler vs the
+JSON formatter behind QueueStreamHandler.
+
+Each simulated request logs ``--lines`` records to os.devnull. ``--write-latency-us``
+adds a sleep to every write to model a slow sink (a full pipe or a stalled log
+collector). That is the case the queue handler is for: on an idle devnull the
+listener thread only competes for the GIL.
+
+Usage::
+
+    python -m benchmarks.logging_overhead --requests 20000 --lines 5
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from main_project.apps.weather.log import JsonFormatter
+from main_project.apps.weather.log import QueueStreamHandler
+from main_project.apps.weather.log import RequestIdFilter
+
+VERBOSE_FORMAT = "%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d %(message)s"
+
+
+class SlowStream:
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text: str) -> int:
+        time.sleep(self.latency)
+        return self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def make_logger(handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"benchmarks.logging_overhead.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+def per_request(logger: logging.Logger, requests: int, lines: int) -> float:
+    started = time.perf_counter()
+    for n in range(requests):
+        for line in range(lines):
+            logger.info("Handled weather request %d step %d", n, line, extra={"district": "강남구"})
+    return (time.perf_counter() - started) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--lines", type=int, default=5)
+    parser.add_argument("--write-latency-us", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as null:  # noqa: PTH123
+        devnull = SlowStream(null, args.write_latency_us / 1e6) if args.write_latency_us else null
+        before = logging.StreamHandler(devnull)
+        before.setFormatter(logging.Formatter(VERBOSE_FORMAT))
+
+        after = QueueStreamHandler(devnull, maxsize=args.requests * args.lines)
+        after.setFormatter(JsonFormatter())
+        after.addFilter(RequestIdFilter())
+
+        for label, handler in (("verbose StreamHandler", before), ("JSON QueueStreamHandler", after)):
+            elapsed = per_request(make_logger(handler), args.requests, args.lines)
+            print(f"{label:<24} {elapsed * 1e6:8.2f} µs/request")  # noqa: T201
+
+        started = time.perf_counter()
+        after.close()
+        print(f"queue drained in {time.perf_counter() - started:.3f}s, dropped {after.dropped}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Per-request overhead of RequestTimingMiddleware around a no-op view.
+
+Usage::
+
+    DJANGO_SETTINGS_MODULE=config.settings.local python -m benchmarks.request_timing --requests 200000
+"""
+
+import argparse
+import os
+import time
+
+import django
+
+
+def per_request(handler, request, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        handler(request)
+    return (time.perf_counter() - started) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+    django.setup()
+
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.test import override_settings
+
+    from main_project.apps.weather.timing import RequestTimingMiddleware
+
+    response = HttpResponse("ok")
+
+    def view(request):
+        return response
+
+    request = RequestFactory().get("/api/weather/")
+    baseline = per_request(view, request, args.requests)
+    print(f"no middleware      {baseline * 1e6:8.2f} µs")  # noqa: T201
+
+    for label, sample_rate in (("sampled", 1.0), ("unsampled", 0.0)):
+        with override_settings(REQUEST_TIMING_SAMPLE_RATE=sample_rate, REQUEST_TIMING_SLOW_THRESHOLD_MS=10_000):
+            middleware = RequestTimingMiddleware(view)
+        elapsed = per_request(middleware, request, args.requests)
+        print(f"{label:<18} {elapsed * 1e6:8.2f} µs  (+{(elapsed - baseline) * 1e6:.2f} µs)")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
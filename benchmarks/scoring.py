@@ -0,0 +1,56 @@
+"""
+Walking score throughput: scalar vs NumPy batch scorer.
+
+Usage::
+
+    python -m benchmarks.scoring --rows 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from main_project.apps.weather.scoring import calculate_walking_score
+from main_project.apps.weather.scoring import calculate_walking_scores
+
+
+def make_columns(rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    aqi = rng.integers(0, 500, rows).astype(float)
+    temperature = rng.uniform(-20, 45, rows).round(1)
+    pm25 = rng.uniform(0, 300, rows).round(1)
+    # 실제 데이터처럼 일부 값은 비어 있다
+    for column in (aqi, temperature, pm25):
+        column[rng.random(rows) < 0.05] = np.nan  # noqa: PLR2004
+    return aqi, temperature, pm25
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    aqi, temperature, pm25 = make_columns(args.rows)
+    # values_list()가 돌려주는 형태(파이썬 객체 튜플)로 스칼라 경로를 측정한다
+    rows = [
+        tuple(None if np.isnan(value) else float(value) for value in row)
+        for row in zip(aqi, temperature, pm25, strict=True)
+    ]
+
+    started = time.perf_counter()
+    scalar = [calculate_walking_score(*row) for row in rows]
+    scalar_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = calculate_walking_scores(aqi, temperature, pm25)
+    batch_elapsed = time.perf_counter() - started
+
+    assert batch.tolist() == scalar
+    print(f"rows:   {args.rows:,}")  # noqa: T201
+    print(f"scalar: {args.rows / scalar_elapsed:,.0f} rows/s ({scalar_elapsed:.3f}s)")  # noqa: T201
+    print(f"batch:  {args.rows / batch_elapsed:,.0f} rows/s ({batch_elapsed:.3f}s)")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
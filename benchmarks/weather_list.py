@@ -0,0 +1,115 @@
+"""
+Weather list endpoint latency: DRF ModelSerializer + JSONRenderer vs the
+``.values()`` fast path + ORJSONRenderer.
+
+Seeds rows inside a transaction that is rolled back afterwards.
+
+Usage::
+
+    DJANGO_SETTINGS_MODULE=config.settings.local python -m benchmarks.weather_list --rows 5000 --page-size 500
+"""
+
+import argparse
+import os
+import statistics
+import time
+from datetime import time as clock
+from datetime import timedelta
+
+import django
+
+
+def seed(rows: int) -> None:
+    from django.utils import timezone
+
+    from main_project.apps.weather.models import WalkingCondition
+    from main_project.apps.weather.models import WeatherData
+
+    now = timezone.now()
+    weather_data = WeatherData.objects.bulk_create(
+        WeatherData(
+            district=f"district-{n % 25}",
+            aqi=n % 300,
+            temperature=20.5,
+            humidity=55.0,
+            wind_speed=2.5,
+            pm10=40.0,
+            pm25=20.0,
+            walking_score=n % 100,
+            forecast_time=now - timedelta(minutes=n),
+        )
+        for n in range(rows)
+    )
+    WalkingCondition.objects.bulk_create(
+        WalkingCondition(
+            weather_data=row,
+            recommendation="GOOD",
+            best_time_start=clock(6, 0),
+            best_time_end=clock(9, 0),
+        )
+        for row in weather_data
+    )
+
+
+def measure(view, request_factory, user, params: dict, repeat: int) -> list:
+    from rest_framework.test import force_authenticate
+
+    timings = []
+    for _ in range(repeat):
+        request = request_factory.get("/api/weather/", params)
+        force_authenticate(request, user=user)
+        started = time.perf_counter()
+        response = view(request)
+        response.render()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+    django.setup()
+
+    from django.db import transaction
+    from django.test import override_settings
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIRequestFactory
+
+    from main_project.apps.users.models import User
+    from main_project.apps.weather.api.renderers import ORJSONRenderer
+    from main_project.apps.weather.api.views import WeatherViewSet
+
+    variants = (
+        ("ModelSerializer + json", False, JSONRenderer),
+        ("ModelSerializer + orjson", False, ORJSONRenderer),
+        ("values() + json", True, JSONRenderer),
+        ("values() + orjson", True, ORJSONRenderer),
+    )
+    params = {"page_size": args.page_size}
+
+    with transaction.atomic():
+        seed(args.rows)
+        user = User(email="bench@example.com", nickname="bench")
+        request_factory = APIRequestFactory()
+
+        for label, fast, renderer in variants:
+            view = WeatherViewSet.as_view({"get": "list"}, renderer_classes=[renderer])
+            with override_settings(WEATHER_FAST_SERIALIZER=fast):
+                measure(view, request_factory, user, params, 3)
+                timings = measure(view, request_factory, user, params, args.repeat)
+            timings.sort()
+            print(  # noqa: T201
+                f"{label:<26} p50 {statistics.median(timings) * 1000:8.2f} ms"
+                f"   p95 {timings[int(len(timings) * 0.95) - 1] * 1000:8.2f} ms",
+            )
+
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -92,6 +92,7 @@ THIRD_PARTY_APPS = [
 
 LOCAL_APPS = [
     "main_project.users",
+    "main_project.apps.weather",
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -140,6 +141,8 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "main_project.apps.weather.log.RequestIdMiddleware",
+    "main_project.apps.weather.timing.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -249,22 +252,37 @@ DJANGO_ADMIN_FORCE_ALLAUTH = env.bool("DJANGO_ADMIN_FORCE_ALLAUTH", default=Fals
 # https://docs.djangoproject.com/en/dev/ref/settings/#logging
 # See https://docs.djangoproject.com/en/dev/topics/logging for
 # more details on how to customize your logging configuration.
+# Console output is one JSON object per line, tagged with the request ID. Records are
+# queued and written by a background thread so request threads never block on I/O.
+# Set DJANGO_LOG_FORMAT=verbose for the plain text format.
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {"()": "main_project.apps.weather.log.RequestIdFilter"},
+        # At most 10 identical weather fetch/prefetch failures per logger per minute
+        "weather_rate_limit": {"()": "main_project.apps.weather.log.RateLimitFilter", "rate": 10, "per": 60},
+    },
     "formatters": {
         "verbose": {
             "format": "%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d %(message)s",
         },
+        "json": {"()": "main_project.apps.weather.log.JsonFormatter"},
     },
     "handlers": {
         "console": {
-            "level": "DEBUG",
-            "class": "logging.StreamHandler",
-            "formatter": "verbose",
+            "level": "INFO",
+            "class": "main_project.apps.weather.log.QueueStreamHandler",
+            "formatter": env("DJANGO_LOG_FORMAT", default="json"),
+            "filters": ["request_id"],
         },
     },
     "root": {"level": "INFO", "handlers": ["console"]},
+    "loggers": {
+        "main_project.apps.weather.services": {"filters": ["weather_rate_limit"]},
+        "main_project.apps.weather.prefetch": {"filters": ["weather_rate_limit"]},
+        "main_project.apps.weather.providers": {"filters": ["weather_rate_limit"]},
+    },
 }
 
 REDIS_URL = env("REDIS_URL", default="redis://localhost:6379/0")
@@ -315,3 +333,94 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+
+# Weather
+# ------------------------------------------------------------------------------
+# https://aqicn.org/json-api/doc/
+WEATHER_API_KEY = env("WEATHER_API_KEY", default="")
+WEATHER_API_BASE_URL = env("WEATHER_API_BASE_URL", default="http://api.waqi.info/feed/")
+WEATHER_API_TIMEOUT = env.float("WEATHER_API_TIMEOUT", default=10.0)
+# Size of the keep-alive connection pool shared by each worker process
+WEATHER_API_MAX_CONNECTIONS = env.int("WEATHER_API_MAX_CONNECTIONS", default=20)
+# Cache alias used for the read-through WeatherData cache
+WEATHER_CACHE_ALIAS = env("WEATHER_CACHE_ALIAS", default="default")
+# Upper bound on how long a cached reading is served as fresh (seconds)
+WEATHER_CACHE_TTL = env.int("WEATHER_CACHE_TTL", default=60 * 60)
+# WAQI publishes hourly; fresh entries expire this long after the top of the hour
+WEATHER_CACHE_UPDATE_DELAY = env.int("WEATHER_CACHE_UPDATE_DELAY", default=10 * 60)
+# How long an expired reading is kept around as a stale fallback (seconds)
+WEATHER_CACHE_STALE_TTL = env.int("WEATHER_CACHE_STALE_TTL", default=6 * 60 * 60)
+# Only one worker fetches a location at a time; the lock outlives the 10s upstream timeout
+WEATHER_FETCH_LOCK_TIMEOUT = env.int("WEATHER_FETCH_LOCK_TIMEOUT", default=15)
+# How long other workers wait for the lock holder before falling back (seconds)
+WEATHER_FETCH_WAIT_TIMEOUT = env.float("WEATHER_FETCH_WAIT_TIMEOUT", default=12.0)
+WEATHER_FETCH_POLL_INTERVAL = env.float("WEATHER_FETCH_POLL_INTERVAL", default=0.1)
+# Hot-path reads only look this far back so PostgreSQL prunes old weather_data partitions
+WEATHER_RECENT_WINDOW = env.int("WEATHER_RECENT_WINDOW", default=24 * 60 * 60)
+# Cursor pagination for the weather list endpoint
+WEATHER_PAGE_SIZE = env.int("WEATHER_PAGE_SIZE", default=50)
+WEATHER_MAX_PAGE_SIZE = env.int("WEATHER_MAX_PAGE_SIZE", default=500)
+# Build weather list responses straight from .values() rows instead of model instances
+WEATHER_FAST_SERIALIZER = env.bool("WEATHER_FAST_SERIALIZER", default=True)
+WEATHER_RENDERER_CLASSES = [
+    "main_project.apps.weather.api.renderers.ORJSONRenderer",
+    "rest_framework.renderers.BrowsableAPIRenderer",
+]
+# Upper bound on locations per /api/weather/bulk/ request
+WEATHER_BULK_MAX_LOCATIONS = env.int("WEATHER_BULK_MAX_LOCATIONS", default=50)
+# Circuit breaker around WAQI, shared by all workers through the cache.
+# Opens after THRESHOLD failures within WINDOW seconds and probes again after RESET_TIMEOUT seconds.
+WEATHER_CIRCUIT_FAILURE_THRESHOLD = env.int("WEATHER_CIRCUIT_FAILURE_THRESHOLD", default=5)
+WEATHER_CIRCUIT_FAILURE_WINDOW = env.int("WEATHER_CIRCUIT_FAILURE_WINDOW", default=60)
+WEATHER_CIRCUIT_RESET_TIMEOUT = env.int("WEATHER_CIRCUIT_RESET_TIMEOUT", default=30)
+# Per-request timing: Server-Timing header and slow-request log.
+# Only SAMPLE_RATE of requests get the db/cache/upstream breakdown; all are checked against the threshold.
+REQUEST_TIMING_SAMPLE_RATE = env.float("REQUEST_TIMING_SAMPLE_RATE", default=1.0)
+REQUEST_TIMING_SLOW_THRESHOLD_MS = env.float("REQUEST_TIMING_SLOW_THRESHOLD_MS", default=500.0)
+# Server-Timing goes to staff users only; REQUEST_TIMING_HEADER sends it to everyone (local.py).
+REQUEST_TIMING_HEADER = env.bool("REQUEST_TIMING_HEADER", default=False)
+# (district, neighborhood) -> WAQI station index written by `manage.py build_location_index`.
+# Neighborhoods missing from it (or a missing file) keep the "<district>-<neighborhood>" feed.
+# The index is not shipped with the repo; without it the KMA provider uses Seoul district
+# office coordinates (stations.DISTRICT_CENTROIDS) and fails for districts outside Seoul.
+WEATHER_LOCATION_INDEX_FILE = env(
+    "WEATHER_LOCATION_INDEX_FILE",
+    default=str(APPS_DIR / "apps" / "weather" / "data" / "location_index.json"),
+)
+# Sources merged into each WeatherData reading and its hourly forecast, called concurrently
+# with per-provider timeouts. Later providers' non-null values override earlier ones, so
+# KMA's meteorological values win over WAQI's station sensors. A failing "required"
+# provider fails the reading.
+# The KMA provider is skipped until WEATHER_KMA_API_KEY is set.
+WEATHER_PROVIDERS = [
+    {"class": "main_project.apps.weather.providers.WaqiProvider"},
+    {"class": "main_project.apps.weather.providers.KmaProvider", "timeout": 3.0},
+]
+WEATHER_KMA_API_KEY = env("WEATHER_KMA_API_KEY", default="")
+WEATHER_KMA_BASE_URL = env(
+    "WEATHER_KMA_BASE_URL",
+    default="http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/",
+)
+# Hourly forecast kept per refresh, and the best walking window searched in its first 24 hours.
+WEATHER_FORECAST_HOURS = env.int("WEATHER_FORECAST_HOURS", default=48)
+WEATHER_WALK_WINDOW_HOURS = env.int("WEATHER_WALK_WINDOW_HOURS", default=3)
+# Walks are only suggested between these local hours (end exclusive)
+WEATHER_WALK_DAY_START = env.int("WEATHER_WALK_DAY_START", default=6)
+WEATHER_WALK_DAY_END = env.int("WEATHER_WALK_DAY_END", default=22)
+# Air-quality alerts. Readings with a warning enqueue one alert per location and level every
+# DEDUPE_WINDOW seconds; `manage.py send_weather_alerts` fans them out to UserLocation
+# subscribers and delivers them in batches through WEATHER_ALERT_TRANSPORT.
+WEATHER_ALERT_DEDUPE_WINDOW = env.int("WEATHER_ALERT_DEDUPE_WINDOW", default=3 * 60 * 60)
+# Each user gets at most USER_LIMIT alerts per USER_WINDOW seconds; the rest are suppressed
+WEATHER_ALERT_USER_LIMIT = env.int("WEATHER_ALERT_USER_LIMIT", default=3)
+WEATHER_ALERT_USER_WINDOW = env.int("WEATHER_ALERT_USER_WINDOW", default=24 * 60 * 60)
+WEATHER_ALERT_BATCH_SIZE = env.int("WEATHER_ALERT_BATCH_SIZE", default=1000)
+# A batch the transport rejects is retried after RETRY_BACKOFF seconds, doubling each time,
+# and marked FAILED after MAX_ATTEMPTS failures
+WEATHER_ALERT_RETRY_BACKOFF = env.int("WEATHER_ALERT_RETRY_BACKOFF", default=60)
+WEATHER_ALERT_MAX_ATTEMPTS = env.int("WEATHER_ALERT_MAX_ATTEMPTS", default=5)
+# LogTransport only logs; FileTransport ({"class": ..., "path": ...}) appends JSON lines
+WEATHER_ALERT_TRANSPORT = {"class": "main_project.apps.weather.notifications.LogTransport"}
+# update_rollups only aggregates rows whose updated_at is at least this old (seconds), so
+# transactions still in flight (e.g. under ATOMIC_REQUESTS) commit before the watermark passes them
+WEATHER_ROLLUP_SAFETY_LAG = env.int("WEATHER_ROLLUP_SAFETY_LAG", default=5 * 60)
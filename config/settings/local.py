@@ -60,3 +60,5 @@ INSTALLED_APPS += ["django_extensions"]
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Server-Timing on every response, not just for staff users
+REQUEST_TIMING_HEADER = env.bool("REQUEST_TIMING_HEADER", default=True)
@@ -2,6 +2,7 @@
 from .base import *  # noqa: F403
 from .base import DATABASES
 from .base import INSTALLED_APPS
+from .base import LOGGING
 from .base import REDIS_URL
 from .base import SPECTACULAR_SETTINGS
 from .base import env
@@ -161,26 +162,22 @@ INSTALLED_APPS = ["collectfasta", *INSTALLED_APPS]
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
-    "filters": {"require_debug_false": {"()": "django.utils.log.RequireDebugFalse"}},
-    "formatters": {
-        "verbose": {
-            "format": "%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d %(message)s",
-        },
+    "filters": {
+        **LOGGING["filters"],
+        "require_debug_false": {"()": "django.utils.log.RequireDebugFalse"},
     },
+    "formatters": LOGGING["formatters"],
     "handlers": {
         "mail_admins": {
             "level": "ERROR",
             "filters": ["require_debug_false"],
             "class": "django.utils.log.AdminEmailHandler",
         },
-        "console": {
-            "level": "DEBUG",
-            "class": "logging.StreamHandler",
-            "formatter": "verbose",
-        },
+        "console": LOGGING["handlers"]["console"],
     },
     "root": {"level": "INFO", "handlers": ["console"]},
     "loggers": {
+        **LOGGING["loggers"],
         "django.request": {
             "handlers": ["mail_admins"],
             "level": "ERROR",
@@ -0,0 +1,141 @@
+# Generated by Django 5.0.9 on 2026-10-18 03:44
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+# 0001은 템플릿 User만 담고 있어, 실제 users 테이블(User)과 user_locations(UserLocation)를
+# 마이그레이션으로 맞춘다. 알림 팬아웃이 쓰는 UserLocation(district, neighborhood) 인덱스도 여기서 만든다.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district', models.CharField(max_length=50)),
+                ('neighborhood', models.CharField(max_length=50)),
+                ('is_primary', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'user_locations',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='user',
+            options={},
+        ),
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+            ],
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='date_joined',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='name',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='username',
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='bio',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='nickname',
+            field=models.CharField(default=None, max_length=20, unique=True),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='password_hash',
+            field=models.CharField(default=None, max_length=255),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='profile_image',
+            field=models.URLField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='social_id',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='social_provider',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(max_length=254, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='is_staff',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='last_login',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email'], name='users_email_4b85f2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['nickname'], name='users_nicknam_172a64_idx'),
+        ),
+        migrations.AlterModelTable(
+            name='user',
+            table='users',
+        ),
+        migrations.AddField(
+            model_name='userlocation',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='locations', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='userlocation',
+            index=models.Index(fields=['district', 'neighborhood'], name='user_location_area_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='userlocation',
+            unique_together={('user', 'district', 'neighborhood')},
+        ),
+    ]
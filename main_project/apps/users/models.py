@@ -53,4 +53,8 @@ class UserLocation(models.Model):
 
     class Meta:
         db_table = 'user_locations'
-        unique_together = ('user', 'district', 'neighborhood')
\ No newline at end of file
+        unique_together = ('user', 'district', 'neighborhood')
+        indexes = [
+            # 대기질 알림 팬아웃: 한 위치의 구독자를 사용자 수와 무관하게 인덱스로 찾는다
+            models.Index(fields=['district', 'neighborhood'], name='user_location_area_idx'),
+        ]
\ No newline at end of file
@@ -0,0 +1,64 @@
+import hashlib
+from typing import Callable
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from ..cache import WeatherCache
+from ..models import WalkingCondition, WeatherData
+from ..services import WeatherService
+
+
+def _walking_condition_values(weather_data: WeatherData) -> list:
+    try:
+        condition = weather_data.walking_condition
+    except WalkingCondition.DoesNotExist:
+        return []
+    return [condition.recommendation, condition.warning, condition.best_time_start, condition.best_time_end]
+
+
+def weather_etag(request, weather_data: WeatherData) -> str:
+    # 같은 행이라도 upsert로 값(산책 조건 포함)이 바뀌거나 ?fields=, 응답 포맷이 다르면 다른 ETag가 된다
+    renderer = getattr(request, 'accepted_renderer', None)
+    parts = [
+        weather_data.pk,
+        weather_data.forecast_time.isoformat(),
+        *(getattr(weather_data, name) for name in WeatherService.upsert_fields),
+        *_walking_condition_values(weather_data),
+        getattr(weather_data, 'is_stale', False),
+        request.query_params.get('fields', ''),
+        renderer.format if renderer else '',
+    ]
+    return quote_etag(hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest())
+
+
+def weather_last_modified(weather_data: WeatherData) -> int:
+    changed = weather_data.updated_at or weather_data.created_at or weather_data.forecast_time
+    return int(changed.timestamp())
+
+
+def weather_max_age(weather_data: WeatherData, cache: WeatherCache = None) -> int:
+    # WeatherCache.set처럼 관측 시각이 아니라 저장 시각 기준으로, 다음 WAQI 갱신 예상 시각까지만 재사용하게 한다
+    cache = cache or WeatherCache()
+    saved_at = weather_data.updated_at or weather_data.created_at or timezone.now()
+    fresh_until = cache.fresh_until(timezone.localtime(saved_at))
+    return max(0, int((fresh_until - timezone.now()).total_seconds()))
+
+
+def conditional_response(request, weather_data: WeatherData, respond: Callable):
+    """
+    If-None-Match / If-Modified-Since가 맞으면 직렬화 없이 304를 돌려주고,
+    아니면 respond()의 응답에 ETag, Last-Modified, Cache-Control을 붙인다.
+    """
+    etag = weather_etag(request, weather_data)
+    last_modified = weather_last_modified(weather_data)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = respond()
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(last_modified)
+    # 인증이 필요한 엔드포인트이므로 공유 캐시(CDN)가 아닌 클라이언트만 저장하게 한다
+    patch_cache_control(response, private=True, max_age=weather_max_age(weather_data))
+    return response
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+POSITION_SEPARATOR = '|'
+
+
+class WeatherCursorPagination(CursorPagination):
+    """
+    (forecast_time, id) 복합 키셋 페이지네이션.
+
+    DRF CursorPagination은 ordering의 첫 필드만 커서 위치로 쓰고 같은 값은 offset으로 건너뛰므로,
+    커서에 (forecast_time, id)를 함께 담아 (forecast_time, id) 인덱스 범위 조건으로 다음 페이지를 찾는다.
+    두 값의 조합은 유일하므로 offset은 항상 0이고 페이지 깊이와 무관하게 O(page)다.
+    """
+
+    ordering = ('-forecast_time', '-id')
+    page_size = settings.WEATHER_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.WEATHER_MAX_PAGE_SIZE
+
+    @property
+    def ordering_fields(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        current_position = self.cursor.position if self.cursor is not None else None
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self._after(ordering, self._decode_position(current_position)))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        following_position = (
+            self._get_position_from_instance(results[-1], self.ordering) if len(results) > len(self.page) else None
+        )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.next_position = True, current_position
+            self.has_previous, self.previous_position = following_position is not None, following_position
+        else:
+            self.has_next, self.next_position = following_position is not None, following_position
+            self.has_previous, self.previous_position = current_position is not None, current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    @staticmethod
+    def _after(ordering, values) -> Q:
+        # (a, b) > (x, y) 를 인덱스가 쓸 수 있는 a >= x AND (a > x OR (a = x AND b > y)) 꼴로 푼다
+        fields = [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+        leading, descending = fields[0]
+        condition = Q()
+        for i, (name, desc) in enumerate(fields):
+            equal = {prefix: value for (prefix, _), value in zip(fields[:i], values[:i])}
+            condition |= Q(**equal, **{f"{name}__{'lt' if desc else 'gt'}": values[i]})
+        return Q(**{f"{leading}__{'lte' if descending else 'gte'}": values[0]}) & condition
+
+    def _decode_position(self, position: str):
+        forecast_time, _, pk = position.partition(POSITION_SEPARATOR)
+        try:
+            values = [parse_datetime(forecast_time), int(pk)]
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if values[0] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            forecast_time, pk = instance['forecast_time'], instance['id']
+        else:
+            forecast_time, pk = instance.forecast_time, instance.pk
+        return f"{forecast_time.isoformat()}{POSITION_SEPARATOR}{pk}"
@@ -0,0 +1,16 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+
+class ORJSONRenderer(JSONRenderer):
+    # JSONRenderer와 같은 compact UTF-8 출력을 orjson으로 만든다.
+    # 들여쓰기를 요청받은 경우(브라우저블 API 등)에는 기본 구현을 쓴다.
+    _encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=self._encoder.default)
@@ -1,14 +1,171 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
-from ..models import WeatherData, WalkingCondition
+from rest_framework.settings import api_settings
+from ..models import WeatherData, WalkingCondition, WeatherDaily, WeatherHourly, WeatherRollup
 
 class WalkingConditionSerializer(serializers.ModelSerializer):
     class Meta:
         model = WalkingCondition
         exclude = ('weather_data',)
 
-class WeatherDataSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    # ?fields=a,b 로 응답 필드를 골라 받는다 (모바일에서 중첩 walking_condition 생략 등)
+    fields_query_param = 'fields'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        allowed = self.requested_fields(self.context.get('request'))
+        if allowed:
+            for name in set(self.fields) - allowed:
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, request):
+        requested = request.query_params.get(cls.fields_query_param) if request else None
+        if not requested:
+            return None
+        return {name.strip() for name in requested.split(',')}
+
+
+class WeatherDataSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     walking_condition = WalkingConditionSerializer(read_only=True)
 
+    # 중첩 직렬화되는 1:1 관계는 목록 조회 시 JOIN으로 함께 가져온다
+    select_related_fields = ('walking_condition',)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, request=None):
+        requested = cls.requested_fields(request)
+        related = [name for name in cls.select_related_fields if requested is None or name in requested]
+        return queryset.select_related(*related) if related else queryset
+
+    @classmethod
+    def values_representation(cls, request=None) -> 'ValuesRepresentation':
+        requested = cls.requested_fields(request)
+        return _weather_data_values_representation(frozenset(requested) if requested else None)
+
     class Meta:
         model = WeatherData
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+
+class WeatherCurrentSerializer(WeatherDataSerializer):
+    # 업스트림 장애로 마지막으로 알려진 값을 대신 돌려준 경우 true
+    is_stale = serializers.SerializerMethodField()
+
+    def get_is_stale(self, obj) -> bool:
+        return getattr(obj, 'is_stale', False)
+
+
+def _optional(convert: Callable) -> Callable:
+    return lambda value: None if value is None else convert(value)
+
+
+def _datetime_to_representation(value):
+    # DateTimeField.to_representation과 동일: 현재 시간대로 변환 후 ISO 8601, UTC는 'Z'
+    if not value:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _converter_for(field: serializers.Field) -> Callable:
+    if isinstance(field, serializers.DateTimeField) and getattr(field, 'format', api_settings.DATETIME_FORMAT) == 'iso-8601':
+        return _datetime_to_representation
+    if isinstance(field, serializers.TimeField) and getattr(field, 'format', api_settings.TIME_FORMAT) == 'iso-8601':
+        return lambda value: None if value in (None, '') else value.isoformat()
+    if isinstance(field, serializers.ChoiceField):
+        return _optional(lambda value: field.choice_strings_to_values.get(str(value), value))
+    if type(field) is serializers.IntegerField:
+        return _optional(int)
+    if type(field) is serializers.FloatField:
+        return _optional(float)
+    if type(field) is serializers.CharField:
+        return _optional(str)
+    return _optional(field.to_representation)
+
+
+class ValuesRepresentation:
+    """
+    읽기 전용 ModelSerializer와 같은 출력을 ``.values()`` 행(dict)에서 바로 만든다.
+
+    필드별 컬럼 이름과 변환 함수를 한 번 계산해 두고, 행마다 get_attribute와
+    필드별 to_representation 호출을 건너뛴다. 중첩 ModelSerializer는 JOIN 컬럼으로 펼친다.
+    """
+
+    def __init__(self, serializer: serializers.ModelSerializer, prefix: str = ''):
+        self.columns: List[str] = []
+        self.plan: List[Any] = []
+        self.pk_column = f"{prefix}{serializer.Meta.model._meta.pk.name}"
+
+        for name, field in serializer.fields.items():
+            if isinstance(field, serializers.ModelSerializer):
+                nested = ValuesRepresentation(field, prefix=f"{prefix}{field.source}__")
+                self.plan.append((name, None, nested))
+                self.columns.extend(nested.columns + [nested.pk_column])
+            else:
+                column = f"{prefix}{field.source}"
+                self.plan.append((name, column, _converter_for(field)))
+                self.columns.append(column)
+        self.columns = list(dict.fromkeys(self.columns + [self.pk_column]))
+
+    def with_columns(self, *columns: str) -> List[str]:
+        return list(dict.fromkeys(self.columns + list(columns)))
+
+    def to_representation(self, row: Dict) -> Dict:
+        data = {}
+        for name, column, convert in self.plan:
+            if column is not None:
+                data[name] = convert(row[column])
+            elif row[convert.pk_column] is None:
+                # 관계 행이 없으면 DRF와 같이 None
+                data[name] = None
+            else:
+                data[name] = convert.to_representation(row)
+        return data
+
+
+@lru_cache(maxsize=64)
+def _weather_data_values_representation(fields: Optional[frozenset]) -> ValuesRepresentation:
+    serializer = WeatherDataSerializer()
+    if fields:
+        for name in set(serializer.fields) - fields:
+            serializer.fields.pop(name)
+    return ValuesRepresentation(serializer)
+
+
+ROLLUP_FIELDS = ['district', 'bucket', 'sample_count'] + [
+    f'{metric}_{suffix}'
+    for metric in WeatherRollup.METRICS
+    for suffix in ('min', 'max', 'avg')
+]
+
+
+class WeatherHourlySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WeatherHourly
+        fields = ROLLUP_FIELDS
+
+
+class WeatherDailySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WeatherDaily
+        fields = ROLLUP_FIELDS
+
+
+class WeatherLocationSerializer(serializers.Serializer):
+    district = serializers.CharField(max_length=50)
+    neighborhood = serializers.CharField(max_length=50)
+
+
+class WeatherBulkRequestSerializer(serializers.Serializer):
+    # 비워 두면 로그인한 사용자의 UserLocation 전체를 조회한다
+    locations = WeatherLocationSerializer(
+        many=True, required=False, max_length=settings.WEATHER_BULK_MAX_LOCATIONS,
+    )
@@ -1,13 +1,82 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from ..models import WeatherData
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+from django.http import HttpResponse
+from django.conf import settings
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.module_loading import import_string
+from main_project.apps.users.models import UserLocation
+from ..models import WeatherData, WeatherDaily, WeatherHourly
+from ..circuit import CircuitOpenError
+from ..metrics import render_metrics
 from ..services import WeatherService
-from .serializers import WeatherDataSerializer
+from .conditional import conditional_response
+from .pagination import WeatherCursorPagination
+from .serializers import (
+    WeatherBulkRequestSerializer, WeatherCurrentSerializer, WeatherDataSerializer, WeatherDailySerializer, WeatherHourlySerializer,
+)
+
+def parse_query_param(params, name: str, parse):
+    # 형식이 틀리거나(None) 없는 날짜(ValueError)면 필터를 무시하지 않고 400으로 돌려준다
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: [f"Invalid {name}: {value}"]})
+    return parsed
+
 
 class WeatherViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = WeatherData.objects.all()
     serializer_class = WeatherDataSerializer
+    pagination_class = WeatherCursorPagination
+    renderer_classes = [import_string(path) for path in settings.WEATHER_RENDERER_CLASSES]
+
+    def list(self, request, *args, **kwargs):
+        if not settings.WEATHER_FAST_SERIALIZER:
+            return super().list(request, *args, **kwargs)
+
+        # 모델 인스턴스와 필드별 to_representation 대신 .values() 행을 바로 응답 dict로 바꾼다
+        representation = self.get_serializer_class().values_representation(request)
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *representation.with_columns(*self.paginator.ordering_fields),
+        )
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response([representation.to_representation(row) for row in page])
+
+    def get_serializer_class(self):
+        if self.action in ('current', 'bulk'):
+            return WeatherCurrentSerializer
+        return super().get_serializer_class()
+
+    def retrieve(self, request, *args, **kwargs):
+        weather_data = self.get_object()
+        return conditional_response(
+            request, weather_data, lambda: Response(self.get_serializer(weather_data).data),
+        )
+
+    def get_queryset(self):
+        # district는 (district, -forecast_time), 기간은 (forecast_time, id) 인덱스로 처리된다
+        queryset = self.queryset
+        params = self.request.query_params
+
+        district = params.get('district')
+        if district:
+            queryset = queryset.filter(district=district)
+        start = parse_query_param(params, 'start', parse_datetime)
+        if start:
+            queryset = queryset.filter(forecast_time__gte=start)
+        end = parse_query_param(params, 'end', parse_datetime)
+        if end:
+            queryset = queryset.filter(forecast_time__lt=end)
+        return self.get_serializer_class().setup_eager_loading(queryset, self.request)
 
     @action(detail=False, methods=['get'])
     def current(self, request):
@@ -23,10 +92,118 @@ class WeatherViewSet(viewsets.ReadOnlyModelViewSet):
         try:
             weather_service = WeatherService()
             weather_data = weather_service.get_weather_data(district, neighborhood)
-            serializer = self.get_serializer(weather_data)
-            return Response(serializer.data)
+            return conditional_response(
+                request, weather_data, lambda: Response(self.get_serializer(weather_data).data),
+            )
+        except CircuitOpenError as e:
+            # 업스트림 장애 중이고 대신 보여줄 값도 없으면 워커를 붙잡지 않고 바로 503을 돌려준다
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(weather_service.circuit.retry_after() or 1)},
+            )
         except Exception as e:
             return Response(
                 {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+    @action(detail=False, methods=['get'])
+    def card(self, request):
+        # 메인 화면 산책 카드. 저장 시 미리 렌더링해 둔 JSON을 그대로 돌려준다
+        district = request.query_params.get('district')
+        neighborhood = request.query_params.get('neighborhood')
+
+        if not district or not neighborhood:
+            return Response(
+                {"error": "district and neighborhood parameters are required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        weather_service = WeatherService()
+        try:
+            card = weather_service.get_walk_card(district, neighborhood)
+        except CircuitOpenError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(weather_service.circuit.retry_after() or 1)},
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        return HttpResponse(card, content_type='application/json')
+
+    @action(detail=False, methods=['get', 'post'])
+    def bulk(self, request):
+        # 여러 위치를 한 요청으로 조회한다. 위치별 실패는 500 대신 항목의 error로 돌려준다.
+        serializer = WeatherBulkRequestSerializer(data=request.data if request.method == 'POST' else {})
+        serializer.is_valid(raise_exception=True)
+
+        locations = [
+            (location['district'], location['neighborhood'])
+            for location in serializer.validated_data.get('locations') or []
+        ]
+        if not locations:
+            locations = list(
+                UserLocation.objects.filter(user=request.user)
+                .order_by('-is_primary', 'created_at')
+                .values_list('district', 'neighborhood')
+            )
+
+        outcomes = WeatherService().get_many(locations)
+        results = []
+        for (district, neighborhood), outcome in outcomes.items():
+            failed = isinstance(outcome, Exception)
+            results.append({
+                'district': district,
+                'neighborhood': neighborhood,
+                'weather_data': None if failed else self.get_serializer(outcome).data,
+                'error': str(outcome) if failed else None,
+            })
+        return Response({'results': results})
+
+
+class WeatherRollupViewSet(viewsets.ReadOnlyModelViewSet):
+    # ?district=&start=&end= 로 한 구의 버킷 구간만 조회한다 ((district, bucket) 유니크 인덱스 사용)
+    parse_bucket = staticmethod(parse_datetime)
+
+    def get_queryset(self):
+        queryset = self.queryset
+        params = self.request.query_params
+
+        district = params.get('district')
+        if district:
+            queryset = queryset.filter(district=district)
+        start = self.get_bucket_param('start')
+        if start:
+            queryset = queryset.filter(bucket__gte=start)
+        end = self.get_bucket_param('end')
+        if end:
+            queryset = queryset.filter(bucket__lt=end)
+        return queryset.order_by('district', 'bucket')
+
+    def get_bucket_param(self, name: str):
+        return parse_query_param(self.request.query_params, name, self.parse_bucket)
+
+
+class WeatherHourlyViewSet(WeatherRollupViewSet):
+    queryset = WeatherHourly.objects.all()
+    serializer_class = WeatherHourlySerializer
+
+
+class WeatherDailyViewSet(WeatherRollupViewSet):
+    queryset = WeatherDaily.objects.all()
+    serializer_class = WeatherDailySerializer
+    parse_bucket = staticmethod(parse_date)
+
+
+class MetricsView(APIView):
+    # Prometheus 스크레이퍼는 관리자 계정의 토큰(Authorization: Token ...)으로 접근한다
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        content, content_type = render_metrics()
+        return HttpResponse(content, content_type=content_type)
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class WeatherConfig(AppConfig):
+    name = "main_project.apps.weather"
+    verbose_name = _("Weather")
@@ -0,0 +1,142 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from . import metrics
+from .timing import TimedCache
+from .models import WeatherData
+
+Location = Tuple[str, str]
+
+
+class WeatherCache:
+    """
+    (district, neighborhood) 단위의 WeatherData read-through 캐시.
+
+    엔트리는 fresh 기간(다음 WAQI 갱신 시각까지)이 지나도 stale 기간 동안
+    보관되며, stale 엔트리는 재조회 대상이지만 장애 시 대체 응답으로 쓸 수 있다.
+    """
+
+    key_prefix = 'weather'
+    stat_names = ('hit', 'miss', 'stale', 'coalesced', 'fallback')
+
+    def __init__(self, alias: Optional[str] = None):
+        self.cache = TimedCache(caches[alias or settings.WEATHER_CACHE_ALIAS])
+        self.ttl = settings.WEATHER_CACHE_TTL
+        self.stale_ttl = settings.WEATHER_CACHE_STALE_TTL
+        self.update_delay = settings.WEATHER_CACHE_UPDATE_DELAY
+        self.lock_timeout = settings.WEATHER_FETCH_LOCK_TIMEOUT
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        return ' '.join(value.split()).lower()
+
+    def make_key(self, district: str, neighborhood: str) -> str:
+        return f"{self.key_prefix}:loc:{self.normalize(district)}:{self.normalize(neighborhood)}"
+
+    def fresh_until(self, now: datetime) -> datetime:
+        # WAQI는 매시 정각 이후 update_delay 안에 관측값을 갱신한다
+        boundary = now.replace(minute=0, second=0, microsecond=0) + timedelta(seconds=self.update_delay)
+        if boundary <= now:
+            boundary += timedelta(hours=1)
+        return min(now + timedelta(seconds=self.ttl), boundary)
+
+    def get(self, district: str, neighborhood: str) -> Tuple[Optional[WeatherData], bool]:
+        weather_data, is_fresh = self.peek(district, neighborhood)
+        if weather_data is None:
+            self._incr('miss')
+        elif is_fresh:
+            self._incr('hit')
+        else:
+            self._incr('stale')
+        return weather_data, is_fresh
+
+    def get_many(self, locations: List[Location]) -> Dict[Location, Tuple[Optional[WeatherData], bool]]:
+        # 여러 위치를 한 번의 왕복(MGET)으로 조회한다
+        keys = {self.make_key(*location): location for location in locations}
+        entries = self.cache.get_many(list(keys))
+        now = time.time()
+
+        results = {}
+        for key, location in keys.items():
+            entry = entries.get(key)
+            if entry is None:
+                results[location] = (None, False)
+            else:
+                results[location] = (entry['weather_data'], entry['fresh_until'] > now)
+
+        fresh = sum(1 for _, is_fresh in results.values() if is_fresh)
+        missing = sum(1 for weather_data, _ in results.values() if weather_data is None)
+        for name, count in (('hit', fresh), ('miss', missing), ('stale', len(results) - fresh - missing)):
+            if count:
+                self._incr(name, count)
+        return results
+
+    def peek(self, district: str, neighborhood: str) -> Tuple[Optional[WeatherData], bool]:
+        # 통계를 남기지 않는 조회 (single-flight 대기 중 폴링용)
+        entry = self.cache.get(self.make_key(district, neighborhood))
+        if entry is None:
+            return None, False
+        return entry['weather_data'], entry['fresh_until'] > time.time()
+
+    def set(self, district: str, neighborhood: str, weather_data: WeatherData) -> None:
+        now = timezone.localtime()
+        fresh_until = self.fresh_until(now).timestamp()
+        entry = {
+            'weather_data': weather_data,
+            'fresh_until': fresh_until,
+        }
+        timeout = int(fresh_until - now.timestamp()) + self.stale_ttl
+        self.cache.set(self.make_key(district, neighborhood), entry, timeout)
+
+    def delete(self, district: str, neighborhood: str) -> None:
+        self.cache.delete(self.make_key(district, neighborhood))
+
+    def make_lock_key(self, district: str, neighborhood: str) -> str:
+        return f"{self.key_prefix}:lock:{self.normalize(district)}:{self.normalize(neighborhood)}"
+
+    def acquire_lock(self, district: str, neighborhood: str) -> Optional[str]:
+        # cache.add는 Redis에서 SET NX로 동작하므로 한 워커만 락을 얻는다
+        token = uuid.uuid4().hex
+        if self.cache.add(self.make_lock_key(district, neighborhood), token, self.lock_timeout):
+            return token
+        return None
+
+    def release_lock(self, district: str, neighborhood: str, token: str) -> None:
+        key = self.make_lock_key(district, neighborhood)
+        # 락이 만료되어 다른 워커가 다시 잡았다면 지우지 않는다
+        if self.cache.get(key) == token:
+            self.cache.delete(key)
+
+    def is_locked(self, district: str, neighborhood: str) -> bool:
+        return self.cache.get(self.make_lock_key(district, neighborhood)) is not None
+
+    def record(self, name: str) -> None:
+        self._incr(name)
+
+    def stats(self) -> Dict[str, int]:
+        keys = {self._stat_key(name): name for name in self.stat_names}
+        values = self.cache.get_many(list(keys))
+        return {name: int(values.get(key, 0)) for key, name in keys.items()}
+
+    def reset_stats(self) -> None:
+        self.cache.delete_many([self._stat_key(name) for name in self.stat_names])
+
+    def _stat_key(self, name: str) -> str:
+        return f"{self.key_prefix}:stats:{name}"
+
+    def _incr(self, name: str, delta: int = 1) -> Any:
+        metrics.CACHE_EVENTS.labels(name).inc(delta)
+        key = self._stat_key(name)
+        # 카운터는 만료 없이 유지하고, 없으면 0으로 만든 뒤 원자적으로 증가시킨다
+        self.cache.add(key, 0, None)
+        try:
+            return self.cache.incr(key, delta)
+        except ValueError:
+            self.cache.set(key, delta, None)
+            return delta
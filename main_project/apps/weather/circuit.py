@@ -0,0 +1,94 @@
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .timing import TimedCache
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    업스트림(WAQI) 호출용 서킷 브레이커. 상태를 캐시(Redis)에 두어 모든 워커가 공유한다.
+
+    - closed: failure_window 안의 실패가 failure_threshold에 도달하면 open으로 바뀐다.
+    - open: reset_timeout 동안 호출하지 않고 바로 CircuitOpenError를 낸다.
+    - half-open: reset_timeout이 지나면 한 워커만 probe 요청을 보내고,
+      성공하면 closed, 실패하면 다시 open이 된다.
+    """
+
+    key_prefix = 'weather:circuit'
+
+    def __init__(self, name: str = 'waqi', alias: Optional[str] = None):
+        self.name = name
+        self.cache = TimedCache(caches[alias or settings.WEATHER_CACHE_ALIAS])
+        self.failure_threshold = settings.WEATHER_CIRCUIT_FAILURE_THRESHOLD
+        self.failure_window = settings.WEATHER_CIRCUIT_FAILURE_WINDOW
+        self.reset_timeout = settings.WEATHER_CIRCUIT_RESET_TIMEOUT
+        # probe 요청 하나가 끝날 때까지만 다른 워커를 막는다
+        self.probe_timeout = settings.WEATHER_FETCH_LOCK_TIMEOUT
+
+    def _key(self, suffix: str) -> str:
+        return f"{self.key_prefix}:{self.name}:{suffix}"
+
+    @property
+    def state(self) -> str:
+        opened_at = self.cache.get(self._key('opened_at'))
+        if opened_at is None:
+            return 'closed'
+        if time.time() < opened_at + self.reset_timeout:
+            return 'open'
+        return 'half-open'
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'open':
+            return False
+        # half-open에서는 probe 키를 먼저 잡은 한 워커만 호출한다
+        return self.cache.add(self._key('probe'), 1, self.probe_timeout)
+
+    def check(self) -> None:
+        if not self.allow_request():
+            raise CircuitOpenError(f"Weather API Error: circuit '{self.name}' is open")
+
+    def record_success(self) -> None:
+        if self.cache.get(self._key('opened_at')) is not None:
+            self.cache.delete_many([self._key('opened_at'), self._key('probe'), self._key('failures')])
+        else:
+            self.cache.delete(self._key('failures'))
+
+    def record_failure(self) -> None:
+        if self.state == 'half-open':
+            self._open()
+            return
+
+        key = self._key('failures')
+        # 첫 실패 시각부터 failure_window 동안의 실패만 센다
+        self.cache.add(key, 0, self.failure_window)
+        try:
+            failures = self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, self.failure_window)
+            failures = 1
+        if failures >= self.failure_threshold:
+            self._open()
+
+    def retry_after(self) -> int:
+        opened_at = self.cache.get(self._key('opened_at'))
+        if opened_at is None:
+            return 0
+        return max(0, int(opened_at + self.reset_timeout - time.time()))
+
+    def reset(self) -> None:
+        self.cache.delete_many([self._key('opened_at'), self._key('probe'), self._key('failures')])
+
+    def _open(self) -> None:
+        # opened_at은 half-open 이후에도 남아 있어야 하므로 reset_timeout보다 오래 보관한다
+        self.cache.set(self._key('opened_at'), time.time(), self.reset_timeout + self.failure_window + 3600)
+        self.cache.delete_many([self._key('probe'), self._key('failures')])
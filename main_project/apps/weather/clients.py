@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+
+import httpx
+from django.conf import settings
+
+from .metrics import UpstreamTimer
+
+
+class WaqiError(Exception):
+    pass
+
+
+def _feed_url(base_url: str, location: str) -> str:
+    return f"{base_url}{location}/"
+
+
+def _parse_feed(payload: Dict, timer: UpstreamTimer = None) -> Dict:
+    if payload.get('status') != 'ok':
+        if timer is not None:
+            # HTTP 200이지만 WAQI가 오류 상태를 돌려준 경우
+            timer.status = 'api_error'
+        raise WaqiError(f"API Error: {payload.get('data')}")
+    return payload['data']
+
+
+class AsyncWaqiClient:
+    """배치 갱신용 비동기 클라이언트. 하나의 커넥션 풀로 여러 위치를 동시에 조회한다."""
+
+    def __init__(self, base_url: str = None, api_key: str = None, timeout: float = None,
+                 max_connections: int = None, client: httpx.AsyncClient = None):
+        self.base_url = base_url or settings.WEATHER_API_BASE_URL
+        self.api_key = api_key if api_key is not None else settings.WEATHER_API_KEY
+        self.timeout = timeout or settings.WEATHER_API_TIMEOUT
+        self.max_connections = max_connections or settings.WEATHER_API_MAX_CONNECTIONS
+        # 외부에서 받은 클라이언트(공유 커넥션 풀)는 열고 닫지 않는다
+        self._client: Optional[httpx.AsyncClient] = client
+        self._owns_client = client is None
+
+    async def __aenter__(self) -> 'AsyncWaqiClient':
+        if not self._owns_client:
+            return self
+        # WAQI는 단일 호스트이므로 전체 커넥션 한도가 곧 호스트당 한도다
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch(self, location: str) -> Dict:
+        if self._client is None:
+            raise RuntimeError("AsyncWaqiClient must be used as an async context manager")
+
+        with UpstreamTimer('async') as timer:
+            try:
+                response = await self._client.get(
+                    _feed_url(self.base_url, location),
+                    params={'token': self.api_key},
+                    timeout=self.timeout,
+                )
+            except httpx.TimeoutException:
+                timer.status = 'timeout'
+                raise
+            timer.status = str(response.status_code)
+            response.raise_for_status()
+            return _parse_feed(response.json(), timer)
+
+    async def fetch_many(self, locations: List[str]) -> List[Union[Dict, Exception]]:
+        # 실패한 위치는 예외 객체로 돌려주어 나머지 결과를 버리지 않는다
+        semaphore = asyncio.Semaphore(self.max_connections)
+
+        async def fetch_one(location: str) -> Dict:
+            async with semaphore:
+                return await self.fetch(location)
+
+        return await asyncio.gather(
+            *(fetch_one(location) for location in locations),
+            return_exceptions=True,
+        )
@@ -0,0 +1,129 @@
+"""
+시간별 예보 시계열과 최적 산책 시간대 계산.
+
+예보는 (구, 위치, 날짜)마다 한 행(HourlyForecast)에 0~23시 배열로 저장한다.
+최적 시간대는 갱신 시 저장할 때 한 번만 계산해 WalkingCondition.best_time_start/end에 넣으므로
+요청 경로에서는 다시 계산하지 않는다.
+"""
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from .models import HourlyForecast
+from .scoring import calculate_walking_scores
+
+HOURS_PER_DAY = 24
+
+
+@dataclass
+class Forecast:
+    rows: List[HourlyForecast]
+    window: Optional[Tuple[time, time]]
+
+
+def hourly_series(points: List[Dict], reading: Dict, start: datetime, hours: int) -> Dict[str, np.ndarray]:
+    # start(정시)부터 hours시간의 배열. 예보가 없는 시간은 NaN이다
+    series = {name: np.full(hours, np.nan) for name in HourlyForecast.SERIES if name != 'walking_score'}
+    for point in [{'time': start, **reading}, *points]:
+        offset = int((point['time'] - start).total_seconds() // 3600)
+        if not 0 <= offset < hours:
+            continue
+        for name, values in series.items():
+            value = point.get(name)
+            if value is not None:
+                values[offset] = value
+
+    # 대기질 예보가 없는 시간은 현재 관측값이 유지된다고 본다
+    for name in ('aqi', 'pm25'):
+        current = reading.get(name)
+        if current is not None:
+            series[name][np.isnan(series[name])] = current
+    return series
+
+
+def hourly_walking_scores(series: Dict[str, np.ndarray]) -> np.ndarray:
+    scores = calculate_walking_scores(series['aqi'], series['temperature'], series['pm25']).astype(np.float64)
+    # 기온 예보가 없는 시간은 판단할 수 없으므로 비워 두고, 비가 오는 시간은 0점으로 둔다
+    scores[np.isnan(series['temperature'])] = np.nan
+    scores[series['precipitation'] > 0] = 0
+    return scores
+
+
+def best_window(scores: np.ndarray, length: int, allowed: np.ndarray = None) -> Optional[Tuple[int, float]]:
+    """
+    길이 length인 연속 구간 중 평균 점수가 가장 높은 구간의 (시작 인덱스, 평균 점수).
+
+    누적 합으로 모든 구간 합을 O(n)에 구한다. NaN이거나 allowed가 False인 시간이
+    섞인 구간은 제외하고, 동점이면 가장 이른 구간을 고른다.
+    """
+    if length <= 0 or len(scores) < length:
+        return None
+    valid = ~np.isnan(scores)
+    if allowed is not None:
+        valid &= allowed
+
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, scores, 0.0))))
+    gaps = np.concatenate(([0], np.cumsum(~valid)))
+    window_sums = np.where(gaps[length:] == gaps[:-length], sums[length:] - sums[:-length], -np.inf)
+
+    start = int(np.argmax(window_sums))
+    if window_sums[start] == -np.inf:
+        return None
+    return start, float(window_sums[start]) / length
+
+
+def best_walking_window(scores: np.ndarray, start: datetime) -> Optional[Tuple[time, time]]:
+    # 앞으로 24시간 중 산책 가능한 시간대(WEATHER_WALK_DAY_START~END) 안에서만 찾는다
+    length = settings.WEATHER_WALK_WINDOW_HOURS
+    scores = scores[:HOURS_PER_DAY]
+    hours = (start.hour + np.arange(len(scores))) % HOURS_PER_DAY
+    allowed = (hours >= settings.WEATHER_WALK_DAY_START) & (hours < settings.WEATHER_WALK_DAY_END)
+
+    found = best_window(scores, length, allowed)
+    if found is None:
+        return None
+    begin = start + timedelta(hours=found[0])
+    return begin.time(), (begin + timedelta(hours=length)).time()
+
+
+def _to_list(values: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(value) else round(float(value), 2) for value in values]
+
+
+def _forecast_rows(district: str, neighborhood: str, series: Dict[str, np.ndarray],
+                   start: datetime) -> List[HourlyForecast]:
+    # 시계열을 날짜별 24칸 배열로 나눈다. start 이전 시간은 이번 예보에 없으므로 null이 된다
+    before = start.hour
+    after = -(before + settings.WEATHER_FORECAST_HOURS) % HOURS_PER_DAY
+    padded = {
+        name: np.concatenate((np.full(before, np.nan), values, np.full(after, np.nan)))
+        for name, values in series.items()
+    }
+    days = len(next(iter(padded.values()))) // HOURS_PER_DAY
+    return [
+        HourlyForecast(
+            district=district,
+            neighborhood=neighborhood,
+            date=start.date() + timedelta(days=day),
+            **{
+                name: _to_list(values[day * HOURS_PER_DAY:(day + 1) * HOURS_PER_DAY])
+                for name, values in padded.items()
+            },
+        )
+        for day in range(days)
+    ]
+
+
+def build_forecast(reading: Dict) -> Forecast:
+    # reading은 WeatherService._process_weather_data의 결과이고 'hourly'에 예보 목록이 있다
+    start = timezone.localtime(reading['forecast_time']).replace(minute=0, second=0, microsecond=0)
+    series = hourly_series(reading['hourly'], reading, start, settings.WEATHER_FORECAST_HOURS)
+    series['walking_score'] = hourly_walking_scores(series)
+    return Forecast(
+        rows=_forecast_rows(reading['district'], reading.get('neighborhood', ''), series, start),
+        window=best_walking_window(series['walking_score'], start),
+    )
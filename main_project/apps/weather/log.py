@@ -0,0 +1,201 @@
+"""
+구조화(JSON) 로깅 도구: 요청 ID 상관관계, 큐 기반 비동기 핸들러, 로거별 rate limit.
+
+LOGGING 설정에서 ``"()"``/``"class"`` 경로로 참조한다 (config/settings/base.py).
+"""
+import atexit
+import copy
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+import weakref
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+import orjson
+
+_request_id: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+# 외부에서 받은 ID는 로그 인젝션을 막기 위해 짧은 토큰 형식만 허용한다
+_REQUEST_ID_RE = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+_TRACEPARENT_RE = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-[0-9a-f]{16}-[0-9a-f]{2}$')
+
+# LogRecord 기본 속성. 나머지(extra=...)는 JSON의 최상위 필드로 내보낸다
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+class RequestIdMiddleware:
+    """
+    X-Request-ID(없으면 W3C traceparent의 trace-id, 그것도 없으면 새 UUID)를 요청 ID로 쓰고
+    응답 헤더로 돌려준다. MIDDLEWARE 맨 앞에 두어 다른 미들웨어의 로그에도 ID가 남게 한다.
+    """
+
+    header = 'X-Request-ID'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = self._incoming_id(request) or uuid.uuid4().hex
+        token = _request_id.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_id.reset(token)
+        response.headers[self.header] = request_id
+        return response
+
+    def _incoming_id(self, request) -> Optional[str]:
+        request_id = request.headers.get(self.header)
+        if request_id and _REQUEST_ID_RE.match(request_id):
+            return request_id
+        match = _TRACEPARENT_RE.match(request.headers.get('traceparent', ''))
+        return match.group(1) if match else None
+
+
+class RequestIdFilter(logging.Filter):
+    # 핸들러 필터는 로그를 남긴 스레드에서 실행되므로 여기서 contextvar 값을 레코드에 옮긴다
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    (로거, 메시지 템플릿)마다 per초 동안 rate개까지만 통과시킨다.
+
+    버려진 개수는 다음에 통과하는 레코드의 ``suppressed`` 필드로 남긴다.
+    """
+
+    def __init__(self, rate: int = 10, per: float = 60.0, name: str = ''):
+        super().__init__(name)
+        self.rate = rate
+        self.per = per
+        self._lock = threading.Lock()
+        self._windows: Dict[Tuple[str, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.per:
+                suppressed = window[2] if window else 0
+                window = self._windows[key] = [now, 0, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+            if window[1] >= self.rate:
+                window[2] += 1
+                return False
+            window[1] += 1
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+            'process': record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in data:
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exc_info'] = record.exc_text
+        if record.stack_info:
+            data['stack_info'] = record.stack_info
+        return orjson.dumps(data, default=str).decode()
+
+
+class QueueStreamHandler(QueueHandler):
+    """
+    요청 스레드에서는 레코드를 큐에 넣기만 하고, 포맷팅과 스트림 쓰기는 리스너 스레드가 한다.
+
+    큐가 가득 차면 기다리지 않고 버린 뒤 ``dropped``로 센다.
+    """
+
+    def __init__(self, stream=None, maxsize: int = 10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target = logging.StreamHandler(stream)
+        self.dropped = 0
+        self.listener = None
+        self.closed = False
+        self._start()
+        _queue_handlers.add(self)
+
+    def _after_fork(self) -> None:
+        # 부모의 큐는 fork 시점의 레코드와 (리스너가 잡고 있었을 수 있는) 뮤텍스까지 복사되므로
+        # 자식은 새 큐와 새 리스너 스레드로 시작한다
+        if self.closed:
+            return
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._start()
+
+    def _start(self) -> None:
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+
+    def setFormatter(self, fmt: logging.Formatter) -> None:  # noqa: N802
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # args와 traceback은 다른 스레드에서 안전하지 않으므로 문자열로만 확정하고,
+        # JSON 포맷팅은 리스너 스레드의 target 핸들러에 맡긴다
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        self.closed = True
+        _queue_handlers.discard(self)
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.target.close()
+        super().close()
+
+
+# fork/종료 훅은 핸들러마다가 아니라 모듈에서 한 번만 등록하고, 살아 있는 핸들러만 약한 참조로 찾는다
+# (dictConfig 재설정이나 테스트에서 닫힌 핸들러가 자식 프로세스에서 다시 살아나지 않게 한다)
+_queue_handlers = weakref.WeakSet()
+
+
+def _restart_queue_handlers() -> None:
+    for handler in list(_queue_handlers):
+        handler._after_fork()
+
+
+def _close_queue_handlers() -> None:
+    for handler in list(_queue_handlers):
+        handler.close()
+
+
+# gunicorn --preload처럼 설정 후 fork되면 자식 프로세스에서 리스너 스레드를 다시 띄운다
+os.register_at_fork(after_in_child=_restart_queue_handlers)
+atexit.register(_close_queue_handlers)
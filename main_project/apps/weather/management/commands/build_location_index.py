@@ -0,0 +1,58 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main_project.apps.weather.stations import build_index
+from main_project.apps.weather.stations import load_neighborhoods
+from main_project.apps.weather.stations import load_stations
+
+
+class Command(BaseCommand):
+    help = "Map every (district, neighborhood) to its nearest WAQI monitoring station."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stations",
+            type=Path,
+            required=True,
+            help="CSV with station_id,name,lat,lon columns.",
+        )
+        parser.add_argument(
+            "--neighborhoods",
+            type=Path,
+            required=True,
+            help="CSV with district,neighborhood,lat,lon columns.",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=None,
+            help="Index file to write. Defaults to WEATHER_LOCATION_INDEX_FILE.",
+        )
+        parser.add_argument(
+            "--max-distance-km",
+            type=float,
+            default=None,
+            help="Leave neighborhoods farther than this from every station unmapped.",
+        )
+
+    def handle(self, *args, **options):
+        stations = load_stations(options["stations"])
+        neighborhoods = load_neighborhoods(options["neighborhoods"])
+        index = build_index(stations, neighborhoods, max_distance_km=options["max_distance_km"])
+
+        output = options["output"] or Path(settings.WEATHER_LOCATION_INDEX_FILE)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        per_station = Counter(index["locations"].values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Mapped {len(index['locations'])}/{len(neighborhoods)} neighborhoods "
+                f"to {len(per_station)} stations "
+                f"(up to {max(per_station.values(), default=0)} per station) -> {output}",
+            ),
+        )
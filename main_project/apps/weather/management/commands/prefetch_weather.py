@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from main_project.apps.weather.prefetch import WeatherPrefetcher
+from main_project.apps.weather.prefetch import get_prefetch_locations
+
+
+class Command(BaseCommand):
+    help = "Refresh cached weather for every distinct UserLocation (district, neighborhood)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=8,
+            help="Maximum number of concurrent upstream requests.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Run forever, refreshing every N seconds. 0 runs once.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the locations that would be refreshed without fetching.",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            locations = get_prefetch_locations()
+            for district, neighborhood in locations:
+                self.stdout.write(f"{district} {neighborhood}")
+            self.stdout.write(f"{len(locations)} locations would be refreshed")
+            return
+
+        prefetcher = WeatherPrefetcher(concurrency=options["concurrency"])
+        while True:
+            result = prefetcher.run()
+            self.stdout.write(
+                f"total={result.total} refreshed={result.refreshed} "
+                f"skipped={result.skipped} failed={len(result.failed)} "
+                f"elapsed={result.elapsed:.2f}s",
+            )
+            for district, neighborhood in result.failed:
+                self.stderr.write(f"failed: {district} {neighborhood}")
+
+            if not options["interval"]:
+                return
+            time.sleep(max(0, options["interval"] - result.elapsed))
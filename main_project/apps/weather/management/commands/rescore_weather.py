@@ -0,0 +1,58 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from main_project.apps.weather.models import WeatherData
+from main_project.apps.weather.rescore import RescoreProgress
+from main_project.apps.weather.rescore import WeatherRescorer
+
+
+class Command(BaseCommand):
+    help = "Recompute walking_score and walking recommendations for stored weather data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of weather_data rows rescored per transaction.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=Path,
+            help="File holding the last processed id. Resumes from it if present.",
+        )
+        parser.add_argument(
+            "--start-id",
+            type=int,
+            default=None,
+            help="Start after this id, ignoring any checkpoint.",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = options["checkpoint"]
+        start_id = options["start_id"]
+        if start_id is None:
+            start_id = int(checkpoint.read_text()) if checkpoint and checkpoint.exists() else 0
+
+        total = WeatherData.objects.filter(id__gt=start_id).count()
+        started = time.monotonic()
+        self.stdout.write(f"Rescoring {total} rows after id {start_id}")
+
+        def report(progress: RescoreProgress):
+            if checkpoint:
+                checkpoint.write_text(str(progress.last_id))
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"{progress.scanned}/{total} rows (last id {progress.last_id}, "
+                f"{progress.scanned / max(elapsed, 1e-6):.0f} rows/s)",
+            )
+
+        progress = WeatherRescorer(batch_size=options["batch_size"], on_batch=report).run(start_id)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: scanned={progress.scanned} scores_updated={progress.scores_updated} "
+                f"conditions_updated={progress.conditions_updated}",
+            ),
+        )
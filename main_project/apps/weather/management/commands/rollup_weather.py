@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from main_project.apps.weather.rollups import rebuild_rollups
+from main_project.apps.weather.rollups import update_rollups
+
+
+class Command(BaseCommand):
+    help = "Fold new weather_data rows into the hourly and daily rollup tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50000,
+            help="Number of weather_data rows aggregated per transaction.",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Discard the rollups and the watermark and aggregate from scratch.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            processed = rebuild_rollups(options["batch_size"])
+        else:
+            processed = update_rollups(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {processed} rows"))
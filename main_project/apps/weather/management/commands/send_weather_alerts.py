@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from main_project.apps.weather.notifications import AlertDispatcher
+
+
+class Command(BaseCommand):
+    help = "Fan out pending air-quality alerts to subscribed users and deliver them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Rows per fan-out insert and delivery batch (defaults to WEATHER_ALERT_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Run forever, dispatching every N seconds. 0 runs once.",
+        )
+
+    def handle(self, *args, **options):
+        dispatcher = AlertDispatcher(batch_size=options["batch_size"])
+        while True:
+            result = dispatcher.run()
+            self.stdout.write(
+                f"alerts={result.alerts} deliveries={result.deliveries} "
+                f"sent={result.sent} suppressed={result.suppressed} failed={result.failed} "
+                f"elapsed={result.elapsed:.2f}s",
+            )
+
+            if not options["interval"]:
+                return
+            time.sleep(max(0, options["interval"] - result.elapsed))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from main_project.apps.weather import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly weather_data partitions and drop or archive "
+        "partitions older than the retention period."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Create partitions up to this many months ahead.",
+        )
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            default=None,
+            help="Remove partitions that ended more than this many months ago.",
+        )
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            help="Detach and rename expired partitions instead of dropping them.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report which partitions would be removed.",
+        )
+
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned():
+            msg = "weather_data is not partitioned (PostgreSQL only)."
+            raise CommandError(msg)
+
+        if not options["dry_run"]:
+            for name in partitions.ensure_partitions(options["months_ahead"]):
+                self.stdout.write(f"created {name}")
+
+        if options["retain_months"] is None:
+            return
+
+        action, done = ("archive", "archived") if options["archive"] else ("drop", "dropped")
+        for name, month in partitions.expired_partitions(options["retain_months"]):
+            if options["dry_run"]:
+                self.stdout.write(f"would {action} {name}")
+                continue
+            partitions.drop_partition(month, archive=options["archive"])
+            self.stdout.write(f"{done} {name}")
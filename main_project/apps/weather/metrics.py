@@ -0,0 +1,68 @@
+"""
+날씨 서비스 Prometheus 메트릭.
+
+gunicorn처럼 여러 워커 프로세스로 실행할 때는 PROMETHEUS_MULTIPROC_DIR 환경 변수에
+(시작 시 비운) 쓰기 가능한 디렉터리를 지정한다. prometheus_client가 값을 mmap 파일에
+기록하고, /metrics는 모든 워커의 파일을 합쳐서 내보낸다.
+"""
+import os
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+from . import timing
+
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    'weather_upstream_request_seconds',
+    'WAQI request duration by client and result status',
+    ['client', 'status'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+CACHE_EVENTS = Counter(
+    'weather_cache_events',
+    'Weather cache lookups by result (hit, miss, stale, coalesced, fallback)',
+    ['event'],
+)
+DB_SAVE_SECONDS = Histogram(
+    'weather_db_save_seconds',
+    'Time spent upserting WeatherData and WalkingCondition rows',
+)
+SCORING_SECONDS = Histogram(
+    'weather_scoring_seconds',
+    'Walking score calculation time by mode (scalar, batch)',
+    ['mode'],
+    buckets=(1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 1e-2, 0.1, 1.0),
+)
+
+ALERT_DELIVERIES = Counter(
+    'weather_alert_deliveries',
+    'Air-quality alert deliveries by result (sent, suppressed, failed)',
+    ['status'],
+)
+
+
+class UpstreamTimer:
+    """with 블록 동안의 WAQI 호출 시간을 status 라벨과 함께 기록한다."""
+
+    def __init__(self, client: str):
+        self.client = client
+        self.status = 'error'
+
+    def __enter__(self) -> 'UpstreamTimer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.started
+        UPSTREAM_REQUEST_SECONDS.labels(self.client, self.status).observe(elapsed)
+        timing.add('upstream', elapsed)
+
+
+def render_metrics():
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
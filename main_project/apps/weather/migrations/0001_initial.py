@@ -0,0 +1,52 @@
+# Generated by Django 5.0.9 on 2026-10-18 02:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district', models.CharField(max_length=50)),
+                ('aqi', models.IntegerField(blank=True, null=True)),
+                ('temperature', models.FloatField(blank=True, null=True)),
+                ('humidity', models.FloatField(blank=True, null=True)),
+                ('wind_speed', models.FloatField(blank=True, null=True)),
+                ('pm10', models.FloatField(blank=True, null=True)),
+                ('pm25', models.FloatField(blank=True, null=True)),
+                ('precipitation', models.FloatField(blank=True, default=0.0, null=True)),
+                ('precipitation_type', models.CharField(blank=True, max_length=20, null=True)),
+                ('walking_score', models.IntegerField(default=0)),
+                ('forecast_time', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'weather_data',
+                'indexes': [models.Index(fields=['district'], name='weather_dat_distric_85613f_idx'), models.Index(fields=['forecast_time'], name='weather_dat_forecas_5bc979_idx')],
+                'unique_together': {('district', 'forecast_time')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WalkingCondition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recommendation', models.CharField(choices=[('INDOOR', '실내 활동을 추천드립니다.'), ('INDOOR_WALK', '실내 산책을 추천드립니다.'), ('SHORT_WALK', '짧은 산책만 추천드립니다.'), ('LIMITED_WALK', '산책 시간을 30분 이내로 제한하세요.'), ('GOOD', '산책하기 좋은 날씨입니다.')], default='GOOD', max_length=200)),
+                ('warning', models.CharField(blank=True, max_length=200, null=True)),
+                ('best_time_start', models.TimeField()),
+                ('best_time_end', models.TimeField()),
+                ('weather_data', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='walking_condition', to='weather.weatherdata')),
+            ],
+            options={
+                'db_table': 'walking_conditions',
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.9 on 2026-10-18 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='weatherdata',
+            name='weather_dat_distric_85613f_idx',
+        ),
+        migrations.AddIndex(
+            model_name='weatherdata',
+            index=models.Index(fields=['district', '-forecast_time'], name='weather_district_latest_idx'),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.0.9 on 2026-10-18 02:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# weather_data를 forecast_time 기준 월 단위(UTC) RANGE 파티션 테이블로 옮긴다 (PostgreSQL 전용).
+# 파티션 키가 PK에 포함되어야 하므로 PK는 (id, forecast_time)이 되고,
+# 이후 달의 파티션 생성과 보관 기간 정리는 weather_partitions 커맨드가 맡는다.
+
+SEQUENCE = 'weather_data_partitioned_id_seq'
+INDEXES = [
+    'CREATE INDEX "weather_district_latest_idx" ON "weather_data" ("district", "forecast_time" DESC)',
+    'CREATE INDEX "weather_dat_forecas_5bc979_idx" ON "weather_data" ("forecast_time")',
+]
+CONSTRAINTS = [
+    'ALTER TABLE "weather_data" ADD CONSTRAINT "weather_data_district_forecast_time_uniq" UNIQUE ("district", "forecast_time")',
+]
+MONTHS_AHEAD = 3
+
+
+def partition_weather_data(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('ALTER TABLE "weather_data" RENAME TO "weather_data_unpartitioned"')
+        cursor.execute(
+            'CREATE TABLE "weather_data" (LIKE "weather_data_unpartitioned" INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE ("forecast_time")'
+        )
+        cursor.execute(f'CREATE SEQUENCE IF NOT EXISTS "{SEQUENCE}"')
+        cursor.execute(f'ALTER SEQUENCE "{SEQUENCE}" OWNED BY "weather_data"."id"')
+        cursor.execute(f'ALTER TABLE "weather_data" ALTER COLUMN "id" SET DEFAULT nextval(\'{SEQUENCE}\')')
+        cursor.execute(
+            f"SELECT setval('{SEQUENCE}', COALESCE(MAX(\"id\"), 0) + 1, false) FROM \"weather_data_unpartitioned\""
+        )
+
+        # 기존 데이터가 걸친 달부터 MONTHS_AHEAD개월 뒤까지 파티션을 만든다
+        cursor.execute(
+            f"""
+            SELECT
+                to_char(month, 'YYYY_MM'),
+                month::text,
+                (month + interval '1 month')::text
+            FROM generate_series(
+                date_trunc('month', COALESCE((SELECT MIN("forecast_time") FROM "weather_data_unpartitioned"), now())),
+                date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+                interval '1 month'
+            ) AS month
+            """
+        )
+        for suffix, start, end in cursor.fetchall():
+            cursor.execute(
+                f'CREATE TABLE "weather_data_{suffix}" PARTITION OF "weather_data" '
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+        # 범위 밖(과거 백필 등) 행을 받아줄 기본 파티션
+        cursor.execute('CREATE TABLE "weather_data_default" PARTITION OF "weather_data" DEFAULT')
+
+        cursor.execute('INSERT INTO "weather_data" SELECT * FROM "weather_data_unpartitioned"')
+        cursor.execute('DROP TABLE "weather_data_unpartitioned"')
+        cursor.execute('ALTER TABLE "weather_data" ADD PRIMARY KEY ("id", "forecast_time")')
+        for statement in CONSTRAINTS + INDEXES:
+            cursor.execute(statement)
+
+
+def unpartition_weather_data(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('ALTER TABLE "weather_data" RENAME TO "weather_data_partitioned"')
+        cursor.execute('CREATE TABLE "weather_data" (LIKE "weather_data_partitioned" INCLUDING DEFAULTS)')
+        cursor.execute(f'ALTER SEQUENCE "{SEQUENCE}" OWNED BY "weather_data"."id"')
+        cursor.execute('INSERT INTO "weather_data" SELECT * FROM "weather_data_partitioned"')
+        cursor.execute('DROP TABLE "weather_data_partitioned"')
+        cursor.execute('ALTER TABLE "weather_data" ADD PRIMARY KEY ("id")')
+        for statement in CONSTRAINTS + INDEXES:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0002_weatherdata_district_latest_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='walkingcondition',
+            name='weather_data',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='walking_condition', to='weather.weatherdata'),
+        ),
+        migrations.RunPython(partition_weather_data, unpartition_weather_data),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.0.9 on 2026-10-18 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0003_partition_weather_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'weather_rollup_watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='WeatherDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district', models.CharField(max_length=50)),
+                ('sample_count', models.IntegerField(default=0)),
+                ('aqi_min', models.FloatField(blank=True, null=True)),
+                ('aqi_max', models.FloatField(blank=True, null=True)),
+                ('aqi_avg', models.FloatField(blank=True, null=True)),
+                ('aqi_sum', models.FloatField(default=0)),
+                ('aqi_count', models.IntegerField(default=0)),
+                ('pm10_min', models.FloatField(blank=True, null=True)),
+                ('pm10_max', models.FloatField(blank=True, null=True)),
+                ('pm10_avg', models.FloatField(blank=True, null=True)),
+                ('pm10_sum', models.FloatField(default=0)),
+                ('pm10_count', models.IntegerField(default=0)),
+                ('pm25_min', models.FloatField(blank=True, null=True)),
+                ('pm25_max', models.FloatField(blank=True, null=True)),
+                ('pm25_avg', models.FloatField(blank=True, null=True)),
+                ('pm25_sum', models.FloatField(default=0)),
+                ('pm25_count', models.IntegerField(default=0)),
+                ('temperature_min', models.FloatField(blank=True, null=True)),
+                ('temperature_max', models.FloatField(blank=True, null=True)),
+                ('temperature_avg', models.FloatField(blank=True, null=True)),
+                ('temperature_sum', models.FloatField(default=0)),
+                ('temperature_count', models.IntegerField(default=0)),
+                ('walking_score_min', models.FloatField(blank=True, null=True)),
+                ('walking_score_max', models.FloatField(blank=True, null=True)),
+                ('walking_score_avg', models.FloatField(blank=True, null=True)),
+                ('walking_score_sum', models.FloatField(default=0)),
+                ('walking_score_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('bucket', models.DateField()),
+            ],
+            options={
+                'db_table': 'weather_daily',
+                'unique_together': {('district', 'bucket')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WeatherHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district', models.CharField(max_length=50)),
+                ('sample_count', models.IntegerField(default=0)),
+                ('aqi_min', models.FloatField(blank=True, null=True)),
+                ('aqi_max', models.FloatField(blank=True, null=True)),
+                ('aqi_avg', models.FloatField(blank=True, null=True)),
+                ('aqi_sum', models.FloatField(default=0)),
+                ('aqi_count', models.IntegerField(default=0)),
+                ('pm10_min', models.FloatField(blank=True, null=True)),
+                ('pm10_max', models.FloatField(blank=True, null=True)),
+                ('pm10_avg', models.FloatField(blank=True, null=True)),
+                ('pm10_sum', models.FloatField(default=0)),
+                ('pm10_count', models.IntegerField(default=0)),
+                ('pm25_min', models.FloatField(blank=True, null=True)),
+                ('pm25_max', models.FloatField(blank=True, null=True)),
+                ('pm25_avg', models.FloatField(blank=True, null=True)),
+                ('pm25_sum', models.FloatField(default=0)),
+                ('pm25_count', models.IntegerField(default=0)),
+                ('temperature_min', models.FloatField(blank=True, null=True)),
+                ('temperature_max', models.FloatField(blank=True, null=True)),
+                ('temperature_avg', models.FloatField(blank=True, null=True)),
+                ('temperature_sum', models.FloatField(default=0)),
+                ('temperature_count', models.IntegerField(default=0)),
+                ('walking_score_min', models.FloatField(blank=True, null=True)),
+                ('walking_score_max', models.FloatField(blank=True, null=True)),
+                ('walking_score_avg', models.FloatField(blank=True, null=True)),
+                ('walking_score_sum', models.FloatField(default=0)),
+                ('walking_score_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('bucket', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'weather_hourly',
+                'unique_together': {('district', 'bucket')},
+            },
+        ),
+    ]
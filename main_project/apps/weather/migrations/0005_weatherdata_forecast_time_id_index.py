@@ -0,0 +1,21 @@
+# Generated by Django 5.0.9 on 2026-10-18 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0004_weather_rollups'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='weatherdata',
+            name='weather_dat_forecas_5bc979_idx',
+        ),
+        migrations.AddIndex(
+            model_name='weatherdata',
+            index=models.Index(fields=['forecast_time', 'id'], name='weather_forecast_time_id_idx'),
+        ),
+    ]
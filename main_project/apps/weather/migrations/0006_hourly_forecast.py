@@ -0,0 +1,34 @@
+# Generated by Django 5.0.9 on 2026-10-18 03:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0005_weatherdata_forecast_time_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HourlyForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district', models.CharField(max_length=50)),
+                ('date', models.DateField()),
+                ('aqi', models.JSONField(default=list)),
+                ('pm25', models.JSONField(default=list)),
+                ('temperature', models.JSONField(default=list)),
+                ('humidity', models.JSONField(default=list)),
+                ('wind_speed', models.JSONField(default=list)),
+                ('precipitation', models.JSONField(default=list)),
+                ('precipitation_probability', models.JSONField(default=list)),
+                ('walking_score', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'weather_hourly_forecasts',
+                'unique_together': {('district', 'date')},
+            },
+        ),
+    ]
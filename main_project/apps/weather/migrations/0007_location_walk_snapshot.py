@@ -0,0 +1,40 @@
+# Generated by Django 5.0.9 on 2026-10-18 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0006_hourly_forecast'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationWalkSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district', models.CharField(max_length=50)),
+                ('neighborhood', models.CharField(max_length=50)),
+                ('weather_data_id', models.BigIntegerField()),
+                ('forecast_time', models.DateTimeField()),
+                ('walking_score', models.IntegerField(default=0)),
+                ('recommendation', models.CharField(choices=[('INDOOR', '실내 활동을 추천드립니다.'), ('INDOOR_WALK', '실내 산책을 추천드립니다.'), ('SHORT_WALK', '짧은 산책만 추천드립니다.'), ('LIMITED_WALK', '산책 시간을 30분 이내로 제한하세요.'), ('GOOD', '산책하기 좋은 날씨입니다.')], max_length=200)),
+                ('warning', models.CharField(blank=True, max_length=200, null=True)),
+                ('best_time_start', models.TimeField()),
+                ('best_time_end', models.TimeField()),
+                ('aqi', models.IntegerField(blank=True, null=True)),
+                ('pm10', models.FloatField(blank=True, null=True)),
+                ('pm25', models.FloatField(blank=True, null=True)),
+                ('temperature', models.FloatField(blank=True, null=True)),
+                ('humidity', models.FloatField(blank=True, null=True)),
+                ('precipitation', models.FloatField(blank=True, null=True)),
+                ('precipitation_type', models.CharField(blank=True, max_length=20, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'weather_location_snapshots',
+                'unique_together': {('district', 'neighborhood')},
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.9 on 2026-10-18 03:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0007_location_walk_snapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district', models.CharField(max_length=50)),
+                ('neighborhood', models.CharField(max_length=50)),
+                ('weather_data_id', models.BigIntegerField()),
+                ('forecast_time', models.DateTimeField()),
+                ('window_start', models.DateTimeField()),
+                ('recommendation', models.CharField(choices=[('INDOOR', '실내 활동을 추천드립니다.'), ('INDOOR_WALK', '실내 산책을 추천드립니다.'), ('SHORT_WALK', '짧은 산책만 추천드립니다.'), ('LIMITED_WALK', '산책 시간을 30분 이내로 제한하세요.'), ('GOOD', '산책하기 좋은 날씨입니다.')], max_length=200)),
+                ('warning', models.CharField(max_length=200)),
+                ('aqi', models.IntegerField(blank=True, null=True)),
+                ('fanned_out_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'weather_alerts',
+                'indexes': [models.Index(fields=['fanned_out_at', 'id'], name='weather_ale_fanned__1b7ddb_idx')],
+                'unique_together': {('district', 'neighborhood', 'recommendation', 'window_start')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WeatherAlertDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('neighborhood', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('PENDING', '대기'), ('SENT', '발송'), ('SUPPRESSED', '발송 제한')], default='PENDING', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('alert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='weather.weatheralert')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weather_alerts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'weather_alert_deliveries',
+                'indexes': [models.Index(fields=['status', 'id'], name='weather_ale_status_134982_idx'), models.Index(fields=['user', 'sent_at'], name='weather_ale_user_id_28fa85_idx')],
+                'unique_together': {('alert', 'user')},
+            },
+        ),
+    ]
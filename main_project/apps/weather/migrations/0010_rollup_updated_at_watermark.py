@@ -0,0 +1,26 @@
+# Generated by Django 5.0.9 on 2026-10-18 03:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0009_weatherdata_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='rollupwatermark',
+            name='last_id',
+        ),
+        migrations.AddField(
+            model_name='rollupwatermark',
+            name='processed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='weatherdata',
+            index=models.Index(fields=['updated_at'], name='weather_updated_at_idx'),
+        ),
+    ]
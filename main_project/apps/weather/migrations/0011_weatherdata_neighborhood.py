@@ -0,0 +1,26 @@
+# Generated by Django 5.0.9 on 2026-10-18 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0010_rollup_updated_at_watermark'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='weatherdata',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='weatherdata',
+            name='neighborhood',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterUniqueTogether(
+            name='weatherdata',
+            unique_together={('district', 'neighborhood', 'forecast_time')},
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.9 on 2026-10-18 03:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0011_weatherdata_neighborhood'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weatheralertdelivery',
+            name='attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='weatheralertdelivery',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='weatheralertdelivery',
+            name='status',
+            field=models.CharField(choices=[('PENDING', '대기'), ('SENT', '발송'), ('SUPPRESSED', '발송 제한'), ('FAILED', '발송 실패')], default='PENDING', max_length=20),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+# 알림 팬아웃이 쓰는 UserLocation(district, neighborhood) 인덱스는 users 0002의 AddIndex가 만든다.
+# 그 전에 user_locations를 마이그레이션 밖에서 만든 DB에만 인덱스를 보충하고, 테이블이 없으면 아무것도 하지 않는다.
+
+INDEX = 'user_location_area_idx'
+
+
+def create_index(apps, schema_editor):
+    if 'user_locations' not in schema_editor.connection.introspection.table_names():
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS "{INDEX}" ON "user_locations" ("district", "neighborhood")'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0012_alert_delivery_retries'),
+        ('users', '0002_users_table_and_user_location'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, migrations.RunPython.noop),
+    ]
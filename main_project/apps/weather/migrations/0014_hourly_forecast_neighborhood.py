@@ -0,0 +1,26 @@
+# Generated by Django 5.0.9 on 2026-10-18 03:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0013_user_location_area_index'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='hourlyforecast',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='hourlyforecast',
+            name='neighborhood',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hourlyforecast',
+            unique_together={('district', 'neighborhood', 'date')},
+        ),
+    ]
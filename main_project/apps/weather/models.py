@@ -1,7 +1,42 @@
-from django.db import models
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, models
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+
+class WeatherDataQuerySet(models.QuerySet):
+    def recent(self, window: timedelta = None):
+        # forecast_time 하한을 두어 파티션 pruning으로 최근 파티션만 조회하게 한다
+        window = window or timedelta(seconds=settings.WEATHER_RECENT_WINDOW)
+        return self.filter(forecast_time__gte=timezone.now() - window)
+
+    def latest_for(self, locations, window: timedelta = None):
+        # (district, neighborhood) 위치마다 가장 최근 측정값 한 행씩을 단일 쿼리로 가져온다.
+        # neighborhood는 정규화된 위치(동 또는 '@측정소')이고, recent() 구간 안에서만 찾으므로 최근 파티션만 읽는다
+        condition = Q()
+        for district, neighborhood in locations:
+            condition |= Q(district=district, neighborhood=neighborhood)
+        if not condition:
+            return self.none()
+        queryset = self.recent(window).filter(condition)
+        if connections[self.db].vendor == 'postgresql':
+            return queryset.order_by('district', 'neighborhood', '-forecast_time').distinct('district', 'neighborhood')
+        return queryset.annotate(
+            latest_rank=Window(
+                RowNumber(),
+                partition_by=[F('district'), F('neighborhood')],
+                order_by=F('forecast_time').desc(),
+            ),
+        ).filter(latest_rank=1)
+
 
 class WeatherData(models.Model):
     district = models.CharField(max_length=50)
+    # 측정 위치 (측정소 인덱스로 합친 동 이름 또는 "@측정소"). 같은 구의 여러 측정소 관측값을 구분한다
+    neighborhood = models.CharField(max_length=50, default='', blank=True)
     aqi = models.IntegerField(null=True, blank=True)
     temperature = models.FloatField(null=True, blank=True)
     humidity = models.FloatField(null=True, blank=True)
@@ -13,14 +48,22 @@ class WeatherData(models.Model):
     walking_score = models.IntegerField(default=0)
     forecast_time = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # upsert로 값이 바뀔 때마다 갱신된다 (Last-Modified)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = WeatherDataQuerySet.as_manager()
 
     class Meta:
         db_table = 'weather_data'
         indexes = [
-            models.Index(fields=['district']),
-            models.Index(fields=['forecast_time']),
+            # district 단독 조회도 이 인덱스의 선두 컬럼으로 처리된다
+            models.Index(fields=['district', '-forecast_time'], name='weather_district_latest_idx'),
+            # 목록 API의 (forecast_time, id) 커서 페이지네이션과 기간 필터용
+            models.Index(fields=['forecast_time', 'id'], name='weather_forecast_time_id_idx'),
+            # 롤업 워터마크 (rollups.update_rollups)
+            models.Index(fields=['updated_at'], name='weather_updated_at_idx'),
         ]
-        unique_together = ('district', 'forecast_time')
+        unique_together = ('district', 'neighborhood', 'forecast_time')
 
     def __str__(self):
         return f"{self.district} - {self.forecast_time}"
@@ -34,10 +77,13 @@ class WalkingCondition(models.Model):
         ('GOOD', '산책하기 좋은 날씨입니다.')
     ]
 
+    # weather_data는 forecast_time으로 파티션되어 id 단독 유니크 제약을 둘 수 없으므로
+    # DB 수준 FK 없이 관계만 유지한다 (파티션 정리는 partitions.drop_partition 참고)
     weather_data = models.OneToOneField(
         WeatherData, 
         on_delete=models.CASCADE, 
-        related_name='walking_condition'
+        related_name='walking_condition',
+        db_constraint=False,
     )
     recommendation = models.CharField(
         max_length=200,
@@ -52,4 +98,198 @@ class WalkingCondition(models.Model):
         db_table = 'walking_conditions'
         
     def __str__(self):
-        return f"Walking Condition for {self.weather_data}"
\ No newline at end of file
+        return f"Walking Condition for {self.weather_data}"
+
+
+class WeatherRollup(models.Model):
+    # 평균과 함께 합계/개수(null 제외)도 저장해 더 긴 구간으로 다시 합칠 수 있게 한다
+    METRICS = ('aqi', 'pm10', 'pm25', 'temperature', 'walking_score')
+
+    district = models.CharField(max_length=50)
+    sample_count = models.IntegerField(default=0)
+    aqi_min = models.FloatField(null=True, blank=True)
+    aqi_max = models.FloatField(null=True, blank=True)
+    aqi_avg = models.FloatField(null=True, blank=True)
+    aqi_sum = models.FloatField(default=0)
+    aqi_count = models.IntegerField(default=0)
+    pm10_min = models.FloatField(null=True, blank=True)
+    pm10_max = models.FloatField(null=True, blank=True)
+    pm10_avg = models.FloatField(null=True, blank=True)
+    pm10_sum = models.FloatField(default=0)
+    pm10_count = models.IntegerField(default=0)
+    pm25_min = models.FloatField(null=True, blank=True)
+    pm25_max = models.FloatField(null=True, blank=True)
+    pm25_avg = models.FloatField(null=True, blank=True)
+    pm25_sum = models.FloatField(default=0)
+    pm25_count = models.IntegerField(default=0)
+    temperature_min = models.FloatField(null=True, blank=True)
+    temperature_max = models.FloatField(null=True, blank=True)
+    temperature_avg = models.FloatField(null=True, blank=True)
+    temperature_sum = models.FloatField(default=0)
+    temperature_count = models.IntegerField(default=0)
+    walking_score_min = models.FloatField(null=True, blank=True)
+    walking_score_max = models.FloatField(null=True, blank=True)
+    walking_score_avg = models.FloatField(null=True, blank=True)
+    walking_score_sum = models.FloatField(default=0)
+    walking_score_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class WeatherHourly(WeatherRollup):
+    bucket = models.DateTimeField()
+
+    class Meta:
+        db_table = 'weather_hourly'
+        unique_together = ('district', 'bucket')
+
+    def __str__(self):
+        return f"{self.district} - {self.bucket:%Y-%m-%d %H}시"
+
+
+class WeatherDaily(WeatherRollup):
+    bucket = models.DateField()
+
+    class Meta:
+        db_table = 'weather_daily'
+        unique_together = ('district', 'bucket')
+
+    def __str__(self):
+        return f"{self.district} - {self.bucket}"
+
+
+class RollupWatermark(models.Model):
+    # 롤업에 반영된 마지막 WeatherData.updated_at
+    name = models.CharField(max_length=50, unique=True)
+    processed_until = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'weather_rollup_watermarks'
+
+    def __str__(self):
+        return f"{self.name} @ {self.processed_until}"
+
+
+class HourlyForecast(models.Model):
+    # (구, 위치, 날짜)마다 한 행. 각 시계열은 0~23시 값 24개의 배열이고 예보가 없는 시간은 null이다.
+    # 위치(neighborhood)는 WeatherData.neighborhood와 같은 정규 위치(동 또는 '@측정소')다
+    # PostgreSQL 전용 ArrayField 대신 JSONField를 써서 SQLite 테스트에서도 같은 모델을 쓴다
+    SERIES = (
+        'aqi', 'pm25', 'temperature', 'humidity', 'wind_speed',
+        'precipitation', 'precipitation_probability', 'walking_score',
+    )
+
+    district = models.CharField(max_length=50)
+    neighborhood = models.CharField(max_length=50, default='', blank=True)
+    date = models.DateField()
+    aqi = models.JSONField(default=list)
+    pm25 = models.JSONField(default=list)
+    temperature = models.JSONField(default=list)
+    humidity = models.JSONField(default=list)
+    wind_speed = models.JSONField(default=list)
+    precipitation = models.JSONField(default=list)
+    precipitation_probability = models.JSONField(default=list)
+    walking_score = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'weather_hourly_forecasts'
+        unique_together = ('district', 'neighborhood', 'date')
+
+    def __str__(self):
+        return f"{self.district} {self.neighborhood} - {self.date} 예보"
+
+
+class LocationWalkSnapshot(models.Model):
+    # 메인 화면의 위치별 산책 카드. WeatherService가 WeatherData/WalkingCondition을 저장하는
+    # 트랜잭션에서 함께 갱신하는 비정규화 행이다 (캐시는 snapshots.WalkCardStore).
+    # 위치는 측정소 인덱스로 합친 뒤 WeatherCache.normalize로 정규화한 값이다
+    district = models.CharField(max_length=50)
+    neighborhood = models.CharField(max_length=50)
+    weather_data_id = models.BigIntegerField()
+    forecast_time = models.DateTimeField()
+    walking_score = models.IntegerField(default=0)
+    recommendation = models.CharField(max_length=200, choices=WalkingCondition.RECOMMENDATION_CHOICES)
+    warning = models.CharField(max_length=200, null=True, blank=True)
+    best_time_start = models.TimeField()
+    best_time_end = models.TimeField()
+    aqi = models.IntegerField(null=True, blank=True)
+    pm10 = models.FloatField(null=True, blank=True)
+    pm25 = models.FloatField(null=True, blank=True)
+    temperature = models.FloatField(null=True, blank=True)
+    humidity = models.FloatField(null=True, blank=True)
+    precipitation = models.FloatField(null=True, blank=True)
+    precipitation_type = models.CharField(max_length=20, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'weather_location_snapshots'
+        unique_together = ('district', 'neighborhood')
+
+    def __str__(self):
+        return f"{self.district} {self.neighborhood} 산책 카드"
+
+
+class WeatherAlert(models.Model):
+    # 경고가 붙은 읽음값으로 만든 위치별 알림 (아웃박스). 구독자별 발송 행은 send_weather_alerts가
+    # 팬아웃한다. 같은 위치·단계의 알림은 WEATHER_ALERT_DEDUPE_WINDOW 구간마다 한 번만 만든다.
+    # 위치는 측정소 인덱스로 합친 값이다 (stations.LocationIndex.members로 원래 동들을 찾는다)
+    district = models.CharField(max_length=50)
+    neighborhood = models.CharField(max_length=50)
+    weather_data_id = models.BigIntegerField()
+    forecast_time = models.DateTimeField()
+    window_start = models.DateTimeField()
+    recommendation = models.CharField(max_length=200, choices=WalkingCondition.RECOMMENDATION_CHOICES)
+    warning = models.CharField(max_length=200)
+    aqi = models.IntegerField(null=True, blank=True)
+    fanned_out_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'weather_alerts'
+        unique_together = ('district', 'neighborhood', 'recommendation', 'window_start')
+        indexes = [
+            models.Index(fields=['fanned_out_at', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.district} {self.neighborhood} {self.recommendation} 알림"
+
+
+class WeatherAlertDelivery(models.Model):
+    PENDING = 'PENDING'
+    SENT = 'SENT'
+    SUPPRESSED = 'SUPPRESSED'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (PENDING, '대기'),
+        (SENT, '발송'),
+        (SUPPRESSED, '발송 제한'),
+        (FAILED, '발송 실패'),
+    ]
+
+    alert = models.ForeignKey(WeatherAlert, on_delete=models.CASCADE, related_name='deliveries')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='weather_alerts')
+    # 사용자가 등록한 동 이름 (알림 문구용)
+    neighborhood = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # 발송 실패 횟수와 다음 재시도 시각 (AlertDispatcher._back_off)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'weather_alert_deliveries'
+        unique_together = ('alert', 'user')
+        indexes = [
+            models.Index(fields=['status', 'id']),
+            # 사용자별 발송 제한 확인 (최근 WEATHER_ALERT_USER_WINDOW 동안 보낸 수)
+            models.Index(fields=['user', 'sent_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.alert} → {self.user_id} ({self.status})"
@@ -0,0 +1,238 @@
+"""
+대기질 경고 알림.
+
+경고(WalkingCondition.warning)가 붙은 읽음값을 저장하는 트랜잭션에서 위치·단계별 WeatherAlert 한 행만
+만든다. 구독자 수만큼의 발송 행은 요청 경로가 아니라 send_weather_alerts 명령이 만든다.
+팬아웃은 UserLocation(district, neighborhood) 인덱스로 구독자를 배치 단위로 읽어 bulk insert하고,
+발송은 배치마다 사용자별 최근 발송 수를 한 번에 세어 제한을 넘는 알림을 SUPPRESSED로 남긴다.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import orjson
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from main_project.apps.users.models import UserLocation
+from . import metrics
+from .cache import Location
+from .models import WalkingCondition, WeatherAlert, WeatherAlertDelivery, WeatherData
+from .stations import LocationIndex, get_location_index
+
+logger = logging.getLogger(__name__)
+
+
+def alert_window_start(forecast_time: datetime) -> datetime:
+    # 같은 위치·단계의 경고는 이 구간 안에서 한 번만 알린다
+    window = settings.WEATHER_ALERT_DEDUPE_WINDOW
+    return datetime.fromtimestamp(forecast_time.timestamp() // window * window, tz=forecast_time.tzinfo)
+
+
+def enqueue_alerts(rows: Dict[Location, Tuple[WeatherData, WalkingCondition]]) -> None:
+    # WeatherService.save_many의 트랜잭션 안에서 호출된다. 위치마다 최대 한 행이다
+    alerts = [
+        WeatherAlert(
+            district=district,
+            neighborhood=neighborhood,
+            weather_data_id=weather_data.pk,
+            forecast_time=weather_data.forecast_time,
+            window_start=alert_window_start(weather_data.forecast_time),
+            recommendation=condition.recommendation,
+            warning=condition.warning,
+            aqi=weather_data.aqi,
+        )
+        for (district, neighborhood), (weather_data, condition) in rows.items()
+        if condition.warning
+    ]
+    if alerts:
+        WeatherAlert.objects.bulk_create(alerts, ignore_conflicts=True)
+
+
+class AlertTransport:
+    """알림 발송 수단. send가 예외를 올리면 배치 전체를 점점 긴 간격으로 다시 보낸다 (AlertDispatcher.deliver)."""
+
+    def send(self, messages: List[Dict]) -> None:
+        raise NotImplementedError
+
+
+class LogTransport(AlertTransport):
+    # 로컬/개발용: 알림을 로그로만 남긴다
+    def send(self, messages: List[Dict]) -> None:
+        for message in messages:
+            logger.info("Weather alert for user %s: %s", message['user_id'], message['warning'], extra={'alert': message})
+
+
+class FileTransport(AlertTransport):
+    # 로컬/테스트용: 알림을 JSON Lines로 파일에 덧붙인다
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def send(self, messages: List[Dict]) -> None:
+        with open(self.path, 'ab') as f:
+            f.writelines(orjson.dumps(message) + b'\n' for message in messages)
+
+
+def get_transport() -> AlertTransport:
+    options = dict(settings.WEATHER_ALERT_TRANSPORT)
+    return import_string(options.pop('class'))(**options)
+
+
+@dataclass
+class AlertResult:
+    alerts: int = 0
+    deliveries: int = 0
+    sent: int = 0
+    suppressed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+
+class AlertDispatcher:
+    def __init__(self, transport: AlertTransport = None, index: LocationIndex = None, batch_size: int = None):
+        self.transport = transport or get_transport()
+        self.index = index or get_location_index()
+        self.batch_size = batch_size or settings.WEATHER_ALERT_BATCH_SIZE
+
+    def run(self) -> AlertResult:
+        started = time.monotonic()
+        result = AlertResult()
+        result.alerts, result.deliveries = self.fan_out()
+        result.sent, result.suppressed, result.failed = self.deliver()
+        result.elapsed = time.monotonic() - started
+        return result
+
+    def fan_out(self) -> Tuple[int, int]:
+        # 팬아웃하지 않은 알림마다 구독자를 배치로 읽어 발송 행을 만든다. (알림 수, 읽은 구독 수)를 돌려준다.
+        # 같은 사용자가 한 측정소의 여러 동을 등록했어도 (alert, user) 유니크 제약으로 한 번만 들어간다
+        alerts = deliveries = 0
+        while True:
+            with transaction.atomic():
+                pending = list(
+                    WeatherAlert.objects.filter(fanned_out_at__isnull=True)
+                    .select_for_update(skip_locked=True)
+                    .order_by('id')[:self.batch_size]
+                )
+                if not pending:
+                    return alerts, deliveries
+                for alert in pending:
+                    deliveries += self._fan_out_alert(alert)
+                WeatherAlert.objects.filter(id__in=[alert.id for alert in pending]).update(fanned_out_at=timezone.now())
+                alerts += len(pending)
+
+    def _fan_out_alert(self, alert: WeatherAlert) -> int:
+        neighborhoods = [neighborhood for _, neighborhood in self.index.members(alert.district, alert.neighborhood)]
+        subscribers = (
+            UserLocation.objects.filter(district=alert.district, neighborhood__in=neighborhoods, user__is_active=True)
+            .order_by()
+            .values_list('user_id', 'neighborhood')
+            .iterator(chunk_size=self.batch_size)
+        )
+
+        count = 0
+        batch = []
+        for user_id, neighborhood in subscribers:
+            batch.append(WeatherAlertDelivery(alert=alert, user_id=user_id, neighborhood=neighborhood))
+            if len(batch) >= self.batch_size:
+                WeatherAlertDelivery.objects.bulk_create(batch, ignore_conflicts=True)
+                count += len(batch)
+                batch = []
+        if batch:
+            WeatherAlertDelivery.objects.bulk_create(batch, ignore_conflicts=True)
+            count += len(batch)
+        return count
+
+    def deliver(self) -> Tuple[int, int, int]:
+        # 발송에 실패한 배치는 재시도 시각을 뒤로 미루므로 같은 실행에서 다시 집히지 않고 다음 배치로 넘어간다
+        sent = suppressed = failed = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    WeatherAlertDelivery.objects.filter(status=WeatherAlertDelivery.PENDING)
+                    .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=timezone.now()))
+                    .select_related('alert')
+                    .select_for_update(skip_locked=True, of=('self',))
+                    .order_by('id')[:self.batch_size]
+                )
+                if not batch:
+                    return sent, suppressed, failed
+                sent_ids, suppressed_ids, failed_ids = self._deliver_batch(batch)
+            sent += len(sent_ids)
+            suppressed += len(suppressed_ids)
+            failed += len(failed_ids)
+            metrics.ALERT_DELIVERIES.labels('sent').inc(len(sent_ids))
+            metrics.ALERT_DELIVERIES.labels('suppressed').inc(len(suppressed_ids))
+            metrics.ALERT_DELIVERIES.labels('failed').inc(len(failed_ids))
+
+    def _deliver_batch(self, batch: List[WeatherAlertDelivery]) -> Tuple[List[int], List[int], List[int]]:
+        # 배치에 든 사용자들의 최근 발송 수를 한 쿼리로 세고, 배치 안에서도 누적해 제한을 적용한다
+        now = timezone.now()
+        counts = dict(
+            WeatherAlertDelivery.objects.filter(
+                user_id__in={delivery.user_id for delivery in batch},
+                status=WeatherAlertDelivery.SENT,
+                sent_at__gte=now - timedelta(seconds=settings.WEATHER_ALERT_USER_WINDOW),
+            )
+            .values('user_id')
+            .annotate(count=Count('id'))
+            .values_list('user_id', 'count')
+        )
+
+        messages, sent_ids, suppressed_ids = [], [], []
+        for delivery in batch:
+            if counts.get(delivery.user_id, 0) >= settings.WEATHER_ALERT_USER_LIMIT:
+                suppressed_ids.append(delivery.id)
+                continue
+            counts[delivery.user_id] = counts.get(delivery.user_id, 0) + 1
+            sent_ids.append(delivery.id)
+            messages.append(self._message(delivery))
+
+        WeatherAlertDelivery.objects.filter(id__in=suppressed_ids).update(status=WeatherAlertDelivery.SUPPRESSED)
+        if messages:
+            try:
+                self.transport.send(messages)
+            except Exception:
+                logger.exception("Failed to deliver %d weather alerts", len(messages))
+                self._back_off(sent_ids, now)
+                return [], suppressed_ids, sent_ids
+        WeatherAlertDelivery.objects.filter(id__in=sent_ids).update(status=WeatherAlertDelivery.SENT, sent_at=now)
+        return sent_ids, suppressed_ids, []
+
+    @staticmethod
+    def _back_off(ids: List[int], now) -> None:
+        # 재시도 간격은 WEATHER_ALERT_RETRY_BACKOFF초부터 두 배씩 늘리고,
+        # WEATHER_ALERT_MAX_ATTEMPTS번 실패하면 FAILED로 남기고 더 보내지 않는다
+        attempts = dict(WeatherAlertDelivery.objects.filter(id__in=ids).values_list('id', 'attempts'))
+        by_attempt = {}
+        for pk, count in attempts.items():
+            by_attempt.setdefault(count + 1, []).append(pk)
+        for attempt, pks in by_attempt.items():
+            if attempt >= settings.WEATHER_ALERT_MAX_ATTEMPTS:
+                WeatherAlertDelivery.objects.filter(id__in=pks).update(
+                    attempts=F('attempts') + 1, status=WeatherAlertDelivery.FAILED,
+                )
+                continue
+            delay = timedelta(seconds=settings.WEATHER_ALERT_RETRY_BACKOFF * 2 ** (attempt - 1))
+            WeatherAlertDelivery.objects.filter(id__in=pks).update(
+                attempts=F('attempts') + 1, next_attempt_at=now + delay,
+            )
+
+    @staticmethod
+    def _message(delivery: WeatherAlertDelivery) -> Dict:
+        alert = delivery.alert
+        return {
+            'id': delivery.id,
+            'user_id': delivery.user_id,
+            'district': alert.district,
+            'neighborhood': delivery.neighborhood,
+            'recommendation': alert.recommendation,
+            'warning': alert.warning,
+            'aqi': alert.aqi,
+            'forecast_time': alert.forecast_time.isoformat(),
+        }
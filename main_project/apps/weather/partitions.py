@@ -0,0 +1,142 @@
+import logging
+from datetime import date, datetime, timezone as dt_timezone
+from typing import List, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = 'weather_data'
+DEFAULT_PARTITION = f'{PARENT_TABLE}_default'
+CONDITION_TABLE = 'walking_conditions'
+
+
+def month_start(value: date, offset: int = 0) -> date:
+    month_index = value.year * 12 + value.month - 1 + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_{month:%Y_%m}"
+
+
+def partition_bounds(month: date) -> Tuple[datetime, datetime]:
+    # 파티션 경계는 DB 세션 시간대와 같은 UTC 기준 월 시작 시각이다
+    start = month_start(month)
+    end = month_start(month, 1)
+    return (
+        datetime(start.year, start.month, 1, tzinfo=dt_timezone.utc),
+        datetime(end.year, end.month, 1, tzinfo=dt_timezone.utc),
+    )
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass",
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions() -> List[Tuple[str, date]]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            ORDER BY child.relname
+            """,
+            [PARENT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        try:
+            month = datetime.strptime(name.removeprefix(f"{PARENT_TABLE}_"), '%Y_%m').date()
+        except ValueError:
+            continue
+        partitions.append((name, month))
+    return partitions
+
+
+def create_partition(month: date) -> bool:
+    # DEFAULT 파티션에 이미 이 달의 행이 있으면 CREATE ... PARTITION OF가 실패하므로,
+    # DEFAULT를 떼어낸 뒤 새 파티션을 만들고 그 달의 행을 옮긴 다음 다시 붙인다
+    start, end = partition_bounds(month)
+    name = partition_name(month)
+    bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s), to_regclass(%s)", [name, DEFAULT_PARTITION])
+        existing, default = cursor.fetchone()
+        if existing is not None:
+            return False
+
+        moved = 0
+        has_rows = False
+        if default is not None:
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" '
+                f'WHERE "forecast_time" >= %s AND "forecast_time" < %s)',
+                [start, end],
+            )
+            has_rows = cursor.fetchone()[0]
+        if has_rows:
+            cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{DEFAULT_PARTITION}"')
+            cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{PARENT_TABLE}" FOR VALUES {bounds}')
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+                f'WHERE "forecast_time" >= %s AND "forecast_time" < %s RETURNING *) '
+                f'INSERT INTO "{name}" SELECT * FROM moved',
+                [start, end],
+            )
+            moved = cursor.rowcount
+            cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT')
+        else:
+            cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{PARENT_TABLE}" FOR VALUES {bounds}')
+    logger.info("Created partition %s (moved %d rows from %s)", name, moved, DEFAULT_PARTITION)
+    return True
+
+
+def ensure_partitions(months_ahead: int = 3, today: date = None) -> List[str]:
+    # 현재 달부터 months_ahead개월 뒤까지 파티션을 미리 만든다
+    today = today or timezone.now().date()
+    created = []
+    for offset in range(months_ahead + 1):
+        month = month_start(today, offset)
+        if create_partition(month):
+            created.append(partition_name(month))
+    return created
+
+
+def expired_partitions(retain_months: int, today: date = None) -> List[Tuple[str, date]]:
+    cutoff = month_start(today or timezone.now().date(), -retain_months)
+    return [(name, month) for name, month in list_partitions() if month < cutoff]
+
+
+def drop_partition(month: date, archive: bool = False) -> None:
+    # 행 단위 DELETE 대신 파티션 전체를 떼어낸다.
+    # walking_conditions는 파티션되지 않았으므로 해당 파티션의 행만 함께 정리한다.
+    name = partition_name(month)
+    suffix = f"{month:%Y_%m}"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"')
+        if archive:
+            cursor.execute(
+                f'CREATE TABLE "{CONDITION_TABLE}_archive_{suffix}" AS '
+                f'SELECT c.* FROM "{CONDITION_TABLE}" c JOIN "{name}" p ON c.weather_data_id = p.id',
+            )
+        cursor.execute(
+            f'DELETE FROM "{CONDITION_TABLE}" c USING "{name}" p WHERE c.weather_data_id = p.id',
+        )
+        if archive:
+            cursor.execute(f'ALTER TABLE "{name}" RENAME TO "{PARENT_TABLE}_archive_{suffix}"')
+        else:
+            cursor.execute(f'DROP TABLE "{name}"')
+    logger.info("%s partition %s", "Archived" if archive else "Dropped", name)
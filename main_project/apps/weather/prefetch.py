@@ -0,0 +1,57 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+from main_project.apps.users.models import UserLocation
+from .services import Location, WeatherService
+
+logger = logging.getLogger(__name__)
+
+
+def get_prefetch_locations() -> List[Location]:
+    return list(
+        UserLocation.objects.order_by('district', 'neighborhood')
+        .values_list('district', 'neighborhood')
+        .distinct()
+    )
+
+
+@dataclass
+class PrefetchResult:
+    total: int = 0
+    refreshed: int = 0
+    skipped: int = 0
+    failed: List[Location] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+class WeatherPrefetcher:
+    def __init__(self, service: WeatherService = None, concurrency: int = 8):
+        self.service = service or WeatherService()
+        self.concurrency = max(1, concurrency)
+
+    def run(self, locations: List[Location] = None) -> PrefetchResult:
+        started = time.monotonic()
+        locations = get_prefetch_locations() if locations is None else locations
+        result = PrefetchResult(total=len(locations))
+
+        # 동시에 WAQI를 호출하는 커넥션 수를 concurrency로 제한하고 결과는 일괄 저장한다
+        try:
+            outcomes = self.service.refresh_many(locations, max_connections=self.concurrency)
+        except Exception as e:
+            logger.exception("Failed to prefetch weather for %d locations", len(locations))
+            outcomes = {location: e for location in locations}
+
+        for location in locations:
+            outcome = outcomes.get(location)
+            if outcome is None:
+                result.skipped += 1
+            elif isinstance(outcome, Exception):
+                logger.warning("Failed to prefetch weather for %s-%s: %s", *location, outcome)
+                result.failed.append(location)
+            else:
+                result.refreshed += 1
+
+        result.elapsed = time.monotonic() - started
+        return result
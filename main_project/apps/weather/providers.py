@@ -0,0 +1,462 @@
+"""
+날씨 데이터 제공자와 병렬 수집 파이프라인.
+
+WeatherPipeline은 settings.WEATHER_PROVIDERS의 제공자들(WAQI 대기질, 기상청 실황/예보 등)을
+위치마다 동시에 호출하고, 각 제공자가 돌려준 부분 관측값을 설정 순서대로 합쳐
+하나의 WeatherData 입력으로 만든다. 시간별 예보도 같은 방식으로 시각별로 합쳐
+입력의 'hourly'에 담는다 (forecast.build_forecast 참고). 제공자마다 timeout이 따로 있어 느린 소스 하나가
+전체를 붙잡지 않고, required가 아닌 제공자의 실패는 해당 필드만 비운 채 넘어간다.
+
+호출은 프로세스당 하나인 이벤트 루프 스레드에서 실행되므로 동기(WSGI) 경로에서도
+제공자들을 병렬로 호출하고, 제공자별 httpx 커넥션 풀(keep-alive)을 요청 간에 공유한다.
+"""
+import asyncio
+import contextvars
+import json
+import logging
+import math
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpx
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .cache import Location
+from .clients import AsyncWaqiClient
+from .metrics import UpstreamTimer
+from .stations import LocationIndex, get_location_index
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderError(Exception):
+    pass
+
+
+class ProviderTimeout(TimeoutError):
+    pass
+
+
+class _LoopThread:
+    """동기 코드가 코루틴을 제출하고 결과를 기다리는 프로세스 단위 이벤트 루프 스레드."""
+
+    def __init__(self):
+        self._reset()
+        # fork된 워커에는 부모의 루프 스레드가 없으므로 처음부터 다시 띄운다
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        # fork 순간 다른 스레드가 쥐고 있던 락은 자식에서 영원히 풀리지 않으므로 새로 만든다
+        self._lock = threading.Lock()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                threading.Thread(target=self.loop.run_forever, name='weather-providers', daemon=True).start()
+            return self.loop
+
+    def run(self, coro) -> Any:
+        # 요청 ID, 요청 타이밍 같은 contextvar를 루프 스레드의 태스크로 넘긴다
+        context = contextvars.copy_context()
+        return asyncio.run_coroutine_threadsafe(_in_context(coro, context), self._get_loop()).result()
+
+    def http_client(self, name: str) -> httpx.AsyncClient:
+        # 루프 스레드 안에서만 호출된다
+        client = self.clients.get(name)
+        if client is None:
+            limit = settings.WEATHER_API_MAX_CONNECTIONS
+            client = self.clients[name] = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+            )
+        return client
+
+
+async def _in_context(coro, context: contextvars.Context) -> Any:
+    for var, value in context.items():
+        var.set(value)
+    return await coro
+
+
+_loop = _LoopThread()
+
+
+class WeatherProvider:
+    """
+    (district, neighborhood)의 부분 관측값을 WeatherData 필드 이름의 dict로 돌려주는 비동기 소스.
+
+    required 제공자가 실패하면 그 위치의 수집 전체가 실패한다.
+    """
+
+    name = 'provider'
+    required = False
+
+    def __init__(self, index: LocationIndex = None, timeout: float = None, required: bool = None):
+        self.index = index or get_location_index()
+        self.timeout = timeout or settings.WEATHER_API_TIMEOUT
+        if required is not None:
+            self.required = required
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def http(self) -> httpx.AsyncClient:
+        return _loop.http_client(self.name)
+
+    async def fetch(self, district: str, neighborhood: str) -> Dict:
+        raise NotImplementedError
+
+    async def forecast(self, district: str, neighborhood: str) -> List[Dict]:
+        # 시간별 예보: 'time'(정시, aware datetime)과 HourlyForecast.SERIES 필드의 dict 목록
+        return []
+
+
+class WaqiProvider(WeatherProvider):
+    """WAQI 피드: AQI, 미세먼지와 측정소의 기온/습도/풍속."""
+
+    name = 'waqi'
+    required = True
+
+    def __init__(self, index: LocationIndex = None, timeout: float = None, required: bool = None,
+                 base_url: str = None, api_key: str = None):
+        super().__init__(index, timeout, required)
+        self.base_url = base_url
+        self.api_key = api_key
+
+    async def fetch(self, district: str, neighborhood: str) -> Dict:
+        client = AsyncWaqiClient(self.base_url, self.api_key, self.timeout, client=self.http())
+        data = await client.fetch(self.index.feed_location(district, neighborhood))
+        iaqi = data.get('iaqi', {})
+        return {
+            'observed_at': waqi_observed_at(data),
+            'aqi': data.get('aqi'),
+            'temperature': iaqi.get('t', {}).get('v'),
+            'humidity': iaqi.get('h', {}).get('v'),
+            'wind_speed': iaqi.get('w', {}).get('v'),
+            'pm10': iaqi.get('pm10', {}).get('v'),
+            'pm25': iaqi.get('pm25', {}).get('v'),
+        }
+
+
+def waqi_observed_at(data: Dict) -> Optional[datetime]:
+    # 측정소의 관측 시각 (time.iso). 재시도해도 같은 관측값이면 같은 forecast_time이 된다
+    try:
+        return datetime.fromisoformat(data['time']['iso'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+# 기상청 동네예보 격자 (Lambert Conformal Conic, 5km)
+KMA_GRID = {
+    're': 6371.00877, 'grid': 5.0, 'slat1': 30.0, 'slat2': 60.0,
+    'olon': 126.0, 'olat': 38.0, 'xo': 43, 'yo': 136,
+}
+
+KMA_PRECIPITATION_TYPES = {
+    '1': '비', '2': '비/눈', '3': '눈', '5': '빗방울', '6': '빗방울눈날림', '7': '눈날림',
+}
+
+# 단기예보 발표 시각 (발표 10분 뒤부터 조회할 수 있다)
+KMA_FORECAST_HOURS = (2, 5, 8, 11, 14, 17, 20, 23)
+
+KMA_FORECAST_FIELDS = {
+    'TMP': 'temperature',
+    'REH': 'humidity',
+    'WSD': 'wind_speed',
+    'POP': 'precipitation_probability',
+}
+
+
+def kma_grid(lat: float, lon: float) -> Tuple[int, int]:
+    g = KMA_GRID
+    radians = math.pi / 180.0
+    re = g['re'] / g['grid']
+    slat1, slat2 = g['slat1'] * radians, g['slat2'] * radians
+    olon, olat = g['olon'] * radians, g['olat'] * radians
+
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(
+        math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+    )
+    sf = math.tan(math.pi * 0.25 + slat1 * 0.5) ** sn * math.cos(slat1) / sn
+    ro = re * sf / math.tan(math.pi * 0.25 + olat * 0.5) ** sn
+    ra = re * sf / math.tan(math.pi * 0.25 + lat * radians * 0.5) ** sn
+
+    theta = lon * radians - olon
+    if theta > math.pi:
+        theta -= 2.0 * math.pi
+    if theta < -math.pi:
+        theta += 2.0 * math.pi
+    theta *= sn
+    return math.floor(ra * math.sin(theta) + g['xo'] + 0.5), math.floor(ro - ra * math.cos(theta) + g['yo'] + 0.5)
+
+
+def kma_nowcast_base(now: datetime) -> Tuple[str, str]:
+    # 초단기실황은 매시 정각 관측값이 40분쯤 공개되므로 그 전에는 한 시간 전 값을 요청한다
+    if now.minute < 40:
+        now -= timedelta(hours=1)
+    return now.strftime('%Y%m%d'), now.strftime('%H00')
+
+
+def kma_forecast_base(now: datetime) -> Tuple[str, str]:
+    available = now - timedelta(minutes=10)
+    hour = max((hour for hour in KMA_FORECAST_HOURS if hour <= available.hour), default=None)
+    if hour is None:
+        available -= timedelta(days=1)
+        hour = KMA_FORECAST_HOURS[-1]
+    return available.strftime('%Y%m%d'), f'{hour:02d}00'
+
+
+def _kma_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _kma_precipitation(value: str) -> Optional[float]:
+    # 강수량은 "강수없음", "1mm 미만", "1.5mm", "30.0~50.0mm", "50.0mm 이상" 같은 문자열로도 온다
+    if value is None:
+        return None
+    value = str(value)
+    if '없음' in value:
+        return 0.0
+    match = re.search(r'\d+(?:\.\d+)?', value)
+    if match is None:
+        return None
+    amount = float(match.group())
+    return amount / 2 if '미만' in value else amount
+
+
+def _kma_items(payload: Dict) -> List[Dict]:
+    response = payload.get('response', {})
+    header = response.get('header', {})
+    if header.get('resultCode') != '00':
+        raise ProviderError(f"KMA Error: {header.get('resultMsg')}")
+    return response['body']['items']['item']
+
+
+def parse_kma_nowcast(payload: Dict) -> Dict:
+    values = {item['category']: item['obsrValue'] for item in _kma_items(payload)}
+    reading = {
+        'temperature': _kma_float(values.get('T1H')),
+        'humidity': _kma_float(values.get('REH')),
+        'wind_speed': _kma_float(values.get('WSD')),
+        'precipitation': _kma_precipitation(values.get('RN1')),
+    }
+    if 'PTY' in values:
+        reading['precipitation_type'] = KMA_PRECIPITATION_TYPES.get(str(values['PTY']))
+    return reading
+
+
+def parse_kma_forecast(payload: Dict) -> List[Dict]:
+    points = {}
+    for item in _kma_items(payload):
+        category = item['category']
+        if category == 'PCP':
+            name, value = 'precipitation', _kma_precipitation(item['fcstValue'])
+        elif category in KMA_FORECAST_FIELDS:
+            name, value = KMA_FORECAST_FIELDS[category], _kma_float(item['fcstValue'])
+        else:
+            continue
+        key = item['fcstDate'] + item['fcstTime']
+        if key not in points:
+            points[key] = {'time': timezone.make_aware(datetime.strptime(key, '%Y%m%d%H%M'))}
+        points[key][name] = value
+    return [points[key] for key in sorted(points)]
+
+
+class KmaProvider(WeatherProvider):
+    """
+    기상청 동네예보 API.
+
+    현재 값은 초단기실황(getUltraSrtNcst)의 기온, 습도, 풍속, 1시간 강수량, 강수 형태이고,
+    시간별 예보는 단기예보(getVilageFcst)의 기온, 습도, 풍속, 강수량, 강수확률이다.
+    """
+
+    name = 'kma'
+
+    def __init__(self, index: LocationIndex = None, timeout: float = None, required: bool = None,
+                 base_url: str = None, api_key: str = None):
+        super().__init__(index, timeout, required)
+        self.base_url = base_url or settings.WEATHER_KMA_BASE_URL
+        self.api_key = api_key if api_key is not None else settings.WEATHER_KMA_API_KEY
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key)
+
+    async def fetch(self, district: str, neighborhood: str) -> Dict:
+        base_date, base_time = kma_nowcast_base(timezone.localtime())
+        return await self._get('getUltraSrtNcst', district, neighborhood, base_date, base_time, 10, parse_kma_nowcast)
+
+    async def forecast(self, district: str, neighborhood: str) -> List[Dict]:
+        # 한 발표에 약 3일치 예보가 들어 있다 (시간당 12개 항목)
+        base_date, base_time = kma_forecast_base(timezone.localtime())
+        return await self._get('getVilageFcst', district, neighborhood, base_date, base_time, 1000, parse_kma_forecast)
+
+    async def _get(self, operation: str, district: str, neighborhood: str, base_date: str, base_time: str,
+                   rows: int, parse) -> Any:
+        # 격자 좌표는 측정소 인덱스(build_location_index)의 좌표, 없으면 구청 좌표에서 구한다
+        coordinates = self.index.coordinates(district, neighborhood)
+        if coordinates is None:
+            raise ProviderError(f"KMA Error: no coordinates for {district}-{neighborhood}")
+        nx, ny = kma_grid(*coordinates)
+
+        with UpstreamTimer(self.name) as timer:
+            try:
+                response = await self.http().get(
+                    f"{self.base_url}{operation}",
+                    params={
+                        'serviceKey': self.api_key,
+                        'dataType': 'JSON',
+                        'numOfRows': rows,
+                        'pageNo': 1,
+                        'base_date': base_date,
+                        'base_time': base_time,
+                        'nx': nx,
+                        'ny': ny,
+                    },
+                    timeout=self.timeout,
+                )
+            except httpx.TimeoutException:
+                timer.status = 'timeout'
+                raise
+            timer.status = str(response.status_code)
+            response.raise_for_status()
+            try:
+                return parse(response.json())
+            except ProviderError:
+                timer.status = 'api_error'
+                raise
+
+
+class FixtureProvider(WeatherProvider):
+    """
+    dict나 JSON 파일에 미리 적어 둔 관측값을 돌려주는 가짜 제공자 (테스트, 오프라인 개발용).
+
+    키는 WAQI 피드 위치("구-동" 또는 "@측정소")이고 "*"는 나머지 모든 위치에 쓰인다.
+    forecasts도 같은 키로 시간별 예보 목록을 준다 ('time'은 ISO 8601 문자열이어도 된다).
+    delay초 뒤에 응답하고, error가 있으면 그 예외를 던진다.
+    """
+
+    name = 'fixture'
+
+    def __init__(self, readings: Union[Dict, str, Path] = None, index: LocationIndex = None, timeout: float = None,
+                 required: bool = None, name: str = None, delay: float = 0.0, error: Exception = None,
+                 forecasts: Union[Dict, str, Path] = None):
+        super().__init__(index, timeout, required)
+        if isinstance(readings, (str, Path)):
+            readings = json.loads(Path(readings).read_text(encoding='utf-8'))
+        if isinstance(forecasts, (str, Path)):
+            forecasts = json.loads(Path(forecasts).read_text(encoding='utf-8'))
+        self.readings = readings or {}
+        self.forecasts = forecasts or {}
+        self.name = name or self.name
+        self.delay = delay
+        self.error = error
+        self.calls: List[Location] = []
+
+    async def fetch(self, district: str, neighborhood: str) -> Dict:
+        self.calls.append((district, neighborhood))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        location = self.index.feed_location(district, neighborhood)
+        reading = self.readings.get(location, self.readings.get('*'))
+        if reading is None:
+            raise ProviderError(f"{self.name}: no fixture for {location}")
+        return dict(reading)
+
+    async def forecast(self, district: str, neighborhood: str) -> List[Dict]:
+        location = self.index.feed_location(district, neighborhood)
+        points = self.forecasts.get(location, self.forecasts.get('*', []))
+        return [
+            {**point, 'time': datetime.fromisoformat(point['time'])} if isinstance(point['time'], str) else dict(point)
+            for point in points
+        ]
+
+
+class WeatherPipeline:
+    def __init__(self, providers: List[WeatherProvider]):
+        self.providers = providers
+
+    @classmethod
+    def from_settings(cls, index: LocationIndex = None) -> 'WeatherPipeline':
+        providers = []
+        for options in settings.WEATHER_PROVIDERS:
+            options = dict(options)
+            provider = import_string(options.pop('class'))(index=index, **options)
+            if provider.enabled:
+                providers.append(provider)
+        return cls(providers)
+
+    def fetch(self, district: str, neighborhood: str) -> Dict:
+        result = self.fetch_many([(district, neighborhood)])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def fetch_many(self, locations: List[Location], max_connections: int = None) -> List[Union[Dict, Exception]]:
+        # 실패한 위치는 예외 객체로 돌려주어 나머지 결과를 버리지 않는다
+        if not locations:
+            return []
+        return _loop.run(self._fetch_many(locations, max_connections))
+
+    async def _fetch_many(self, locations: List[Location], max_connections: int = None) -> List[Any]:
+        # 제공자마다 동시에 나가는 요청 수를 max_connections로 제한한다
+        limit = max_connections or settings.WEATHER_API_MAX_CONNECTIONS
+        semaphores = [asyncio.Semaphore(limit) for _ in self.providers]
+        return await asyncio.gather(
+            *(self._fetch_one(location, semaphores) for location in locations),
+            return_exceptions=True,
+        )
+
+    async def _fetch_one(self, location: Location, semaphores: List[asyncio.Semaphore]) -> Dict:
+        # 현재 값과 시간별 예보를 모든 제공자에 한꺼번에 요청한다
+        pairs = list(zip(self.providers, semaphores))
+        results = await asyncio.gather(
+            *(self._call(provider, provider.fetch, location, semaphore) for provider, semaphore in pairs),
+            *(self._call(provider, provider.forecast, location, semaphore) for provider, semaphore in pairs),
+            return_exceptions=True,
+        )
+        readings, forecasts = results[:len(pairs)], results[len(pairs):]
+
+        # 설정 순서대로 합치며, 뒤의 제공자가 준 값(None 제외)이 앞의 값을 덮어쓴다
+        reading = {}
+        for provider, result in zip(self.providers, readings):
+            if isinstance(result, Exception):
+                if provider.required:
+                    raise result
+                logger.warning("Weather provider %s failed for %s-%s: %s", provider.name, *location, result)
+                continue
+            reading.update((key, value) for key, value in result.items() if value is not None)
+
+        # 예보는 부가 정보이므로 required 제공자라도 실패하면 건너뛴다
+        hourly = {}
+        for provider, result in zip(self.providers, forecasts):
+            if isinstance(result, Exception):
+                logger.warning("Weather provider %s forecast failed for %s-%s: %s", provider.name, *location, result)
+                continue
+            for point in result:
+                merged = hourly.setdefault(point['time'], {})
+                merged.update((key, value) for key, value in point.items() if value is not None)
+        if hourly:
+            reading['hourly'] = [hourly[moment] for moment in sorted(hourly)]
+        return reading
+
+    async def _call(self, provider: WeatherProvider, method, location: Location, semaphore: asyncio.Semaphore) -> Any:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(method(*location), provider.timeout)
+            except TimeoutError:
+                raise ProviderTimeout(f"{provider.name} timed out after {provider.timeout}s") from None
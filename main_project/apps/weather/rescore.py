@@ -0,0 +1,82 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import metrics
+from .models import WalkingCondition, WeatherData
+from .scoring import calculate_walking_scores, get_walking_recommendation
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RescoreProgress:
+    last_id: int = 0
+    scanned: int = 0
+    scores_updated: int = 0
+    conditions_updated: int = 0
+
+
+class WeatherRescorer:
+    """
+    weather_data를 id 기준 keyset 페이지네이션으로 훑으며 산책 점수와 추천을 다시 계산한다.
+
+    배치마다 짧은 트랜잭션으로 bulk_update하고 마지막 id를 on_batch로 넘기므로
+    메모리 사용량은 batch_size에만 비례하고, 중단되어도 그 id부터 재개할 수 있다.
+    """
+
+    def __init__(self, batch_size: int = 5000, on_batch: Optional[Callable[[RescoreProgress], None]] = None):
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+
+    def run(self, start_id: int = 0) -> RescoreProgress:
+        progress = RescoreProgress(last_id=start_id)
+
+        while True:
+            rows = list(
+                WeatherData.objects.filter(id__gt=progress.last_id)
+                .order_by('id')
+                .values_list('id', 'aqi', 'temperature', 'pm25', 'walking_score')[:self.batch_size]
+            )
+            if not rows:
+                return progress
+
+            self._rescore_batch(rows, progress)
+            progress.last_id = rows[-1][0]
+            progress.scanned += len(rows)
+            if self.on_batch:
+                self.on_batch(progress)
+
+    def _rescore_batch(self, rows, progress: RescoreProgress) -> None:
+        ids, aqi, temperature, pm25, old_scores = zip(*rows)
+        with metrics.SCORING_SECONDS.labels('batch').time():
+            scores = calculate_walking_scores(aqi, temperature, pm25).tolist()
+        aqi_by_id = dict(zip(ids, aqi))
+
+        # updated_at도 갱신해야 롤업이 다시 집계하고 Last-Modified가 바뀐다
+        now = timezone.now()
+        weather_updates = [
+            WeatherData(id=pk, walking_score=score, updated_at=now)
+            for pk, score, old_score in zip(ids, scores, old_scores)
+            if score != old_score
+        ]
+
+        condition_updates = []
+        conditions = WalkingCondition.objects.filter(
+            weather_data_id__gte=ids[0],
+            weather_data_id__lte=ids[-1],
+        ).values_list('id', 'weather_data_id', 'recommendation', 'warning')
+        for pk, weather_data_id, old_recommendation, old_warning in conditions:
+            recommendation, warning = get_walking_recommendation(aqi_by_id.get(weather_data_id))
+            if (recommendation, warning) != (old_recommendation, old_warning):
+                condition_updates.append(WalkingCondition(id=pk, recommendation=recommendation, warning=warning))
+
+        with transaction.atomic():
+            WeatherData.objects.bulk_update(weather_updates, ['walking_score', 'updated_at'])
+            WalkingCondition.objects.bulk_update(condition_updates, ['recommendation', 'warning'])
+
+        progress.scores_updated += len(weather_updates)
+        progress.conditions_updated += len(condition_updates)
@@ -0,0 +1,144 @@
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple, Type
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, QuerySet, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from .models import RollupWatermark, WeatherDaily, WeatherData, WeatherHourly, WeatherRollup
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = 'weather_rollups'
+
+
+def _day_start(bucket: date) -> datetime:
+    return timezone.make_aware(datetime.combine(bucket, time.min))
+
+
+# (롤업 모델, forecast_time을 버킷으로 자르는 함수, 버킷 시작 시각, 버킷 길이). 버킷은 서비스 시간대 기준이다.
+ROLLUPS: Tuple[Tuple[Type[WeatherRollup], type, object, timedelta], ...] = (
+    (WeatherHourly, TruncHour, lambda bucket: bucket, timedelta(hours=1)),
+    (WeatherDaily, TruncDate, _day_start, timedelta(days=1)),
+)
+
+
+def _aggregations() -> Dict:
+    aggregations = {'sample_count': Count('id')}
+    for metric in WeatherRollup.METRICS:
+        aggregations.update({
+            f'{metric}_min': Min(metric),
+            f'{metric}_max': Max(metric),
+            f'{metric}_sum': Sum(metric),
+            f'{metric}_count': Count(metric),
+        })
+    return aggregations
+
+
+def _rollup_values(row: Dict) -> Dict:
+    values = {'sample_count': row['sample_count']}
+    for metric in WeatherRollup.METRICS:
+        total = row[f'{metric}_sum'] or 0
+        count = row[f'{metric}_count']
+        values.update({
+            f'{metric}_min': row[f'{metric}_min'],
+            f'{metric}_max': row[f'{metric}_max'],
+            f'{metric}_sum': total,
+            f'{metric}_count': count,
+            f'{metric}_avg': total / count if count else None,
+        })
+    return values
+
+
+def _update_fields():
+    fields = ['sample_count', 'updated_at']
+    for metric in WeatherRollup.METRICS:
+        fields += [f'{metric}_{suffix}' for suffix in ('min', 'max', 'avg', 'sum', 'count')]
+    return fields
+
+
+def _refresh(model: Type[WeatherRollup], trunc, bucket_start, span: timedelta, changed: QuerySet) -> int:
+    # 바뀐 행이 걸친 (구, 버킷)을 원본 전체에서 다시 집계해 덮어쓴다 (같은 행을 두 번 더하지 않는다)
+    touched = set(
+        changed.annotate(bucket=trunc('forecast_time'))
+        .values_list('district', 'bucket')
+        .order_by()
+        .distinct()
+    )
+    if not touched:
+        return 0
+
+    ranges = {}
+    for district, bucket in touched:
+        low, high = ranges.get(district, (bucket, bucket))
+        ranges[district] = (min(low, bucket), max(high, bucket))
+    condition = Q()
+    for district, (low, high) in ranges.items():
+        condition |= Q(district=district, forecast_time__gte=bucket_start(low), forecast_time__lt=bucket_start(high) + span)
+
+    rows = (
+        WeatherData.objects.filter(condition)
+        .annotate(bucket=trunc('forecast_time'))
+        .values('district', 'bucket')
+        .annotate(**_aggregations())
+        .order_by()
+    )
+    rollups = [
+        model(district=row['district'], bucket=row['bucket'], **_rollup_values(row))
+        for row in rows
+        if (row['district'], row['bucket']) in touched
+    ]
+    model.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=['district', 'bucket'],
+        update_fields=_update_fields(),
+    )
+    return len(rollups)
+
+
+def update_rollups(batch_size: int = 50000, max_batches: Optional[int] = None) -> int:
+    """
+    워터마크 이후 저장되거나 upsert로 바뀐 WeatherData가 걸친 시간/일 버킷을 다시 집계한다.
+
+    id는 커밋 순서와 다를 수 있으므로 updated_at을 워터마크로 쓰고, 아직 커밋되지 않았을 수 있는
+    최근 WEATHER_ROLLUP_SAFETY_LAG초의 행은 다음 실행으로 미룬다. 버킷은 원본에서 통째로 다시
+    계산하므로 같은 행을 여러 번 처리해도 결과가 같다. 처리한 행 수를 반환한다.
+    """
+    horizon = timezone.now() - timedelta(seconds=settings.WEATHER_ROLLUP_SAFETY_LAG)
+    processed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=WATERMARK_NAME)
+            pending = WeatherData.objects.filter(updated_at__lte=horizon)
+            if watermark.processed_until is not None:
+                pending = pending.filter(updated_at__gt=watermark.processed_until)
+            times = pending.order_by('updated_at').values_list('updated_at', flat=True)
+            upper = times[batch_size - 1:batch_size].first() or times.last()
+            if upper is None:
+                return processed
+
+            changed = pending.filter(updated_at__lte=upper)
+            count = changed.count()
+            for model, trunc, bucket_start, span in ROLLUPS:
+                _refresh(model, trunc, bucket_start, span, changed)
+
+            watermark.processed_until = upper
+            watermark.save(update_fields=['processed_until', 'updated_at'])
+
+        processed += count
+        batches += 1
+        logger.info("Rolled up weather data updated through %s (%d rows)", upper.isoformat(), count)
+    return processed
+
+
+def rebuild_rollups(batch_size: int = 50000) -> int:
+    with transaction.atomic():
+        WeatherHourly.objects.all().delete()
+        WeatherDaily.objects.all().delete()
+        RollupWatermark.objects.filter(name=WATERMARK_NAME).delete()
+    return update_rollups(batch_size)
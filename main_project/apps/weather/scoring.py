@@ -0,0 +1,115 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# 산책 점수 감점 기준표. 스칼라/배치 구현이 같은 표를 공유한다.
+# (기준값, 감점) 쌍은 위에서부터 처음 만족하는 구간 하나만 적용된다.
+
+# AQI가 기준값을 초과하면 감점
+AQI_PENALTIES: Tuple[Tuple[float, int], ...] = (
+    (300, 50),
+    (200, 40),
+    (150, 30),
+    (100, 20),
+    (50, 10),
+)
+
+# 기온이 (하한, 상한) 범위를 벗어나면 감점
+TEMPERATURE_PENALTIES: Tuple[Tuple[Tuple[float, float], int], ...] = (
+    ((5, 35), 30),
+    ((10, 30), 20),
+    ((15, 25), 10),
+)
+
+# PM2.5가 기준값을 초과하면 감점
+PM25_PENALTIES: Tuple[Tuple[float, int], ...] = (
+    (150, 20),
+    (100, 15),
+    (50, 10),
+)
+
+# AQI가 기준값을 초과하면 (WalkingCondition 추천 코드, 경고 문구)
+RECOMMENDATION_TIERS: Tuple[Tuple[float, str, str], ...] = (
+    (300, 'INDOOR', "매우 위험한 대기질. 외출을 피해주세요."),
+    (200, 'INDOOR_WALK', "매우 나쁜 대기질. 외출을 자제해주세요."),
+    (150, 'SHORT_WALK', "나쁜 대기질. 민감군은 외출을 피해주세요."),
+    (100, 'LIMITED_WALK', "민감군 주의. 장시간 실외 활동을 피해주세요."),
+)
+DEFAULT_RECOMMENDATION = 'GOOD'
+
+MAX_SCORE = 100
+
+
+def _above_penalty(value: Optional[float], table) -> int:
+    # 값이 없거나 0이면 감점하지 않는다 (기존 동작 유지)
+    if not value:
+        return 0
+    for threshold, penalty in table:
+        if value > threshold:
+            return penalty
+    return 0
+
+
+def _outside_penalty(value: Optional[float], table) -> int:
+    if not value:
+        return 0
+    for (low, high), penalty in table:
+        if value < low or value > high:
+            return penalty
+    return 0
+
+
+def calculate_walking_score(aqi: Optional[float], temperature: Optional[float], pm25: Optional[float]) -> int:
+    score = MAX_SCORE
+    score -= _above_penalty(aqi, AQI_PENALTIES)
+    score -= _outside_penalty(temperature, TEMPERATURE_PENALTIES)
+    score -= _above_penalty(pm25, PM25_PENALTIES)
+    return max(0, min(score, MAX_SCORE))
+
+
+def get_walking_recommendation(aqi: Optional[float]) -> Tuple[str, Optional[str]]:
+    aqi = aqi or 0
+    for threshold, recommendation, warning in RECOMMENDATION_TIERS:
+        if aqi > threshold:
+            return recommendation, warning
+    return DEFAULT_RECOMMENDATION, None
+
+
+def _as_array(values: Sequence[Optional[float]]) -> np.ndarray:
+    # None은 NaN으로 바꾸고, 스칼라 구현과 같이 NaN/0은 감점 대상에서 제외한다
+    array = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(array), 0.0, array)
+
+
+def _above_penalties(values: np.ndarray, table) -> np.ndarray:
+    conditions = [values > threshold for threshold, _ in table]
+    penalties = [penalty for _, penalty in table]
+    return np.select(conditions, penalties, default=0) * (values != 0)
+
+
+def _outside_penalties(values: np.ndarray, table) -> np.ndarray:
+    conditions = [(values < low) | (values > high) for (low, high), _ in table]
+    penalties = [penalty for _, penalty in table]
+    return np.select(conditions, penalties, default=0) * (values != 0)
+
+
+def calculate_walking_scores(
+    aqi: Sequence[Optional[float]],
+    temperature: Sequence[Optional[float]],
+    pm25: Sequence[Optional[float]],
+) -> np.ndarray:
+    """
+    calculate_walking_score의 배치 버전.
+
+    values_list('aqi', 'temperature', 'pm25')에서 얻은 컬럼 배열을 받아
+    행마다 스칼라 구현과 동일한 점수를 int64 배열로 반환한다.
+    """
+    aqi_values = _as_array(aqi)
+    temperature_values = _as_array(temperature)
+    pm25_values = _as_array(pm25)
+
+    scores = np.full(aqi_values.shape, MAX_SCORE, dtype=np.int64)
+    scores -= _above_penalties(aqi_values, AQI_PENALTIES)
+    scores -= _outside_penalties(temperature_values, TEMPERATURE_PENALTIES)
+    scores -= _above_penalties(pm25_values, PM25_PENALTIES)
+    return np.clip(scores, 0, MAX_SCORE)
@@ -1,118 +1,422 @@
-from typing import Dict, Any, Tuple
-from datetime import datetime, time
-import requests
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import time
+import logging
+import time as time_module
+import httpx
 from django.conf import settings
-from .models import WeatherData, WalkingCondition
+from django.db import transaction
+from django.utils import timezone
+from . import metrics
+from .cache import Location, WeatherCache
+from .circuit import CircuitBreaker, CircuitOpenError
+from .clients import WaqiError
+from .forecast import Forecast, build_forecast
+from .models import HourlyForecast, LocationWalkSnapshot, WeatherData, WalkingCondition
+from .notifications import enqueue_alerts
+from .providers import WeatherPipeline
+from .scoring import calculate_walking_score, get_walking_recommendation
+from .snapshots import WalkCardStore, build_snapshot
+from .stations import LocationIndex, get_location_index
+
+logger = logging.getLogger(__name__)
+
 
 class WeatherService:
-    def __init__(self):
-        self.api_key = settings.WEATHER_API_KEY
-        self.base_url = "http://api.waqi.info/feed/"
-
-    def get_weather_data(self, district: str, neighborhood: str) -> Dict[str, Any]:
-        location = f"{district}-{neighborhood}"
-        url = f"{self.base_url}{location}/?token={self.api_key}"
-        
+    upsert_fields = [
+        'aqi', 'temperature', 'humidity', 'wind_speed', 'pm10', 'pm25',
+        'precipitation', 'precipitation_type', 'walking_score', 'updated_at',
+    ]
+
+    def __init__(self, cache: WeatherCache = None, pipeline: WeatherPipeline = None, circuit: CircuitBreaker = None,
+                 index: LocationIndex = None):
+        self.cache = cache or WeatherCache()
+        self.cards = WalkCardStore(self.cache)
+        self.circuit = circuit or CircuitBreaker()
+        self.index = index or get_location_index()
+        # 따로 주지 않으면 WEATHER_PROVIDERS 설정으로 한 번만 만든다 (커넥션 풀은 프로세스 단위로 공유된다)
+        self.pipeline = pipeline or WeatherPipeline.from_settings(self.index)
+        self.wait_timeout = settings.WEATHER_FETCH_WAIT_TIMEOUT
+        self.poll_interval = settings.WEATHER_FETCH_POLL_INTERVAL
+
+    def get_weather_data(self, district: str, neighborhood: str) -> WeatherData:
+        # 같은 측정소를 쓰는 동들은 하나의 위치로 합쳐 조회/캐시/저장을 공유한다
+        district, neighborhood = self.index.resolve(district, neighborhood)
+        weather_data, is_fresh = self.cache.get(district, neighborhood)
+        if is_fresh:
+            return weather_data
+
+        # 서킷이 열려 있으면 업스트림을 기다리지 않고 마지막 값을 바로 돌려준다
+        if self.circuit.state == 'open':
+            fallback = self._get_fallback_weather_data(district, neighborhood, cached=weather_data)
+            if fallback is None:
+                raise CircuitOpenError(f"Weather API Error: upstream unavailable for {district}-{neighborhood}")
+            return fallback
+
+        # 같은 위치에 대한 동시 요청은 락을 잡은 한 워커만 WAQI를 호출한다
+        token = self.cache.acquire_lock(district, neighborhood)
+        if token is None:
+            # stale 값이 있으면 리더의 갱신을 기다리지 않는다 (stale-while-revalidate)
+            if weather_data is not None:
+                return self._mark_stale(weather_data)
+            return self._wait_for_leader(district, neighborhood)
+
+        try:
+            cached, is_fresh = self.cache.peek(district, neighborhood)
+            if is_fresh:
+                return cached
+
+            try:
+                weather_data = self.fetch_weather_data(district, neighborhood)
+            except Exception as e:
+                # WAQI 장애 시 요청마다 쌓이는 로그이므로 LOGGING에서 rate limit을 건다
+                logger.warning("Weather fetch failed for %s-%s: %s", district, neighborhood, e)
+                fallback = self._get_fallback_weather_data(district, neighborhood)
+                if fallback is None:
+                    raise
+                return fallback
+
+            self.cache.set(district, neighborhood, weather_data)
+            return weather_data
+        finally:
+            self.cache.release_lock(district, neighborhood, token)
+
+    def refresh_weather_data(self, district: str, neighborhood: str) -> Optional[WeatherData]:
+        # 백그라운드 갱신용: 캐시 신선도와 무관하게 다시 조회한다.
+        # 이미 다른 워커가 같은 위치를 조회 중이면 None을 반환한다.
+        district, neighborhood = self.index.resolve(district, neighborhood)
+        token = self.cache.acquire_lock(district, neighborhood)
+        if token is None:
+            return None
+
+        try:
+            weather_data = self.fetch_weather_data(district, neighborhood)
+            self.cache.set(district, neighborhood, weather_data)
+            return weather_data
+        finally:
+            self.cache.release_lock(district, neighborhood, token)
+
+    def refresh_many(self, locations: List[Location], max_connections: int = None) -> Dict[Location, Any]:
+        # 여러 위치를 비동기 클라이언트로 동시에 조회하고 한 번에 저장한다.
+        # 결과는 위치별 WeatherData, 실패 시 예외, 다른 워커가 조회 중이면 None이다.
+        canonical = {location: self.index.resolve(*location) for location in locations}
+        results = {location: None for location in canonical.values()}
+        tokens = {}
+        for location in results:
+            token = self.cache.acquire_lock(*location)
+            if token is not None:
+                tokens[location] = token
+
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            if tokens and not self.circuit.allow_request():
+                payloads = [CircuitOpenError("Weather API Error: circuit is open")] * len(tokens)
+            else:
+                payloads = self.pipeline.fetch_many(list(tokens), max_connections)
+                self._record_batch(payloads)
+
+            readings = {}
+            for location, payload in zip(tokens, payloads):
+                if isinstance(payload, Exception):
+                    results[location] = payload
+                else:
+                    readings[location] = self._process_weather_data(payload, *location)
+
+            for location, weather_data in zip(readings, self.save_many(list(readings.values()), list(readings))):
+                self.cache.set(*location, weather_data)
+                results[location] = weather_data
+        finally:
+            for location, token in tokens.items():
+                self.cache.release_lock(*location, token)
+
+        return {location: results[resolved] for location, resolved in canonical.items()}
+
+    def get_many(self, locations: List[Location]) -> Dict[Location, Any]:
+        # 여러 위치를 캐시(MGET) → DB(단일 쿼리) → WAQI(동시 조회) 순으로 채운다.
+        # 결과는 위치별 WeatherData, 실패해서 대체 값도 없으면 예외다.
+        canonical = {location: self.index.resolve(*location) for location in locations}
+        locations = list(dict.fromkeys(canonical.values()))
+        cached = self.cache.get_many(locations)
+        results = {location: weather_data for location, (weather_data, is_fresh) in cached.items() if is_fresh}
+
+        misses = [location for location in locations if location not in results]
+        latest = self._get_latest(misses) if misses else {}
+        now = timezone.localtime()
+        to_fetch = []
+        for location in misses:
+            # 다른 워커가 이미 저장한 최신 관측값이 아직 fresh 기간이면 WAQI를 부르지 않는다 (저장 시각 기준)
+            weather_data = latest.get(location)
+            if weather_data is not None and self.cache.fresh_until(timezone.localtime(weather_data.updated_at)) > now:
+                self.cache.set(*location, weather_data)
+                results[location] = weather_data
+            else:
+                to_fetch.append(location)
+
+        try:
+            refreshed = self.refresh_many(to_fetch) if to_fetch else {}
+        except Exception as e:
+            refreshed = {location: e for location in to_fetch}
+
+        for location, outcome in refreshed.items():
+            stale = cached[location][0] or latest.get(location)
+            if outcome is None and stale is None:
+                # 다른 워커가 같은 위치를 조회 중이고 대신 보여줄 값도 없다
+                try:
+                    outcome = self._wait_for_leader(*location)
+                except Exception as e:
+                    outcome = e
+            if outcome is None or isinstance(outcome, Exception):
+                outcome = self._mark_stale(stale) if stale is not None else outcome
+            results[location] = outcome
+
+        return {location: results[resolved] for location, resolved in canonical.items()}
+
+    def _get_latest(self, locations: List[Location]) -> Dict[Location, WeatherData]:
+        # 같은 구라도 다른 동/측정소의 행은 쓰지 않는다 (정규화된 위치로 찾는다)
+        queryset = WeatherData.objects.latest_for(locations).select_related('walking_condition')
+        return {(weather_data.district, weather_data.neighborhood): weather_data for weather_data in queryset}
 
-            if data.get('status') != 'ok':
-                raise Exception(f"API Error: {data.get('data')}")
+    def _wait_for_leader(self, district: str, neighborhood: str) -> WeatherData:
+        self.cache.record('coalesced')
+        deadline = time_module.monotonic() + self.wait_timeout
 
-            weather_data = self._process_weather_data(data['data'], district, neighborhood)
-            return self._save_weather_data(weather_data)
+        while time_module.monotonic() < deadline:
+            time_module.sleep(self.poll_interval)
+            weather_data, is_fresh = self.cache.peek(district, neighborhood)
+            if is_fresh:
+                return weather_data
+            if not self.cache.is_locked(district, neighborhood):
+                break
 
-        except requests.RequestException as e:
+        # 리더가 실패했거나 대기 시간이 초과된 경우 마지막으로 알려진 값을 사용한다
+        fallback = self._get_fallback_weather_data(district, neighborhood)
+        if fallback is None:
+            raise Exception(f"Weather API Error: no data available for {district}-{neighborhood}")
+        return fallback
+
+    def _record_batch(self, payloads: List[Any]) -> None:
+        # 배치 전체가 네트워크 오류로 실패했을 때만 업스트림 장애 한 번으로 센다
+        if not payloads:
+            return
+        if all(isinstance(payload, (httpx.HTTPError, TimeoutError)) for payload in payloads):
+            self.circuit.record_failure()
+        else:
+            self.circuit.record_success()
+
+    def _get_fallback_weather_data(self, district: str, neighborhood: str,
+                                   cached: WeatherData = None) -> Optional[WeatherData]:
+        weather_data = cached
+        if weather_data is None:
+            weather_data, _ = self.cache.peek(district, neighborhood)
+        if weather_data is None:
+            weather_data = (
+                WeatherData.objects.recent()
+                .select_related('walking_condition')
+                .filter(district=district, neighborhood=neighborhood)
+                .order_by('-forecast_time')
+                .first()
+            )
+        if weather_data is not None:
+            self._mark_stale(weather_data)
+        return weather_data
+
+    def _mark_stale(self, weather_data: WeatherData) -> WeatherData:
+        # 응답에서 최신 값이 아님을 알 수 있게 표시한다 (WeatherCurrentSerializer.is_stale)
+        weather_data.is_stale = True
+        self.cache.record('fallback')
+        return weather_data
+
+    def fetch_weather_data(self, district: str, neighborhood: str) -> WeatherData:
+        self.circuit.check()
+        try:
+            try:
+                # 대기질과 기상 제공자를 동시에 호출해 하나의 관측값으로 합친다
+                data = self.pipeline.fetch(district, neighborhood)
+            except (httpx.HTTPError, TimeoutError):
+                self.circuit.record_failure()
+                raise
+            except WaqiError:
+                # WAQI가 응답은 했으므로 업스트림 장애로 세지 않는다
+                self.circuit.record_success()
+                raise
+            self.circuit.record_success()
+
+            weather_data = self._process_weather_data(data, district, neighborhood)
+            return self._save_weather_data(weather_data, (district, neighborhood))
+
+        except (httpx.HTTPError, TimeoutError) as e:
             raise Exception(f"Weather API Request Error: {str(e)}")
         except Exception as e:
             raise Exception(f"Weather API Error: {str(e)}")
 
-    def _process_weather_data(self, data: Dict, district: str) -> Dict:
-        iaqi = data.get('iaqi', {})
-        
+    def _process_weather_data(self, data: Dict, district: str, neighborhood: str) -> Dict:
+        # data는 WeatherPipeline이 제공자들의 값을 합친 결과다
         processed_data = {
             'district': district,
+            'neighborhood': neighborhood,
             'aqi': data.get('aqi'),
-            'temperature': iaqi.get('t', {}).get('v'),
-            'humidity': iaqi.get('h', {}).get('v'),
-            'wind_speed': iaqi.get('w', {}).get('v'),
-            'pm10': iaqi.get('pm10', {}).get('v'),
-            'pm25': iaqi.get('pm25', {}).get('v'),
-            'precipitation': 0.0,  # API에서 제공하지 않는 값
-            'precipitation_type': None,  # API에서 제공하지 않는 값
-            'forecast_time': datetime.now(),
+            'temperature': data.get('temperature'),
+            'humidity': data.get('humidity'),
+            'wind_speed': data.get('wind_speed'),
+            'pm10': data.get('pm10'),
+            'pm25': data.get('pm25'),
+            'precipitation': data.get('precipitation', 0.0),  # 기상 제공자가 없으면 0
+            'precipitation_type': data.get('precipitation_type'),
+            # upsert 키 (district, forecast_time)가 재시도에도 같도록 WAQI 관측 시각을 쓰고,
+            # 관측 시각이 없으면 현재 시각을 정시로 자른다
+            'forecast_time': data.get('observed_at') or timezone.now().replace(minute=0, second=0, microsecond=0),
             'walking_score': 0  # 초기값
         }
-        
+        if data.get('hourly'):
+            processed_data['hourly'] = data['hourly']
+
         processed_data['walking_score'] = self._calculate_walking_score(processed_data)
         return processed_data
 
     def _calculate_walking_score(self, data: Dict) -> int:
-        score = 100
-
-        # AQI 기반 점수 조정
-        if data['aqi']:
-            if data['aqi'] > 300:
-                score -= 50
-            elif data['aqi'] > 200:
-                score -= 40
-            elif data['aqi'] > 150:
-                score -= 30
-            elif data['aqi'] > 100:
-                score -= 20
-            elif data['aqi'] > 50:
-                score -= 10
-
-        # 온도 기반 점수 조정
-        if data['temperature']:
-            if data['temperature'] < 5 or data['temperature'] > 35:
-                score -= 30
-            elif data['temperature'] < 10 or data['temperature'] > 30:
-                score -= 20
-            elif data['temperature'] < 15 or data['temperature'] > 25:
-                score -= 10
-
-        # 미세먼지 기반 점수 조정
-        if data['pm25']:
-            if data['pm25'] > 150:
-                score -= 20
-            elif data['pm25'] > 100:
-                score -= 15
-            elif data['pm25'] > 50:
-                score -= 10
-
-        return max(0, min(score, 100))
+        with metrics.SCORING_SECONDS.labels('scalar').time():
+            return calculate_walking_score(data['aqi'], data['temperature'], data['pm25'])
 
     def _generate_walking_recommendations(self, weather_data: WeatherData) -> Tuple[str, str]:
-        aqi = weather_data.aqi
-        warning = None
-        recommendation = "산책하기 좋은 날씨입니다."
-
-        if aqi > 300:
-            warning = "매우 위험한 대기질. 외출을 피해주세요."
-            recommendation = "실내 활동을 추천드립니다."
-        elif aqi > 200:
-            warning = "매우 나쁜 대기질. 외출을 자제해주세요."
-            recommendation = "실내 산책을 추천드립니다."
-        elif aqi > 150:
-            warning = "나쁜 대기질. 민감군은 외출을 피해주세요."
-            recommendation = "짧은 산책만 추천드립니다."
-        elif aqi > 100:
-            warning = "민감군 주의. 장시간 실외 활동을 피해주세요."
-            recommendation = "산책 시간을 30분 이내로 제한하세요."
-
-        return recommendation, warning
-
-    def _calculate_best_walking_times(self, weather_data: WeatherData) -> Dict[str, time]:
-        # 일반적으로 대기질이 좋은 시간대 추천
+        code, warning = get_walking_recommendation(weather_data.aqi)
+        return dict(WalkingCondition.RECOMMENDATION_CHOICES)[code], warning
+
+    def _calculate_best_walking_times(self, weather_data: WeatherData, forecast: Forecast = None) -> Dict[str, time]:
+        # 시간별 예보가 있으면 저장할 때 계산해 둔 최적 시간대를 쓴다
+        if forecast is not None and forecast.window is not None:
+            return {'start': forecast.window[0], 'end': forecast.window[1]}
+
+        # 예보가 없으면 일반적으로 대기질이 좋은 시간대 추천
         return {
             'start': time(6, 0),  # 오전 6시
             'end': time(9, 0)     # 오전 9시
         }
 
-    def _save_weather_data(self, data: Dict) -> WeatherData:
-        weather_data = WeatherData.objects.create(**data)
-        self._create_walking_condition(weather_data)
-        return weather_data
\ No newline at end of file
+    def _save_weather_data(self, data: Dict, location: Location = None) -> WeatherData:
+        return self.save_many([data], [location] if location else None)[0]
+
+    def save_many(self, readings: List[Dict], locations: List[Location] = None) -> List[WeatherData]:
+        # 읽음값과 산책 조건을 각각 하나의 upsert 문으로 저장한다.
+        # 같은 (district, neighborhood, forecast_time)이 재시도로 다시 들어와도 기존 행을 갱신한다.
+        # locations(readings와 같은 순서)가 있으면 위치별 산책 카드와 대기질 경고 알림도 함께 저장한다.
+        if not readings:
+            return []
+
+        by_key, with_hourly = {}, {}
+        for data in readings:
+            key = self._reading_key(data)
+            by_key[key] = WeatherData(**{name: value for name, value in data.items() if name != 'hourly'})
+            with_hourly.pop(key, None)
+            if data.get('hourly'):
+                with_hourly[key] = data
+        weather_data_list = list(by_key.values())
+
+        # 시간별 예보 행과 최적 산책 시간대는 갱신 때 한 번만 계산한다
+        forecasts = {key: build_forecast(data) for key, data in with_hourly.items()}
+        # 같은 위치의 같은 날짜 예보가 여러 번 들어오면 마지막 것만 남긴다 (upsert 한 문에서 같은 행 중복 불가)
+        forecast_rows = {
+            (row.district, row.neighborhood, row.date): row for forecast in forecasts.values() for row in forecast.rows
+        }
+
+        with metrics.DB_SAVE_SECONDS.time(), transaction.atomic():
+            WeatherData.objects.bulk_create(
+                weather_data_list,
+                update_conflicts=True,
+                unique_fields=['district', 'neighborhood', 'forecast_time'],
+                update_fields=self.upsert_fields,
+            )
+            conditions = {
+                key: self._build_walking_condition(weather_data, forecasts.get(key))
+                for key, weather_data in by_key.items()
+            }
+            WalkingCondition.objects.bulk_create(
+                list(conditions.values()),
+                update_conflicts=True,
+                unique_fields=['weather_data'],
+                update_fields=['recommendation', 'warning', 'best_time_start', 'best_time_end'],
+            )
+            if forecast_rows:
+                HourlyForecast.objects.bulk_create(
+                    list(forecast_rows.values()),
+                    update_conflicts=True,
+                    unique_fields=['district', 'neighborhood', 'date'],
+                    update_fields=[*HourlyForecast.SERIES, 'updated_at'],
+                )
+            if locations:
+                keys = [self._reading_key(data) for data in readings]
+                rows = {location: (by_key[key], conditions[key]) for location, key in zip(locations, keys)}
+                self._save_snapshots(rows)
+                enqueue_alerts(rows)
+
+        return [by_key[self._reading_key(data)] for data in readings]
+
+    @staticmethod
+    def _reading_key(data: Dict) -> Tuple[str, str, Any]:
+        return data['district'], data.get('neighborhood', ''), data['forecast_time']
+
+    def get_walk_card(self, district: str, neighborhood: str) -> bytes:
+        # 메인 화면 카드: 캐시(GET 한 번) → DB 스냅샷 → 조회 순으로 채운다.
+        # 조회에 실패하면 오래된 카드라도 돌려주고, 카드가 없을 때만 예외를 올린다.
+        location = self.index.resolve(district, neighborhood)
+        card, is_fresh = self.cards.get(*location)
+        if card is None:
+            card, is_fresh = self.cards.load(*location)
+        if is_fresh:
+            return card
+
+        try:
+            weather_data = self.get_weather_data(*location)
+        except Exception:
+            if card is None:
+                raise
+            return card
+        if getattr(weather_data, 'is_stale', False):
+            # 업스트림 장애 때의 대체 값은 다른 동/측정소의 오래된 행일 수 있으므로 카드로 저장하지 않는다
+            if card is None:
+                raise CircuitOpenError(f"Weather API Error: no fresh data for {district}-{neighborhood}")
+            return card
+
+        # 이번 요청에서 새로 저장했다면 같은 트랜잭션의 스냅샷 행이 이미 이 데이터를 가리킨다
+        district, neighborhood = (WeatherCache.normalize(value) for value in location)
+        snapshot = LocationWalkSnapshot.objects.filter(
+            district=district, neighborhood=neighborhood, weather_data_id=weather_data.pk,
+        ).first()
+        if snapshot is None:
+            condition = (
+                WalkingCondition.objects.filter(weather_data=weather_data).first()
+                or self._build_walking_condition(weather_data)
+            )
+            snapshot = self._save_snapshots({location: (weather_data, condition)})[0]
+        else:
+            transaction.on_commit(lambda: self.cards.set_many([snapshot]))
+        return self.cards.render(snapshot)[0]
+
+    def _save_snapshots(self, rows: Dict[Location, Tuple[WeatherData, WalkingCondition]]) -> List[LocationWalkSnapshot]:
+        # 메인 화면 카드용 비정규화 행을 같은 트랜잭션에서 갱신하고, 커밋된 뒤 캐시에 렌더링해 둔다
+        snapshots = {}
+        for location, (weather_data, condition) in rows.items():
+            snapshot = build_snapshot(location, weather_data, condition)
+            snapshots[(snapshot.district, snapshot.neighborhood)] = snapshot
+        snapshots = list(snapshots.values())
+
+        LocationWalkSnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=['district', 'neighborhood'],
+            update_fields=[
+                field.name for field in LocationWalkSnapshot._meta.concrete_fields
+                if field.name not in ('id', 'district', 'neighborhood')
+            ],
+        )
+        transaction.on_commit(lambda: self.cards.set_many(snapshots))
+        return snapshots
+
+    def _build_walking_condition(self, weather_data: WeatherData, forecast: Forecast = None) -> WalkingCondition:
+        recommendation, warning = get_walking_recommendation(weather_data.aqi)
+        best_times = self._calculate_best_walking_times(weather_data, forecast)
+
+        return WalkingCondition(
+            weather_data=weather_data,
+            recommendation=recommendation,
+            warning=warning,
+            best_time_start=best_times['start'],
+            best_time_end=best_times['end'],
+        )
@@ -0,0 +1,100 @@
+"""
+위치별 산책 카드(LocationWalkSnapshot) 캐시.
+
+카드는 저장할 때 한 번 JSON으로 렌더링해 (fresh_until, JSON bytes) 하나의 캐시 값으로 둔다.
+/api/weather/card/의 캐시 히트 경로는 GET 한 번과 응답 바이트 복사뿐이다.
+"""
+import time
+from typing import Iterable, Optional, Tuple
+
+import orjson
+from django.utils import timezone
+
+from .cache import Location, WeatherCache
+from .models import LocationWalkSnapshot
+
+# 카드 JSON 필드. 저장 시 한 번만 렌더링하므로 API 직렬화기를 거치지 않는다
+CARD_FIELDS = (
+    'district', 'weather_data_id', 'forecast_time', 'walking_score', 'recommendation', 'warning',
+    'best_time_start', 'best_time_end', 'aqi', 'pm10', 'pm25', 'temperature', 'humidity',
+    'precipitation', 'precipitation_type',
+)
+
+
+class WalkCardStore:
+    key_prefix = 'weather:card'
+
+    def __init__(self, cache: WeatherCache = None):
+        self.weather_cache = cache or WeatherCache()
+        self.cache = self.weather_cache.cache
+
+    def make_key(self, district: str, neighborhood: str) -> str:
+        normalize = self.weather_cache.normalize
+        return f"{self.key_prefix}:{normalize(district)}:{normalize(neighborhood)}"
+
+    def get(self, district: str, neighborhood: str) -> Tuple[Optional[bytes], bool]:
+        entry = self.cache.get(self.make_key(district, neighborhood))
+        if entry is None:
+            return None, False
+        fresh_until, card = entry
+        return card, time.time() < fresh_until
+
+    def load(self, district: str, neighborhood: str) -> Tuple[Optional[bytes], bool]:
+        # 캐시가 비었을 때 DB 스냅샷에서 다시 채운다
+        snapshot = LocationWalkSnapshot.objects.filter(
+            district=self.weather_cache.normalize(district),
+            neighborhood=self.weather_cache.normalize(neighborhood),
+        ).first()
+        if snapshot is None:
+            return None, False
+        self.set_many([snapshot])
+        return self.render(snapshot)
+
+    def render(self, snapshot: LocationWalkSnapshot) -> Tuple[bytes, bool]:
+        fresh_until, card = self._entry(snapshot)
+        return card, time.time() < fresh_until
+
+    def set_many(self, snapshots: Iterable[LocationWalkSnapshot]) -> None:
+        entries = {self.make_key(snapshot.district, snapshot.neighborhood): self._entry(snapshot) for snapshot in snapshots}
+        if entries:
+            self.cache.set_many(entries, self.timeout)
+
+    @property
+    def timeout(self) -> int:
+        # WeatherCache 엔트리처럼 fresh 기간이 지나도 stale 기간 동안은 대체 응답으로 남긴다
+        return self.weather_cache.ttl + self.weather_cache.stale_ttl
+
+    def _entry(self, snapshot: LocationWalkSnapshot) -> Tuple[float, bytes]:
+        # 신선도는 WeatherCache.set처럼 관측 시각이 아니라 저장 시각 기준이다
+        saved_at = timezone.localtime(snapshot.updated_at or timezone.now())
+        return (
+            self.weather_cache.fresh_until(saved_at).timestamp(),
+            render_card(snapshot),
+        )
+
+def render_card(snapshot: LocationWalkSnapshot) -> bytes:
+    card = {name: getattr(snapshot, name) for name in CARD_FIELDS}
+    card['forecast_time'] = timezone.localtime(snapshot.forecast_time)
+    return orjson.dumps(card)
+
+
+def build_snapshot(location: Location, weather_data, walking_condition) -> LocationWalkSnapshot:
+    district, neighborhood = (WeatherCache.normalize(value) for value in location)
+    return LocationWalkSnapshot(
+        district=district,
+        neighborhood=neighborhood,
+        weather_data_id=weather_data.pk,
+        forecast_time=weather_data.forecast_time,
+        walking_score=weather_data.walking_score,
+        recommendation=walking_condition.recommendation,
+        warning=walking_condition.warning,
+        best_time_start=walking_condition.best_time_start,
+        best_time_end=walking_condition.best_time_end,
+        aqi=weather_data.aqi,
+        pm10=weather_data.pm10,
+        pm25=weather_data.pm25,
+        temperature=weather_data.temperature,
+        humidity=weather_data.humidity,
+        precipitation=weather_data.precipitation,
+        precipitation_type=weather_data.precipitation_type,
+    )
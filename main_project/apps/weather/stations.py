@@ -0,0 +1,183 @@
+"""
+(district, neighborhood) → WAQI 측정소 매핑.
+
+측정소 목록(station_id, name, lat, lon)과 동 좌표 목록(district, neighborhood, lat, lon)
+CSV로 build_location_index 명령이 가장 가까운 측정소를 미리 계산해 JSON 인덱스로 저장한다.
+런타임에는 이 인덱스로 같은 측정소를 쓰는 동들을 하나의 위치로 합쳐
+WAQI 조회, 캐시 엔트리, WeatherData 행을 공유한다.
+인덱스 파일은 저장소에 포함되지 않으므로, 인덱스가 없는 위치의 좌표(기상청 격자 변환용)는
+서울 자치구 구청 좌표(DISTRICT_CENTROIDS)로 대신한다.
+"""
+import csv
+import json
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from .cache import Location
+
+EARTH_RADIUS_KM = 6371.0088
+# 정규화된 위치에서 neighborhood 자리에 들어가는 측정소 표기 (WAQI /feed/@<uid>/)
+STATION_PREFIX = '@'
+
+# 서울 자치구 구청 좌표 (위도, 경도). 기상청 격자는 5km 단위라 구 안의 동은 대부분 같은 격자에 든다
+DISTRICT_CENTROIDS: Dict[str, Tuple[float, float]] = {
+    '강남구': (37.5172, 127.0473),
+    '강동구': (37.5301, 127.1238),
+    '강북구': (37.6396, 127.0257),
+    '강서구': (37.5509, 126.8495),
+    '관악구': (37.4784, 126.9516),
+    '광진구': (37.5385, 127.0823),
+    '구로구': (37.4954, 126.8874),
+    '금천구': (37.4569, 126.8955),
+    '노원구': (37.6542, 127.0568),
+    '도봉구': (37.6688, 127.0471),
+    '동대문구': (37.5744, 127.0400),
+    '동작구': (37.5124, 126.9393),
+    '마포구': (37.5663, 126.9019),
+    '서대문구': (37.5791, 126.9368),
+    '서초구': (37.4837, 127.0324),
+    '성동구': (37.5633, 127.0371),
+    '성북구': (37.5894, 127.0167),
+    '송파구': (37.5145, 127.1059),
+    '양천구': (37.5170, 126.8665),
+    '영등포구': (37.5264, 126.8962),
+    '용산구': (37.5324, 126.9900),
+    '은평구': (37.6027, 126.9291),
+    '종로구': (37.5735, 126.9790),
+    '중구': (37.5641, 126.9979),
+    '중랑구': (37.6063, 127.0925),
+}
+
+
+@dataclass(frozen=True)
+class Station:
+    id: str
+    name: str
+    lat: float
+    lon: float
+
+
+def _index_key(district: str, neighborhood: str) -> str:
+    return f"{' '.join(district.split())}|{' '.join(neighborhood.split())}"
+
+
+def load_stations(path: Path) -> List[Station]:
+    with open(path, newline='', encoding='utf-8') as f:
+        return [
+            Station(row['station_id'], row['name'], float(row['lat']), float(row['lon']))
+            for row in csv.DictReader(f)
+        ]
+
+
+def load_neighborhoods(path: Path) -> List[Tuple[str, str, float, float]]:
+    with open(path, newline='', encoding='utf-8') as f:
+        return [
+            (row['district'], row['neighborhood'], float(row['lat']), float(row['lon']))
+            for row in csv.DictReader(f)
+        ]
+
+
+def nearest_stations(stations: List[Station], points: np.ndarray, chunk_size: int = 2048) -> Tuple[np.ndarray, np.ndarray]:
+    # 측정소는 수백 개 수준이므로 (점 x 측정소) haversine 거리를 청크 단위로 한 번에 계산한다
+    station_lat = np.radians([station.lat for station in stations])
+    station_lon = np.radians([station.lon for station in stations])
+    indices = np.empty(len(points), dtype=np.int64)
+    distances = np.empty(len(points))
+
+    for start in range(0, len(points), chunk_size):
+        lat = np.radians(points[start:start + chunk_size, 0])[:, None]
+        lon = np.radians(points[start:start + chunk_size, 1])[:, None]
+        a = (
+            np.sin((station_lat - lat) / 2) ** 2
+            + np.cos(lat) * np.cos(station_lat) * np.sin((station_lon - lon) / 2) ** 2
+        )
+        km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+        nearest = km.argmin(axis=1)
+        indices[start:start + chunk_size] = nearest
+        distances[start:start + chunk_size] = km[np.arange(len(nearest)), nearest]
+    return indices, distances
+
+
+def build_index(stations: List[Station], neighborhoods: List[Tuple[str, str, float, float]],
+                max_distance_km: float = None) -> Dict:
+    if not stations or not neighborhoods:
+        return {'stations': {}, 'locations': {}}
+
+    points = np.array([(lat, lon) for _, _, lat, lon in neighborhoods], dtype=float)
+    indices, distances = nearest_stations(stations, points)
+
+    locations = {}
+    for (district, neighborhood, _, _), index, distance in zip(neighborhoods, indices, distances):
+        # 너무 먼 측정소는 쓰지 않고 기존처럼 "구-동" 이름으로 조회하게 둔다
+        if max_distance_km is None or distance <= max_distance_km:
+            locations[_index_key(district, neighborhood)] = stations[index].id
+
+    used = set(locations.values())
+    return {
+        'stations': {
+            station.id: {'name': station.name, 'lat': station.lat, 'lon': station.lon}
+            for station in stations if station.id in used
+        },
+        'locations': locations,
+    }
+
+
+class LocationIndex:
+    def __init__(self, locations: Dict[str, str] = None, stations: Dict[str, Dict] = None):
+        self.locations = locations or {}
+        self.stations = stations or {}
+
+    @classmethod
+    def from_file(cls, path) -> 'LocationIndex':
+        path = Path(path) if path else None
+        if path is None or not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding='utf-8'))
+        return cls(data['locations'], data.get('stations'))
+
+    def resolve(self, district: str, neighborhood: str) -> Location:
+        # 인덱스에 있는 동은 (구, "@측정소") 하나로 합치고, 없는 동은 그대로 둔다
+        station_id = self.locations.get(_index_key(district, neighborhood))
+        if station_id is None:
+            return district, neighborhood
+        return district, f"{STATION_PREFIX}{station_id}"
+
+    def coordinates(self, district: str, neighborhood: str) -> Optional[Tuple[float, float]]:
+        # 측정소로 합쳐진 위치는 측정소 좌표, 나머지는 구청 좌표를 쓴다 (기상청 격자 변환 등에 사용)
+        _, neighborhood = self.resolve(district, neighborhood)
+        station = None
+        if neighborhood.startswith(STATION_PREFIX):
+            station = self.stations.get(neighborhood[len(STATION_PREFIX):])
+        if station is None:
+            return DISTRICT_CENTROIDS.get(' '.join(district.split()))
+        return station['lat'], station['lon']
+
+    def members(self, district: str, neighborhood: str) -> List[Location]:
+        # resolve의 역방향: 합쳐진 위치에 속한 원래 (구, 동) 목록
+        if not neighborhood.startswith(STATION_PREFIX):
+            return [(district, neighborhood)]
+        return self._members.get((' '.join(district.split()), neighborhood[len(STATION_PREFIX):]), [])
+
+    @cached_property
+    def _members(self) -> Dict[Tuple[str, str], List[Location]]:
+        members = {}
+        for key, station_id in self.locations.items():
+            district, neighborhood = key.split('|', 1)
+            members.setdefault((district, station_id), []).append((district, neighborhood))
+        return members
+
+    @staticmethod
+    def feed_location(district: str, neighborhood: str) -> str:
+        if neighborhood.startswith(STATION_PREFIX):
+            return neighborhood
+        return f"{district}-{neighborhood}"
+
+
+@lru_cache(maxsize=1)
+def get_location_index() -> LocationIndex:
+    return LocationIndex.from_file(settings.WEATHER_LOCATION_INDEX_FILE)
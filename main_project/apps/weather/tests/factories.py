@@ -0,0 +1,42 @@
+from datetime import time
+
+from django.utils import timezone
+from factory import Faker
+from factory import LazyFunction
+from factory import RelatedFactory
+from factory import Sequence
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from main_project.apps.weather.models import WalkingCondition
+from main_project.apps.weather.models import WeatherData
+
+
+class WeatherDataFactory(DjangoModelFactory[WeatherData]):
+    district = Sequence(lambda n: f"district-{n}")
+    aqi = Faker("pyint", min_value=0, max_value=300)
+    temperature = Faker("pyfloat", min_value=-10, max_value=40)
+    humidity = Faker("pyfloat", min_value=0, max_value=100)
+    wind_speed = Faker("pyfloat", min_value=0, max_value=20)
+    pm10 = Faker("pyfloat", min_value=0, max_value=200)
+    pm25 = Faker("pyfloat", min_value=0, max_value=200)
+    walking_score = Faker("pyint", min_value=0, max_value=100)
+    forecast_time = LazyFunction(timezone.now)
+    walking_condition = RelatedFactory(
+        "main_project.apps.weather.tests.factories.WalkingConditionFactory",
+        factory_related_name="weather_data",
+    )
+
+    class Meta:
+        model = WeatherData
+        skip_postgeneration_save = True
+
+
+class WalkingConditionFactory(DjangoModelFactory[WalkingCondition]):
+    weather_data = SubFactory(WeatherDataFactory, walking_condition=None)
+    recommendation = "GOOD"
+    best_time_start = time(6, 0)
+    best_time_end = time(9, 0)
+
+    class Meta:
+        model = WalkingCondition
@@ -0,0 +1,108 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from main_project.apps.weather.cache import WeatherCache
+from main_project.apps.weather.models import WalkingCondition
+from main_project.apps.weather.models import WeatherData
+from main_project.apps.weather.services import WeatherService
+from main_project.apps.weather.tests.waqi_stub import WaqiStubServer
+from main_project.apps.weather.tests.waqi_stub import make_feed
+
+pytestmark = pytest.mark.django_db
+
+SEOUL = ZoneInfo("Asia/Seoul")
+
+
+def make_reading(district: str, hour: int, aqi: int = 50) -> dict:
+    return {
+        "district": district,
+        "aqi": aqi,
+        "temperature": 20.0,
+        "humidity": 50.0,
+        "wind_speed": 1.0,
+        "pm10": 30.0,
+        "pm25": 10.0,
+        "precipitation": 0.0,
+        "precipitation_type": None,
+        "walking_score": 100,
+        "forecast_time": datetime(2024, 1, 1, hour, tzinfo=SEOUL),
+    }
+
+
+@pytest.fixture
+def service(settings) -> WeatherService:
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    cache = WeatherCache()
+    cache.cache.clear()
+    return WeatherService(cache=cache)
+
+
+class TestSaveMany:
+    @pytest.mark.parametrize("size", [1, 50])
+    def test_constant_number_of_queries(self, service: WeatherService, size: int):
+        readings = [make_reading(f"district-{n}", n % 24) for n in range(size)]
+
+        with CaptureQueriesContext(connection) as queries:
+            saved = service.save_many(readings)
+
+        writes = [q for q in queries.captured_queries if "INSERT" in q["sql"]]
+        assert len(writes) == 2
+        assert WeatherData.objects.count() == size
+        assert WalkingCondition.objects.count() == size
+        assert all(weather_data.pk for weather_data in saved)
+
+    def test_retry_updates_existing_rows(self, service: WeatherService):
+        service.save_many([make_reading("강남구", 1, aqi=50)])
+        service.save_many([make_reading("강남구", 1, aqi=350)])
+
+        weather_data = WeatherData.objects.get()
+        assert weather_data.aqi == 350
+        assert weather_data.walking_condition.recommendation == "INDOOR"
+
+    def test_duplicates_in_batch_are_collapsed(self, service: WeatherService):
+        saved = service.save_many([make_reading("강남구", 1, aqi=10), make_reading("강남구", 1, aqi=20)])
+
+        assert saved[0] is saved[1]
+        assert WeatherData.objects.get().aqi == 20
+
+
+class TestRefreshMany:
+    def test_fetches_and_saves_batch(self, service: WeatherService, settings):
+        locations = [("강남구", f"동{n}") for n in range(5)] + [("없는", "위치")]
+        feeds = {f"강남구-동{n}": make_feed(aqi=n) for n in range(5)}
+
+        with WaqiStubServer(feeds) as server:
+            settings.WEATHER_API_BASE_URL = server.base_url
+            results = service.refresh_many(locations)
+
+        assert sorted(results[("강남구", f"동{n}")].aqi for n in range(5)) == list(range(5))
+        assert isinstance(results[("없는", "위치")], Exception)
+        assert service.cache.peek("강남구", "동3")[1]
+        assert not service.cache.is_locked("강남구", "동3")
+
+    def test_retry_of_same_observation_upserts(self, service: WeatherService, settings):
+        feeds = {"강남구-역삼동": make_feed(aqi=40, observed_at="2024-05-01T10:00:00+09:00")}
+
+        with WaqiStubServer(feeds) as server:
+            settings.WEATHER_API_BASE_URL = server.base_url
+            first = service.refresh_many([("강남구", "역삼동")])[("강남구", "역삼동")]
+            server.feeds["강남구-역삼동"] = make_feed(aqi=60, observed_at="2024-05-01T10:00:00+09:00")
+            second = service.refresh_many([("강남구", "역삼동")])[("강남구", "역삼동")]
+
+        assert first.pk == second.pk
+        assert second.forecast_time == datetime(2024, 5, 1, 10, tzinfo=SEOUL)
+        assert WeatherData.objects.get().aqi == 60  # noqa: PLR2004
+
+    def test_locked_locations_are_skipped(self, service: WeatherService, settings):
+        service.cache.acquire_lock("강남구", "역삼동")
+
+        with WaqiStubServer() as server:
+            settings.WEATHER_API_BASE_URL = server.base_url
+            assert service.refresh_many([("강남구", "역삼동")]) == {("강남구", "역삼동"): None}
+            assert server.requests == []
@@ -0,0 +1,81 @@
+from datetime import datetime
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from main_project.apps.weather.cache import WeatherCache
+from main_project.apps.weather.services import WeatherService
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+
+pytestmark = pytest.mark.django_db
+
+SEOUL = ZoneInfo("Asia/Seoul")
+
+
+@pytest.fixture
+def weather_cache(settings) -> WeatherCache:
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    cache = WeatherCache()
+    cache.cache.clear()
+    return cache
+
+
+class TestWeatherCache:
+    def test_key_is_normalized(self, weather_cache: WeatherCache):
+        assert weather_cache.make_key(" 강남구 ", "역삼동") == weather_cache.make_key(
+            "강남구",
+            "역삼동  ",
+        )
+        assert weather_cache.make_key("Gangnam  Gu", "A") == "weather:loc:gangnam gu:a"
+
+    def test_fresh_until_aligns_to_hourly_update(self, weather_cache: WeatherCache):
+        now = datetime(2024, 1, 1, 12, 30, tzinfo=SEOUL)
+        assert weather_cache.fresh_until(now) == datetime(2024, 1, 1, 13, 10, tzinfo=SEOUL)
+
+        now = datetime(2024, 1, 1, 12, 5, tzinfo=SEOUL)
+        assert weather_cache.fresh_until(now) == datetime(2024, 1, 1, 12, 10, tzinfo=SEOUL)
+
+    def test_fresh_until_is_capped_by_ttl(self, weather_cache: WeatherCache):
+        weather_cache.ttl = 60
+        now = datetime(2024, 1, 1, 12, 30, tzinfo=SEOUL)
+        assert weather_cache.fresh_until(now) == datetime(2024, 1, 1, 12, 31, tzinfo=SEOUL)
+
+    def test_hit_miss_and_stale_counters(self, weather_cache: WeatherCache):
+        weather_data = WeatherDataFactory()
+
+        assert weather_cache.get("강남구", "역삼동") == (None, False)
+        weather_cache.set("강남구", "역삼동", weather_data)
+        assert weather_cache.get("강남구", "역삼동") == (weather_data, True)
+
+        weather_cache.ttl = -1
+        weather_cache.set("강남구", "역삼동", weather_data)
+        assert weather_cache.get("강남구", "역삼동") == (weather_data, False)
+
+        stats = weather_cache.stats()
+        assert (stats["hit"], stats["miss"], stats["stale"]) == (1, 1, 1)
+        weather_cache.reset_stats()
+        assert not any(weather_cache.stats().values())
+
+
+class TestWeatherServiceCaching:
+    def test_fetches_once_per_location(self, weather_cache: WeatherCache):
+        weather_data = WeatherDataFactory()
+        service = WeatherService(cache=weather_cache)
+
+        with mock.patch.object(service, "fetch_weather_data", return_value=weather_data) as fetch:
+            assert service.get_weather_data("강남구", "역삼동") == weather_data
+            assert service.get_weather_data(" 강남구", "역삼동") == weather_data
+
+        fetch.assert_called_once_with("강남구", "역삼동")
+
+    def test_stale_entry_is_refetched(self, weather_cache: WeatherCache):
+        old, new = WeatherDataFactory.create_batch(2)
+        service = WeatherService(cache=weather_cache)
+        weather_cache.ttl = -1
+        weather_cache.set("강남구", "역삼동", old)
+
+        with mock.patch.object(service, "fetch_weather_data", return_value=new):
+            assert service.get_weather_data("강남구", "역삼동") == new
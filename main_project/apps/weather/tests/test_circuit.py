@@ -0,0 +1,126 @@
+from unittest import mock
+
+import httpx
+import pytest
+
+from main_project.apps.weather.cache import WeatherCache
+from main_project.apps.weather.circuit import CircuitBreaker
+from main_project.apps.weather.circuit import CircuitOpenError
+from main_project.apps.weather.providers import FixtureProvider
+from main_project.apps.weather.providers import WeatherPipeline
+from main_project.apps.weather.services import WeatherService
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def weather_cache(settings) -> WeatherCache:
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    settings.WEATHER_CIRCUIT_FAILURE_THRESHOLD = 3
+    cache = WeatherCache()
+    cache.cache.clear()
+    return cache
+
+
+@pytest.fixture
+def circuit(weather_cache: WeatherCache) -> CircuitBreaker:
+    return CircuitBreaker()
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self, circuit: CircuitBreaker):
+        circuit.record_failure()
+        circuit.record_failure()
+        assert circuit.state == "closed"
+
+        circuit.record_failure()
+        assert circuit.state == "open"
+        assert not circuit.allow_request()
+        assert circuit.retry_after() > 0
+        with pytest.raises(CircuitOpenError):
+            circuit.check()
+
+    def test_success_resets_failure_count(self, circuit: CircuitBreaker):
+        circuit.record_failure()
+        circuit.record_failure()
+        circuit.record_success()
+        circuit.record_failure()
+
+        assert circuit.state == "closed"
+
+    def test_state_is_shared_between_instances(self, circuit: CircuitBreaker):
+        for _ in range(3):
+            CircuitBreaker().record_failure()
+
+        assert circuit.state == "open"
+
+    def test_half_open_allows_single_probe(self, circuit: CircuitBreaker):
+        circuit.reset_timeout = 0
+        for _ in range(3):
+            circuit.record_failure()
+
+        assert circuit.state == "half-open"
+        assert circuit.allow_request()
+        assert not circuit.allow_request()
+
+        circuit.record_success()
+        assert circuit.state == "closed"
+        assert circuit.allow_request()
+
+    def test_failed_probe_reopens(self, circuit: CircuitBreaker):
+        for _ in range(3):
+            circuit.record_failure()
+        circuit.reset_timeout = 0
+        assert circuit.allow_request()
+
+        circuit.reset_timeout = 30
+        circuit.record_failure()
+        assert circuit.state == "open"
+
+
+class TestStaleWhileRevalidate:
+    def test_open_circuit_serves_stale_without_fetching(self, weather_cache: WeatherCache, circuit: CircuitBreaker):
+        weather_cache.ttl = -1
+        weather_cache.set("강남구", "역삼동", WeatherDataFactory(district="강남구"))
+        for _ in range(3):
+            circuit.record_failure()
+        provider = FixtureProvider({"*": {"aqi": 10}}, required=True)
+        service = WeatherService(cache=weather_cache, pipeline=WeatherPipeline([provider]), circuit=circuit)
+
+        weather_data = service.get_weather_data("강남구", "역삼동")
+
+        assert provider.calls == []
+        assert weather_data.is_stale
+
+    def test_open_circuit_without_data_raises(self, weather_cache: WeatherCache, circuit: CircuitBreaker):
+        for _ in range(3):
+            circuit.record_failure()
+        service = WeatherService(cache=weather_cache, circuit=circuit)
+
+        with pytest.raises(CircuitOpenError):
+            service.get_weather_data("강남구", "역삼동")
+
+    def test_follower_serves_stale_while_leader_refreshes(self, weather_cache: WeatherCache):
+        weather_cache.ttl = -1
+        weather_cache.set("강남구", "역삼동", WeatherDataFactory(district="강남구"))
+        assert weather_cache.acquire_lock("강남구", "역삼동")
+        service = WeatherService(cache=weather_cache)
+
+        with mock.patch.object(service, "_wait_for_leader") as wait:
+            assert service.get_weather_data("강남구", "역삼동").is_stale
+
+        wait.assert_not_called()
+
+    def test_request_errors_trip_the_circuit(self, weather_cache: WeatherCache, circuit: CircuitBreaker):
+        last_known = WeatherDataFactory(district="강남구", neighborhood="역삼동")
+        provider = FixtureProvider(error=httpx.ConnectTimeout("timed out"), required=True)
+        service = WeatherService(cache=weather_cache, pipeline=WeatherPipeline([provider]), circuit=circuit)
+
+        for _ in range(5):
+            assert service.get_weather_data("강남구", "역삼동") == last_known
+
+        assert len(provider.calls) == 3  # noqa: PLR2004
+        assert circuit.state == "open"
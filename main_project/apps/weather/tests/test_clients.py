@@ -0,0 +1,60 @@
+import asyncio
+
+import httpx
+import pytest
+
+from main_project.apps.weather.clients import AsyncWaqiClient
+from main_project.apps.weather.clients import WaqiError
+from main_project.apps.weather.tests.waqi_stub import WaqiStubServer
+from main_project.apps.weather.tests.waqi_stub import make_feed
+
+
+@pytest.fixture
+def waqi_stub(settings):
+    feeds = {f"강남구-동{n}": make_feed(aqi=n) for n in range(10)}
+    with WaqiStubServer(feeds) as server:
+        settings.WEATHER_API_BASE_URL = server.base_url
+        yield server
+
+
+def fetch(location: str, **options) -> dict:
+    async def run():
+        async with AsyncWaqiClient(**options) as client:
+            return await client.fetch(location)
+
+    return asyncio.run(run())
+
+
+class TestAsyncWaqiClient:
+    def test_error_status_raises(self, waqi_stub: WaqiStubServer):
+        with pytest.raises(WaqiError, match="Unknown station"):
+            fetch("없는-위치")
+
+    def test_injected_errors_raise_http_error(self, waqi_stub: WaqiStubServer):
+        waqi_stub.error_rate = 1.0
+
+        with pytest.raises(httpx.HTTPStatusError, match="503"):
+            fetch("강남구-동1")
+
+    def test_injected_latency_hits_timeout(self, waqi_stub: WaqiStubServer):
+        waqi_stub.latency = 0.3
+
+        with pytest.raises(httpx.TimeoutException):
+            fetch("강남구-동1", timeout=0.05)
+
+    def test_fetch_many(self, waqi_stub: WaqiStubServer):
+        locations = [f"강남구-동{n}" for n in range(10)] + ["없는-위치"]
+
+        async def run():
+            async with AsyncWaqiClient(max_connections=4) as client:
+                return await client.fetch_many(locations)
+
+        results = asyncio.run(run())
+
+        assert [result["aqi"] for result in results[:10]] == list(range(10))
+        assert isinstance(results[10], WaqiError)
+        assert len(waqi_stub.connections) <= 4
+
+    def test_fetch_requires_context_manager(self):
+        with pytest.raises(RuntimeError):
+            asyncio.run(AsyncWaqiClient(base_url="http://127.0.0.1/").fetch("x"))
@@ -0,0 +1,149 @@
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from main_project.apps.weather.cache import WeatherCache
+from main_project.apps.weather.forecast import best_window
+from main_project.apps.weather.forecast import build_forecast
+from main_project.apps.weather.models import HourlyForecast
+from main_project.apps.weather.models import WalkingCondition
+from main_project.apps.weather.services import WeatherService
+
+pytestmark = pytest.mark.django_db
+
+SEOUL = ZoneInfo("Asia/Seoul")
+NOW = datetime(2024, 5, 1, 10, 20, tzinfo=SEOUL)
+
+
+def brute_force_window(scores: np.ndarray, length: int, allowed: np.ndarray):
+    best = None
+    for start in range(len(scores) - length + 1):
+        window = scores[start:start + length]
+        if np.isnan(window).any() or not allowed[start:start + length].all():
+            continue
+        mean = window.sum() / length
+        if best is None or mean > best[1]:
+            best = (start, mean)
+    return best
+
+
+def make_reading(**overrides) -> dict:
+    # 10시 현재 맑음, 11~13시 비, 이후 48시간 동안 20도
+    hourly = [
+        {"time": NOW.replace(minute=0) + timedelta(hours=hour), "temperature": 20.0, "precipitation": 0.0}
+        for hour in range(1, 48)
+    ]
+    for point in hourly[:3]:
+        point["precipitation"] = 2.0
+    reading = {
+        "district": "강남구",
+        "aqi": 10,
+        "temperature": 20.0,
+        "humidity": 50.0,
+        "wind_speed": 1.0,
+        "pm10": 10.0,
+        "pm25": 5.0,
+        "precipitation": 0.0,
+        "precipitation_type": None,
+        "walking_score": 100,
+        "forecast_time": NOW,
+        "hourly": hourly,
+    }
+    reading.update(overrides)
+    return reading
+
+
+class TestBestWindow:
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_brute_force(self, seed: int):
+        rng = np.random.default_rng(seed)
+        scores = rng.integers(0, 100, 48).astype(float)
+        scores[rng.random(48) < 0.1] = np.nan
+        allowed = rng.random(48) < 0.8
+
+        expected = brute_force_window(scores, 3, allowed)
+        found = best_window(scores, 3, allowed)
+
+        if expected is None:
+            assert found is None
+        else:
+            assert found[0] == expected[0]
+            assert found[1] == pytest.approx(expected[1])
+
+    def test_ties_pick_earliest(self):
+        assert best_window(np.array([50.0, 90, 90, 90, 90, 50]), 2) == (1, 90.0)
+
+    def test_no_valid_window(self):
+        assert best_window(np.array([90.0, np.nan, 90.0]), 2) is None
+        assert best_window(np.array([90.0]), 2) is None
+
+
+class TestBuildForecast:
+    def test_window_skips_rain(self, settings):
+        settings.TIME_ZONE = "Asia/Seoul"
+
+        forecast = build_forecast(make_reading())
+
+        assert forecast.window == (time(14, 0), time(17, 0))
+
+    def test_rows_are_split_by_day(self, settings):
+        settings.TIME_ZONE = "Asia/Seoul"
+
+        rows = build_forecast(make_reading()).rows
+
+        assert [row.date.isoformat() for row in rows] == ["2024-05-01", "2024-05-02", "2024-05-03"]
+        assert all(len(row.temperature) == 24 for row in rows)  # noqa: PLR2004
+        assert rows[0].temperature[:10] == [None] * 10
+        assert rows[0].temperature[10] == 20.0  # noqa: PLR2004
+        assert rows[0].precipitation[11] == 2.0  # noqa: PLR2004
+        assert rows[0].walking_score[11] == 0
+        assert rows[0].walking_score[14] == 100  # noqa: PLR2004
+        assert rows[0].aqi[20] == 10  # noqa: PLR2004
+        assert rows[2].temperature[9] == 20.0  # noqa: PLR2004
+        assert rows[2].temperature[10] is None
+
+
+class TestSaveForecast:
+    @pytest.fixture
+    def service(self, settings) -> WeatherService:
+        settings.TIME_ZONE = "Asia/Seoul"
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        }
+        cache = WeatherCache()
+        cache.cache.clear()
+        return WeatherService(cache=cache)
+
+    def test_window_is_stored_on_walking_condition(self, service: WeatherService):
+        weather_data = service.save_many([make_reading()])[0]
+
+        condition = WalkingCondition.objects.get(weather_data=weather_data)
+        assert (condition.best_time_start, condition.best_time_end) == (time(14, 0), time(17, 0))
+        assert HourlyForecast.objects.filter(district="강남구").count() == 3  # noqa: PLR2004
+
+    def test_refresh_replaces_forecast_rows(self, service: WeatherService):
+        service.save_many([make_reading()])
+        service.save_many([make_reading(forecast_time=NOW + timedelta(minutes=5), temperature=25.0)])
+
+        assert HourlyForecast.objects.count() == 3  # noqa: PLR2004
+        assert HourlyForecast.objects.get(date=NOW.date()).temperature[10] == 25.0  # noqa: PLR2004
+
+    def test_stations_in_same_district_keep_separate_rows(self, service: WeatherService):
+        service.save_many([
+            make_reading(neighborhood="@100"),
+            make_reading(neighborhood="@200", temperature=25.0),
+        ])
+
+        rows = HourlyForecast.objects.filter(date=NOW.date())
+        assert {row.neighborhood: row.temperature[10] for row in rows} == {"@100": 20.0, "@200": 25.0}
+
+    def test_without_forecast_keeps_default_window(self, service: WeatherService):
+        weather_data = service.save_many([make_reading(hourly=None)])[0]
+
+        condition = WalkingCondition.objects.get(weather_data=weather_data)
+        assert (condition.best_time_start, condition.best_time_end) == (time(6, 0), time(9, 0))
+        assert not HourlyForecast.objects.exists()
@@ -0,0 +1,115 @@
+import io
+import json
+import logging
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from main_project.apps.weather import log
+from main_project.apps.weather.log import JsonFormatter
+from main_project.apps.weather.log import QueueStreamHandler
+from main_project.apps.weather.log import RateLimitFilter
+from main_project.apps.weather.log import RequestIdFilter
+from main_project.apps.weather.log import RequestIdMiddleware
+from main_project.apps.weather.log import get_request_id
+
+
+def make_record(msg: str = "Weather fetch failed for %s", *args, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("main_project.apps.weather.services", logging.WARNING, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestRequestIdMiddleware:
+    def run(self, **headers) -> tuple[HttpResponse, str]:
+        seen = {}
+
+        def view(request):
+            seen["request_id"] = get_request_id()
+            return HttpResponse("ok")
+
+        response = RequestIdMiddleware(view)(RequestFactory().get("/", headers=headers))
+        return response, seen["request_id"]
+
+    def test_reuses_incoming_id(self):
+        response, request_id = self.run(x_request_id="abc-123")
+
+        assert request_id == "abc-123"
+        assert response["X-Request-ID"] == "abc-123"
+        assert get_request_id() is None
+
+    def test_uses_traceparent_trace_id(self):
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        _, request_id = self.run(traceparent=f"00-{trace_id}-00f067aa0ba902b7-01")
+
+        assert request_id == trace_id
+
+    def test_rejects_unsafe_ids(self):
+        response, request_id = self.run(x_request_id='bad id"\n{')
+
+        assert request_id != 'bad id"\n{'
+        assert len(request_id) == 32  # noqa: PLR2004
+
+
+class TestJsonFormatter:
+    def test_formats_extras_and_request_id(self):
+        record = make_record("Weather fetch failed for %s", "강남구", request_timing={"total_ms": 1.5})
+        RequestIdFilter().filter(record)
+
+        data = json.loads(JsonFormatter().format(record))
+
+        assert data["level"] == "WARNING"
+        assert data["message"] == "Weather fetch failed for 강남구"
+        assert data["request_id"] is None
+        assert data["request_timing"] == {"total_ms": 1.5}
+        assert "args" not in data
+
+
+class TestRateLimitFilter:
+    def test_limits_each_template_and_reports_suppressed(self):
+        rate_limit = RateLimitFilter(rate=2, per=60)
+
+        passed = [rate_limit.filter(make_record("Weather fetch failed for %s", n)) for n in range(5)]
+        assert passed == [True, True, False, False, False]
+        assert rate_limit.filter(make_record("Other message"))
+
+        rate_limit.per = 0
+        record = make_record("Weather fetch failed for %s", 5)
+        assert rate_limit.filter(record)
+        assert record.suppressed == 3  # noqa: PLR2004
+
+
+class TestQueueStreamHandler:
+    def test_writes_json_from_listener_thread(self):
+        stream = io.StringIO()
+        handler = QueueStreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+
+        try:
+            raise ValueError("boom")
+        except ValueError as e:
+            record = make_record("Weather fetch failed for %s", "강남구")
+            record.exc_info = (type(e), e, e.__traceback__)
+            handler.handle(record)
+        handler.close()
+
+        data = json.loads(stream.getvalue())
+        assert data["message"] == "Weather fetch failed for 강남구"
+        assert "ValueError: boom" in data["exc_info"]
+
+    def test_fork_restarts_only_open_handlers_with_new_queue(self):
+        stream = io.StringIO()
+        handler = QueueStreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        closed = QueueStreamHandler(io.StringIO())
+        closed.close()
+        parent_queue = handler.queue
+
+        # fork 직후 자식에서 불리는 훅을 직접 실행한다
+        log._restart_queue_handlers()
+
+        assert handler.queue is not parent_queue
+        assert closed.listener is None
+        handler.handle(make_record("after fork %s", 1))
+        handler.close()
+        assert json.loads(stream.getvalue())["message"] == "after fork 1"
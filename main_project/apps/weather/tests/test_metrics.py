@@ -0,0 +1,83 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from main_project.apps.users.models import User
+from main_project.apps.weather.cache import WeatherCache
+from main_project.apps.weather.clients import AsyncWaqiClient
+from main_project.apps.weather.clients import WaqiError
+from main_project.apps.weather.services import WeatherService
+from main_project.apps.weather.tests.waqi_stub import WaqiStubServer
+from main_project.apps.weather.tests.waqi_stub import make_feed
+
+pytestmark = pytest.mark.django_db
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def waqi_stub(settings):
+    with WaqiStubServer({"강남구-역삼동": make_feed(aqi=30)}) as server:
+        settings.WEATHER_API_BASE_URL = server.base_url
+        yield server
+
+
+class TestWeatherMetrics:
+    def test_upstream_duration_by_status(self, waqi_stub: WaqiStubServer):
+        ok = sample("weather_upstream_request_seconds_count", client="async", status="200")
+        api_error = sample("weather_upstream_request_seconds_count", client="async", status="api_error")
+
+        async def run():
+            async with AsyncWaqiClient() as client:
+                return await client.fetch_many(["강남구-역삼동", "없는-위치"])
+
+        results = asyncio.run(run())
+
+        assert isinstance(results[1], WaqiError)
+        assert sample("weather_upstream_request_seconds_count", client="async", status="200") == ok + 1
+        assert sample("weather_upstream_request_seconds_count", client="async", status="api_error") == api_error + 1
+
+    def test_cache_save_and_scoring_metrics(self, waqi_stub: WaqiStubServer, settings):
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        }
+        weather_cache = WeatherCache()
+        weather_cache.cache.clear()
+        service = WeatherService(cache=weather_cache)
+        before = {
+            "miss": sample("weather_cache_events_total", event="miss"),
+            "hit": sample("weather_cache_events_total", event="hit"),
+            "save": sample("weather_db_save_seconds_count"),
+            "scoring": sample("weather_scoring_seconds_count", mode="scalar"),
+        }
+
+        service.get_weather_data("강남구", "역삼동")
+        service.get_weather_data("강남구", "역삼동")
+
+        assert sample("weather_cache_events_total", event="miss") == before["miss"] + 1
+        assert sample("weather_cache_events_total", event="hit") == before["hit"] + 1
+        assert sample("weather_db_save_seconds_count") == before["save"] + 1
+        assert sample("weather_scoring_seconds_count", mode="scalar") == before["scoring"] + 1
+
+
+class TestMetricsView:
+    def test_requires_admin(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(email="a@example.com", nickname="a"))
+
+        assert client.get("/metrics").status_code == HTTPStatus.FORBIDDEN
+
+    def test_exposes_prometheus_text(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(email="admin@example.com", nickname="admin", is_staff=True))
+
+        response = client.get("/metrics")
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"].startswith("text/plain")
+        assert b"weather_upstream_request_seconds" in response.content
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from main_project.apps.weather.models import WeatherData
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_latest_for_returns_newest_row_per_location(django_assert_num_queries):
+    now = timezone.now().replace(microsecond=0)
+    for hour in range(3):
+        WeatherDataFactory(district="강남구", neighborhood="역삼동", forecast_time=now - timedelta(hours=6 - hour))
+        WeatherDataFactory(district="마포구", neighborhood="@100", forecast_time=now - timedelta(hours=3 - hour))
+    # 같은 구의 다른 동과 요청하지 않은 위치의 행은 고르지 않는다
+    WeatherDataFactory(district="강남구", neighborhood="삼성동", forecast_time=now)
+    WeatherDataFactory(district="종로구", neighborhood="사직동", forecast_time=now)
+
+    with django_assert_num_queries(1):
+        rows = WeatherData.objects.latest_for([("강남구", "역삼동"), ("마포구", "@100"), ("없는구", "없는동")])
+        latest = {(weather_data.district, weather_data.neighborhood): weather_data for weather_data in rows}
+
+    assert set(latest) == {("강남구", "역삼동"), ("마포구", "@100")}
+    assert latest[("강남구", "역삼동")].forecast_time == now - timedelta(hours=4)
+    assert latest[("마포구", "@100")].forecast_time == now - timedelta(hours=1)
+
+
+def test_latest_for_ignores_rows_outside_recent_window(settings):
+    settings.WEATHER_RECENT_WINDOW = 3600
+    WeatherDataFactory(district="강남구", neighborhood="역삼동", forecast_time=timezone.now() - timedelta(hours=2))
+
+    assert not WeatherData.objects.latest_for([("강남구", "역삼동")]).exists()
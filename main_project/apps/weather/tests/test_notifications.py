@@ -0,0 +1,219 @@
+from datetime import datetime
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+import orjson
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from main_project.apps.users.models import User
+from main_project.apps.users.models import UserLocation
+from main_project.apps.weather.cache import WeatherCache
+from main_project.apps.weather.models import WeatherAlert
+from main_project.apps.weather.models import WeatherAlertDelivery
+from main_project.apps.weather.notifications import AlertDispatcher
+from main_project.apps.weather.notifications import AlertTransport
+from main_project.apps.weather.notifications import FileTransport
+from main_project.apps.weather.services import WeatherService
+from main_project.apps.weather.stations import LocationIndex
+
+pytestmark = pytest.mark.django_db
+
+SEOUL = ZoneInfo("Asia/Seoul")
+NOW = datetime(2024, 5, 1, 10, 20, tzinfo=SEOUL)
+INDEX = LocationIndex({"강남구|역삼동": "100", "강남구|삼성동": "100"})
+
+
+class RecordingTransport(AlertTransport):
+    def __init__(self, error: Exception = None):
+        self.batches = []
+        self.error = error
+
+    def send(self, messages):
+        if self.error:
+            raise self.error
+        self.batches.append(messages)
+
+
+@pytest.fixture
+def service(settings) -> WeatherService:
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    cache = WeatherCache()
+    cache.cache.clear()
+    return WeatherService(cache=cache, index=INDEX)
+
+
+def make_reading(**overrides) -> dict:
+    reading = {
+        "district": "강남구",
+        "aqi": 320,
+        "temperature": 18.0,
+        "humidity": 40.0,
+        "wind_speed": 1.0,
+        "pm10": 30.0,
+        "pm25": 12.0,
+        "precipitation": 0.0,
+        "precipitation_type": None,
+        "walking_score": 10,
+        "forecast_time": NOW,
+    }
+    reading.update(overrides)
+    return reading
+
+
+def subscribe(count: int, neighborhood: str = "역삼동", start: int = 0):
+    for n in range(start, start + count):
+        user = User.objects.create(email=f"u{n}@example.com", nickname=f"u{n}")
+        UserLocation.objects.create(user=user, district="강남구", neighborhood=neighborhood)
+
+
+def save_alert(service: WeatherService, **overrides):
+    service.save_many([make_reading(**overrides)], [("강남구", "@100")])
+
+
+class TestEnqueue:
+    def test_warning_enqueues_one_alert_per_window(self, service: WeatherService):
+        save_alert(service)
+        save_alert(service, forecast_time=NOW + timedelta(minutes=30))
+
+        alert = WeatherAlert.objects.get()
+        assert (alert.district, alert.neighborhood) == ("강남구", "@100")
+        assert alert.recommendation == "INDOOR"
+        assert alert.aqi == 320  # noqa: PLR2004
+
+    def test_new_level_enqueues_again(self, service: WeatherService):
+        save_alert(service)
+        save_alert(service, aqi=160, forecast_time=NOW + timedelta(minutes=30))
+
+        assert list(WeatherAlert.objects.order_by("id").values_list("recommendation", flat=True)) == [
+            "INDOOR", "SHORT_WALK",
+        ]
+
+    def test_good_air_enqueues_nothing(self, service: WeatherService):
+        save_alert(service, aqi=20)
+
+        assert not WeatherAlert.objects.exists()
+
+
+class TestFanOut:
+    def test_merged_neighborhoods_share_one_delivery_per_user(self, service: WeatherService):
+        subscribe(3)
+        subscribe(2, neighborhood="삼성동", start=3)
+        subscribe(1, neighborhood="대치동", start=5)
+        user = User.objects.get(nickname="u0")
+        UserLocation.objects.create(user=user, district="강남구", neighborhood="삼성동")
+        save_alert(service)
+
+        AlertDispatcher(transport=RecordingTransport(), index=INDEX).fan_out()
+
+        deliveries = WeatherAlertDelivery.objects.all()
+        assert deliveries.count() == 5  # noqa: PLR2004
+        assert deliveries.filter(user=user).count() == 1
+        assert not WeatherAlert.objects.filter(fanned_out_at__isnull=True).exists()
+
+    def test_subscriber_lookup_is_indexed(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, "user_locations")
+
+        assert constraints["user_location_area_idx"]["columns"] == ["district", "neighborhood"]
+
+    def test_query_count_does_not_grow_with_subscribers(self, service: WeatherService):
+        def fan_out_queries() -> int:
+            save_alert(service, forecast_time=NOW + timedelta(days=WeatherAlert.objects.count()))
+            with CaptureQueriesContext(connection) as queries:
+                AlertDispatcher(transport=RecordingTransport(), index=INDEX, batch_size=100).fan_out()
+            return len(queries)
+
+        subscribe(2)
+        few = fan_out_queries()
+        subscribe(40, start=2)
+        many = fan_out_queries()
+
+        assert many == few
+        assert WeatherAlertDelivery.objects.count() == 2 + 42  # noqa: PLR2004
+
+
+class TestDeliver:
+    def test_batches_and_rate_limits(self, service: WeatherService, settings):
+        settings.WEATHER_ALERT_USER_LIMIT = 2
+        subscribe(3)
+        for hours in (0, 3, 6):
+            save_alert(service, forecast_time=NOW + timedelta(hours=hours))
+        transport = RecordingTransport()
+
+        result = AlertDispatcher(transport=transport, index=INDEX, batch_size=4).run()
+
+        assert (result.alerts, result.deliveries, result.sent, result.suppressed) == (3, 9, 6, 3)
+        assert [len(batch) for batch in transport.batches] == [4, 2]
+        assert transport.batches[0][0]["neighborhood"] == "역삼동"
+        assert WeatherAlertDelivery.objects.filter(status=WeatherAlertDelivery.SUPPRESSED).count() == 3  # noqa: PLR2004
+
+    def test_transport_failure_backs_off_deliveries(self, service: WeatherService):
+        subscribe(2)
+        save_alert(service)
+        dispatcher = AlertDispatcher(transport=RecordingTransport(error=ConnectionError("down")), index=INDEX)
+        dispatcher.fan_out()
+
+        assert dispatcher.deliver() == (0, 0, 2)
+
+        pending = WeatherAlertDelivery.objects.filter(status=WeatherAlertDelivery.PENDING)
+        assert pending.count() == 2  # noqa: PLR2004
+        assert set(pending.values_list("attempts", flat=True)) == {1}
+        assert not pending.filter(next_attempt_at__isnull=True).exists()
+
+    def test_failed_batch_does_not_block_later_batches(self, service: WeatherService):
+        class FlakyTransport(RecordingTransport):
+            def send(self, messages):
+                if not self.batches and not self.error:
+                    self.error = ConnectionError("down")
+                    raise self.error
+                self.batches.append(messages)
+
+        subscribe(4)
+        save_alert(service)
+        transport = FlakyTransport()
+
+        result = AlertDispatcher(transport=transport, index=INDEX, batch_size=2).run()
+
+        assert (result.sent, result.failed) == (2, 2)
+        assert [len(batch) for batch in transport.batches] == [2]
+
+    def test_backed_off_deliveries_are_retried(self, service: WeatherService):
+        subscribe(2)
+        save_alert(service)
+        transport = RecordingTransport(error=ConnectionError("down"))
+        dispatcher = AlertDispatcher(transport=transport, index=INDEX)
+        dispatcher.run()
+        transport.error = None
+
+        assert dispatcher.deliver() == (0, 0, 0)
+        WeatherAlertDelivery.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        assert dispatcher.deliver() == (2, 0, 0)
+
+    def test_gives_up_after_max_attempts(self, service: WeatherService, settings):
+        settings.WEATHER_ALERT_MAX_ATTEMPTS = 2
+        subscribe(1)
+        save_alert(service)
+        dispatcher = AlertDispatcher(transport=RecordingTransport(error=ConnectionError("down")), index=INDEX)
+        dispatcher.run()
+        WeatherAlertDelivery.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+
+        dispatcher.deliver()
+
+        delivery = WeatherAlertDelivery.objects.get()
+        assert (delivery.status, delivery.attempts) == (WeatherAlertDelivery.FAILED, 2)
+
+    def test_file_transport(self, service: WeatherService, tmp_path):
+        subscribe(2)
+        save_alert(service)
+        path = tmp_path / "alerts.jsonl"
+
+        AlertDispatcher(transport=FileTransport(path), index=INDEX).run()
+
+        messages = [orjson.loads(line) for line in path.read_bytes().splitlines()]
+        assert len(messages) == 2  # noqa: PLR2004
+        assert messages[0]["warning"] == "매우 위험한 대기질. 외출을 피해주세요."
@@ -0,0 +1,73 @@
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from main_project.apps.weather import partitions
+from main_project.apps.weather.models import WeatherData
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+
+pytestmark = pytest.mark.django_db
+
+postgres_only = pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="weather_data is only partitioned on PostgreSQL",
+)
+
+
+def test_month_start():
+    assert partitions.month_start(date(2024, 1, 15)) == date(2024, 1, 1)
+    assert partitions.month_start(date(2024, 1, 15), -1) == date(2023, 12, 1)
+    assert partitions.month_start(date(2024, 11, 30), 3) == date(2025, 2, 1)
+
+
+def test_partition_bounds():
+    assert partitions.partition_name(date(2024, 12, 1)) == "weather_data_2024_12"
+    assert partitions.partition_bounds(date(2024, 12, 1)) == (
+        datetime(2024, 12, 1, tzinfo=UTC),
+        datetime(2025, 1, 1, tzinfo=UTC),
+    )
+
+
+@postgres_only
+def test_ensure_and_drop_partitions():
+    month = date(2030, 1, 1)
+    assert partitions.create_partition(month)
+    assert not partitions.create_partition(month)
+    WeatherDataFactory(forecast_time=datetime(2030, 1, 15, tzinfo=UTC))
+
+    partitions.drop_partition(month)
+
+    assert (partitions.partition_name(month), month) not in partitions.list_partitions()
+    assert not WeatherData.objects.filter(forecast_time__year=2030).exists()
+
+
+@postgres_only
+def test_create_partition_moves_rows_out_of_default():
+    month = date(2031, 1, 1)
+    weather_data = WeatherDataFactory(forecast_time=datetime(2031, 1, 15, tzinfo=UTC))
+    WeatherDataFactory(forecast_time=datetime(2031, 2, 15, tzinfo=UTC))
+
+    assert partitions.create_partition(month)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT id FROM "{partitions.partition_name(month)}"')
+        assert [row[0] for row in cursor.fetchall()] == [weather_data.id]
+        cursor.execute(f'SELECT count(*) FROM "{partitions.DEFAULT_PARTITION}"')
+        assert cursor.fetchone()[0] == 1
+    assert WeatherData.objects.filter(forecast_time__year=2031).count() == 2  # noqa: PLR2004
+
+
+@postgres_only
+def test_command_dry_run_lists_expired_partitions():
+    partitions.create_partition(date(2000, 1, 1))
+    out = StringIO()
+
+    call_command("weather_partitions", "--retain-months=12", "--dry-run", stdout=out)
+
+    assert "would drop weather_data_2000_01" in out.getvalue()
+    assert ("weather_data_2000_01", date(2000, 1, 1)) in partitions.list_partitions()
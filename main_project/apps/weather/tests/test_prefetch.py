@@ -0,0 +1,62 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from main_project.apps.users.models import User
+from main_project.apps.users.models import UserLocation
+from main_project.apps.weather.prefetch import WeatherPrefetcher
+from main_project.apps.weather.prefetch import get_prefetch_locations
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def locations() -> None:
+    first = User.objects.create(email="a@example.com", nickname="a")
+    second = User.objects.create(email="b@example.com", nickname="b")
+    UserLocation.objects.create(user=first, district="강남구", neighborhood="역삼동")
+    UserLocation.objects.create(user=second, district="강남구", neighborhood="역삼동")
+    UserLocation.objects.create(user=second, district="마포구", neighborhood="합정동")
+
+
+def test_get_prefetch_locations_is_distinct(locations):
+    assert get_prefetch_locations() == [("강남구", "역삼동"), ("마포구", "합정동")]
+
+
+def test_prefetcher_collects_metrics(locations):
+    service = mock.Mock()
+    service.refresh_many.return_value = {
+        ("강남구", "역삼동"): mock.Mock(),
+        ("마포구", "합정동"): Exception("down"),
+    }
+
+    result = WeatherPrefetcher(service=service, concurrency=1).run()
+
+    service.refresh_many.assert_called_once_with(
+        [("강남구", "역삼동"), ("마포구", "합정동")],
+        max_connections=1,
+    )
+    assert result.total == 2
+    assert result.refreshed == 1
+    assert result.failed == [("마포구", "합정동")]
+    assert result.elapsed >= 0
+
+
+def test_prefetcher_counts_locked_locations_as_skipped():
+    service = mock.Mock()
+    service.refresh_many.return_value = {("강남구", "역삼동"): None}
+
+    result = WeatherPrefetcher(service=service).run([("강남구", "역삼동")])
+
+    assert (result.refreshed, result.skipped) == (0, 1)
+
+
+def test_dry_run_does_not_fetch(locations):
+    out = StringIO()
+    with mock.patch("main_project.apps.weather.management.commands.prefetch_weather.WeatherPrefetcher") as prefetcher:
+        call_command("prefetch_weather", "--dry-run", stdout=out)
+
+    prefetcher.assert_not_called()
+    assert "2 locations would be refreshed" in out.getvalue()
@@ -0,0 +1,218 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from main_project.apps.weather import providers
+from main_project.apps.weather.cache import WeatherCache
+from main_project.apps.weather.providers import FixtureProvider
+from main_project.apps.weather.providers import KmaProvider
+from main_project.apps.weather.providers import ProviderError
+from main_project.apps.weather.providers import ProviderTimeout
+from main_project.apps.weather.providers import WaqiProvider
+from main_project.apps.weather.providers import WeatherPipeline
+from main_project.apps.weather.providers import kma_forecast_base
+from main_project.apps.weather.providers import kma_grid
+from main_project.apps.weather.providers import kma_nowcast_base
+from main_project.apps.weather.providers import parse_kma_forecast
+from main_project.apps.weather.providers import parse_kma_nowcast
+from main_project.apps.weather.services import WeatherService
+
+pytestmark = pytest.mark.django_db
+
+AIR = {"aqi": 42, "temperature": 18.0, "humidity": 40.0, "pm10": 30.0, "pm25": 12.0}
+FORECAST = {"temperature": 21.5, "precipitation": 1.5, "precipitation_type": "비", "humidity": None}
+
+
+def make_kma_payload(**values) -> dict:
+    return {
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {"items": {"item": [{"category": key, "obsrValue": value} for key, value in values.items()]}},
+        },
+    }
+
+
+class TestPipeline:
+    def test_merges_providers_in_order(self):
+        pipeline = WeatherPipeline([
+            FixtureProvider({"*": AIR}, name="air", required=True),
+            FixtureProvider({"*": FORECAST}, name="forecast"),
+        ])
+
+        reading = pipeline.fetch("강남구", "역삼동")
+
+        assert reading["aqi"] == 42  # noqa: PLR2004
+        assert reading["temperature"] == 21.5  # noqa: PLR2004
+        assert reading["humidity"] == 40.0  # noqa: PLR2004
+        assert reading["precipitation_type"] == "비"
+
+    def test_providers_are_called_concurrently(self):
+        pipeline = WeatherPipeline([
+            FixtureProvider({"*": AIR}, name="air", delay=0.2),
+            FixtureProvider({"*": FORECAST}, name="forecast", delay=0.2),
+        ])
+
+        started = time.monotonic()
+        pipeline.fetch_many([("강남구", "역삼동"), ("마포구", "합정동")])
+
+        assert time.monotonic() - started < 0.35  # noqa: PLR2004
+
+    def test_slow_optional_provider_is_dropped(self):
+        pipeline = WeatherPipeline([
+            FixtureProvider({"*": AIR}, name="air", required=True),
+            FixtureProvider({"*": FORECAST}, name="forecast", delay=5, timeout=0.05),
+        ])
+
+        started = time.monotonic()
+        reading = pipeline.fetch("강남구", "역삼동")
+
+        assert time.monotonic() - started < 1
+        assert reading["temperature"] == 18.0  # noqa: PLR2004
+        assert "precipitation" not in reading
+
+    def test_required_provider_failure_fails_location(self):
+        pipeline = WeatherPipeline([
+            FixtureProvider({"강남구-역삼동": AIR}, name="air", required=True),
+            FixtureProvider({"*": FORECAST}, name="forecast"),
+        ])
+
+        results = pipeline.fetch_many([("강남구", "역삼동"), ("마포구", "합정동")])
+
+        assert results[0]["aqi"] == 42  # noqa: PLR2004
+        assert isinstance(results[1], ProviderError)
+
+    def test_required_provider_timeout(self):
+        pipeline = WeatherPipeline([FixtureProvider({"*": AIR}, required=True, delay=5, timeout=0.05)])
+
+        with pytest.raises(ProviderTimeout):
+            pipeline.fetch("강남구", "역삼동")
+
+    def test_merges_forecasts_by_hour(self):
+        pipeline = WeatherPipeline([
+            FixtureProvider(
+                {"*": AIR},
+                name="air",
+                required=True,
+                forecasts={"*": [{"time": "2024-05-01T11:00:00+09:00", "temperature": 18.0, "aqi": 40}]},
+            ),
+            FixtureProvider(
+                {"*": FORECAST},
+                name="forecast",
+                forecasts={"*": [
+                    {"time": "2024-05-01T11:00:00+09:00", "temperature": 19.0, "precipitation": None},
+                    {"time": "2024-05-01T12:00:00+09:00", "temperature": 20.0, "precipitation": 0.0},
+                ]},
+            ),
+        ])
+
+        hourly = pipeline.fetch("강남구", "역삼동")["hourly"]
+
+        assert [point["temperature"] for point in hourly] == [19.0, 20.0]
+        assert hourly[0]["aqi"] == 40  # noqa: PLR2004
+        assert "precipitation" not in hourly[0]
+
+    def test_forecast_failure_keeps_reading(self):
+        class BrokenForecast(FixtureProvider):
+            async def forecast(self, district, neighborhood):
+                raise ProviderError("down")
+
+        pipeline = WeatherPipeline([BrokenForecast({"*": AIR}, required=True)])
+
+        reading = pipeline.fetch("강남구", "역삼동")
+
+        assert reading["aqi"] == 42  # noqa: PLR2004
+        assert "hourly" not in reading
+
+    def test_from_settings_skips_disabled_providers(self, settings):
+        settings.WEATHER_KMA_API_KEY = ""
+        assert [type(p) for p in WeatherPipeline.from_settings().providers] == [WaqiProvider]
+
+        settings.WEATHER_KMA_API_KEY = "key"
+        assert [type(p) for p in WeatherPipeline.from_settings().providers] == [WaqiProvider, KmaProvider]
+
+    def test_loop_thread_reset_replaces_held_lock(self):
+        # fork 순간 부모의 다른 스레드가 쥐고 있던 락을 흉내 낸다
+        loop_thread = providers._LoopThread()
+        loop_thread._lock.acquire()
+
+        loop_thread._reset()
+
+        assert loop_thread._lock.acquire(blocking=False)
+        assert loop_thread.loop is None
+
+
+class TestKma:
+    def test_grid(self):
+        assert kma_grid(37.5665, 126.9780) == (60, 127)
+
+    def test_nowcast_base(self):
+        assert kma_nowcast_base(datetime(2024, 1, 1, 0, 30)) == ("20231231", "2300")
+        assert kma_nowcast_base(datetime(2024, 1, 1, 9, 45)) == ("20240101", "0900")
+
+    def test_forecast_base(self):
+        assert kma_forecast_base(datetime(2024, 1, 1, 2, 5)) == ("20231231", "2300")
+        assert kma_forecast_base(datetime(2024, 1, 1, 2, 10)) == ("20240101", "0200")
+        assert kma_forecast_base(datetime(2024, 1, 1, 13, 0)) == ("20240101", "1100")
+
+    def test_parse_forecast(self, settings):
+        settings.TIME_ZONE = "Asia/Seoul"
+        items = [
+            {"category": category, "fcstDate": "20240501", "fcstTime": hour, "fcstValue": value}
+            for hour, values in (("1100", {"TMP": "18", "PCP": "강수없음", "POP": "20", "SKY": "1"}),
+                                 ("1200", {"TMP": "17", "PCP": "1mm 미만", "REH": "70"}),
+                                 ("1300", {"PCP": "30.0~50.0mm"}))
+            for category, value in values.items()
+        ]
+        payload = {"response": {"header": {"resultCode": "00"}, "body": {"items": {"item": items}}}}
+
+        points = parse_kma_forecast(payload)
+
+        assert [point["time"].hour for point in points] == [11, 12, 13]
+        assert points[0] == {
+            "time": points[0]["time"],
+            "temperature": 18.0,
+            "precipitation": 0.0,
+            "precipitation_probability": 20.0,
+        }
+        assert points[1]["precipitation"] == 0.5  # noqa: PLR2004
+        assert points[1]["humidity"] == 70.0  # noqa: PLR2004
+        assert points[2]["precipitation"] == 30.0  # noqa: PLR2004
+
+    def test_parse(self):
+        reading = parse_kma_nowcast(make_kma_payload(T1H="3.2", REH="80", WSD="1.1", RN1="강수없음", PTY="0"))
+
+        assert reading == {
+            "temperature": 3.2,
+            "humidity": 80.0,
+            "wind_speed": 1.1,
+            "precipitation": 0.0,
+            "precipitation_type": None,
+        }
+
+    def test_parse_error(self):
+        payload = {"response": {"header": {"resultCode": "03", "resultMsg": "NO_DATA"}}}
+
+        with pytest.raises(ProviderError, match="NO_DATA"):
+            parse_kma_nowcast(payload)
+
+
+class TestServiceIngestion:
+    def test_saves_merged_reading(self, settings):
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        }
+        cache = WeatherCache()
+        cache.cache.clear()
+        pipeline = WeatherPipeline([
+            FixtureProvider({"*": AIR}, name="air", required=True),
+            FixtureProvider({"*": FORECAST}, name="forecast"),
+        ])
+        service = WeatherService(cache=cache, pipeline=pipeline)
+
+        weather_data = service.get_weather_data("강남구", "역삼동")
+        weather_data.refresh_from_db()
+
+        assert weather_data.aqi == 42  # noqa: PLR2004
+        assert weather_data.precipitation == 1.5  # noqa: PLR2004
+        assert weather_data.precipitation_type == "비"
@@ -0,0 +1,46 @@
+import pytest
+from rest_framework.test import APIClient
+
+from main_project.apps.users.models import User
+from main_project.apps.weather.rollups import update_rollups
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+from main_project.apps.weather.tests.utils import assert_list_queries_constant
+
+pytestmark = pytest.mark.django_db
+
+# ATOMIC_REQUESTS의 savepoint 쿼리를 제외하면 목록 조회는 SELECT 한 번이다
+LIST_QUERIES = 3
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(User.objects.create(email="a@example.com", nickname="a"))
+    return client
+
+
+@pytest.fixture
+def weather_rows():
+    return WeatherDataFactory.create_batch(60)
+
+
+def test_weather_list_has_no_n_plus_one(api_client: APIClient, weather_rows):
+    assert_list_queries_constant(api_client, "/api/weather/", LIST_QUERIES)
+
+
+def test_weather_list_without_walking_condition(api_client: APIClient, weather_rows):
+    assert_list_queries_constant(api_client, "/api/weather/", LIST_QUERIES, params={"fields": "id,aqi"})
+
+
+def test_weather_detail_joins_walking_condition(api_client: APIClient, weather_rows, django_assert_max_num_queries):
+    with django_assert_max_num_queries(LIST_QUERIES):
+        response = api_client.get(f"/api/weather/{weather_rows[0].pk}/")
+
+    assert response.data["walking_condition"]["recommendation"] == "GOOD"
+
+
+def test_rollup_lists_are_constant(api_client: APIClient, weather_rows):
+    update_rollups()
+
+    assert_list_queries_constant(api_client, "/api/weather-hourly/", LIST_QUERIES)
+    assert_list_queries_constant(api_client, "/api/weather-daily/", LIST_QUERIES)
@@ -0,0 +1,53 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from main_project.apps.weather.models import WeatherData
+from main_project.apps.weather.rescore import WeatherRescorer
+from main_project.apps.weather.scoring import calculate_walking_score
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def stale_rows() -> list[WeatherData]:
+    return WeatherDataFactory.create_batch(7, walking_score=-1, aqi=350)
+
+
+def test_rescore_updates_scores_and_conditions(stale_rows):
+    batches = []
+    progress = WeatherRescorer(batch_size=3, on_batch=lambda p: batches.append(p.last_id)).run()
+
+    assert progress.scanned == 7
+    assert progress.scores_updated == 7
+    assert progress.conditions_updated == 7
+    assert batches == [stale_rows[2].pk, stale_rows[5].pk, stale_rows[6].pk]
+    for weather_data in WeatherData.objects.select_related("walking_condition"):
+        assert weather_data.walking_score == calculate_walking_score(
+            weather_data.aqi,
+            weather_data.temperature,
+            weather_data.pm25,
+        )
+        assert weather_data.walking_condition.recommendation == "INDOOR"
+
+
+def test_rescore_skips_unchanged_rows(stale_rows):
+    WeatherRescorer().run()
+
+    progress = WeatherRescorer().run()
+
+    assert (progress.scanned, progress.scores_updated, progress.conditions_updated) == (7, 0, 0)
+
+
+def test_command_resumes_from_checkpoint(stale_rows, tmp_path):
+    checkpoint = tmp_path / "rescore.checkpoint"
+    checkpoint.write_text(str(stale_rows[3].pk))
+
+    call_command("rescore_weather", "--batch-size=2", f"--checkpoint={checkpoint}", stdout=StringIO())
+
+    scores = list(WeatherData.objects.order_by("id").values_list("walking_score", flat=True))
+    assert scores[:4] == [-1] * 4
+    assert -1 not in scores[4:]
+    assert checkpoint.read_text() == str(stale_rows[-1].pk)
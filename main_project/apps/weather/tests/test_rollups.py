@@ -0,0 +1,148 @@
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from http import HTTPStatus
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from main_project.apps.users.models import User
+from main_project.apps.weather.models import WeatherDaily
+from main_project.apps.weather.models import WeatherData
+from main_project.apps.weather.models import WeatherHourly
+from main_project.apps.weather.rollups import rebuild_rollups
+from main_project.apps.weather.rollups import update_rollups
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+
+pytestmark = pytest.mark.django_db
+
+SEOUL = ZoneInfo("Asia/Seoul")
+
+
+@pytest.fixture(autouse=True)
+def no_safety_lag(settings):
+    settings.WEATHER_ROLLUP_SAFETY_LAG = 0
+
+
+def reading(hour: int, minute: int, aqi: int | None, **kwargs):
+    return WeatherDataFactory(
+        district="강남구",
+        forecast_time=datetime(2024, 5, 1, hour, minute, tzinfo=SEOUL),
+        aqi=aqi,
+        **kwargs,
+    )
+
+
+class TestUpdateRollups:
+    def test_aggregates_hourly_and_daily(self):
+        reading(9, 0, 40, pm25=10.0)
+        reading(9, 30, 60, pm25=30.0)
+        reading(10, 0, None, pm25=20.0)
+
+        assert update_rollups() == 3
+
+        nine = WeatherHourly.objects.get(bucket=datetime(2024, 5, 1, 9, tzinfo=SEOUL))
+        assert (nine.sample_count, nine.aqi_min, nine.aqi_max, nine.aqi_avg) == (2, 40, 60, 50)
+        assert nine.pm25_avg == 20.0
+
+        ten = WeatherHourly.objects.get(bucket=datetime(2024, 5, 1, 10, tzinfo=SEOUL))
+        assert (ten.sample_count, ten.aqi_avg, ten.aqi_count) == (1, None, 0)
+
+        day = WeatherDaily.objects.get(district="강남구", bucket=date(2024, 5, 1))
+        assert (day.sample_count, day.aqi_count, day.aqi_avg) == (3, 2, 50)
+
+    def test_incremental_update_uses_watermark(self):
+        reading(9, 0, 40)
+        update_rollups()
+        reading(9, 30, 100)
+        reading(9, 45, 160)
+
+        assert update_rollups(batch_size=1) == 2
+        assert update_rollups() == 0
+
+        nine = WeatherHourly.objects.get()
+        assert (nine.sample_count, nine.aqi_min, nine.aqi_max, nine.aqi_avg) == (3, 40, 160, 100)
+
+    def test_recent_rows_wait_for_safety_lag(self, settings):
+        settings.WEATHER_ROLLUP_SAFETY_LAG = 60
+        row = reading(9, 0, 40)
+
+        assert update_rollups() == 0
+
+        # 늦게 커밋된 행은 id와 무관하게 updated_at이 지연 구간을 지난 뒤 집계된다
+        WeatherData.objects.filter(pk=row.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+        assert update_rollups() == 1
+        assert WeatherHourly.objects.get().sample_count == 1
+
+    def test_upserted_row_reaggregates_its_buckets(self):
+        reading(9, 0, 40)
+        row = reading(9, 30, 60)
+        update_rollups()
+
+        WeatherData.objects.filter(pk=row.pk).update(aqi=100, updated_at=timezone.now())
+        assert update_rollups() == 1
+
+        nine = WeatherHourly.objects.get()
+        assert (nine.sample_count, nine.aqi_max, nine.aqi_avg) == (2, 100, 70)
+        day = WeatherDaily.objects.get()
+        assert (day.sample_count, day.aqi_sum) == (2, 140)
+
+    def test_rebuild_matches_incremental(self):
+        for minute in range(0, 60, 10):
+            reading(9, minute, minute)
+            update_rollups()
+        incremental = WeatherDaily.objects.values().get()
+
+        rebuild_rollups()
+
+        rebuilt = WeatherDaily.objects.values().get()
+        for key in ("sample_count", "aqi_min", "aqi_max", "aqi_avg", "aqi_sum", "aqi_count"):
+            assert rebuilt[key] == incremental[key]
+
+
+class TestRollupViewSets:
+    @pytest.fixture
+    def api_client(self) -> APIClient:
+        client = APIClient()
+        client.force_authenticate(User.objects.create(email="a@example.com", nickname="a"))
+        return client
+
+    def test_hourly_filters_by_district_and_range(self, api_client: APIClient):
+        for hour in (8, 9, 10):
+            reading(hour, 0, 50)
+        WeatherDataFactory(district="마포구", forecast_time=datetime(2024, 5, 1, 9, tzinfo=SEOUL))
+        update_rollups()
+
+        response = api_client.get(
+            "/api/weather-hourly/",
+            {"district": "강남구", "start": "2024-05-01T09:00:00+09:00", "end": "2024-05-01T10:00:00+09:00"},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert [row["bucket"] for row in response.data] == ["2024-05-01T09:00:00+09:00"]
+        assert response.data[0]["aqi_avg"] == 50
+        assert "aqi_sum" not in response.data[0]
+
+    def test_daily(self, api_client: APIClient):
+        reading(9, 0, 50)
+        update_rollups()
+
+        response = api_client.get("/api/weather-daily/", {"district": "강남구", "start": "2024-05-01"})
+
+        assert [row["bucket"] for row in response.data] == ["2024-05-01"]
+
+    @pytest.mark.parametrize(
+        ("url", "params"),
+        [
+            ("/api/weather-hourly/", {"start": "2024-13-01T00:00:00"}),
+            ("/api/weather-hourly/", {"end": "yesterday"}),
+            ("/api/weather-daily/", {"start": "2024-02-30"}),
+        ],
+    )
+    def test_invalid_range_returns_400(self, api_client: APIClient, url: str, params: dict):
+        response = api_client.get(url, params)
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert set(response.data) == set(params)
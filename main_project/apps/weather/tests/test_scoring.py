@@ -0,0 +1,79 @@
+import itertools
+import random
+
+import numpy as np
+
+from main_project.apps.weather.scoring import calculate_walking_score
+from main_project.apps.weather.scoring import calculate_walking_scores
+
+
+def legacy_walking_score(data: dict) -> int:
+    # 기준표 도입 전 WeatherService._calculate_walking_score 구현
+    score = 100
+    if data["aqi"]:
+        if data["aqi"] > 300:
+            score -= 50
+        elif data["aqi"] > 200:
+            score -= 40
+        elif data["aqi"] > 150:
+            score -= 30
+        elif data["aqi"] > 100:
+            score -= 20
+        elif data["aqi"] > 50:
+            score -= 10
+    if data["temperature"]:
+        if data["temperature"] < 5 or data["temperature"] > 35:
+            score -= 30
+        elif data["temperature"] < 10 or data["temperature"] > 30:
+            score -= 20
+        elif data["temperature"] < 15 or data["temperature"] > 25:
+            score -= 10
+    if data["pm25"]:
+        if data["pm25"] > 150:
+            score -= 20
+        elif data["pm25"] > 100:
+            score -= 15
+        elif data["pm25"] > 50:
+            score -= 10
+    return max(0, min(score, 100))
+
+
+AQI_VALUES = [None, 0, 1, 50, 51, 100, 101, 150, 151, 200, 201, 300, 301, 500]
+TEMPERATURE_VALUES = [None, 0.0, -10.0, 4.9, 5.0, 9.9, 10.0, 14.9, 15.0, 20.0, 25.0, 25.1, 30.0, 30.1, 35.0, 35.1]
+PM25_VALUES = [None, 0.0, 50.0, 50.5, 100.0, 100.5, 150.0, 150.5, 400.0]
+BOUNDARY_GRID = list(itertools.product(AQI_VALUES, TEMPERATURE_VALUES, PM25_VALUES))
+
+
+def test_scalar_matches_legacy():
+    for aqi, temperature, pm25 in BOUNDARY_GRID:
+        expected = legacy_walking_score({"aqi": aqi, "temperature": temperature, "pm25": pm25})
+        assert calculate_walking_score(aqi, temperature, pm25) == expected, (aqi, temperature, pm25)
+
+
+def test_batch_matches_scalar_on_boundaries():
+    aqi, temperature, pm25 = zip(*BOUNDARY_GRID, strict=True)
+    expected = [calculate_walking_score(*row) for row in BOUNDARY_GRID]
+
+    assert calculate_walking_scores(aqi, temperature, pm25).tolist() == expected
+
+
+def test_batch_matches_scalar_on_random_rows():
+    rng = random.Random(0)
+    rows = [
+        (
+            rng.choice([None, rng.randint(0, 500)]),
+            rng.choice([None, round(rng.uniform(-20, 45), 1)]),
+            rng.choice([None, round(rng.uniform(0, 300), 1)]),
+        )
+        for _ in range(5000)
+    ]
+    aqi, temperature, pm25 = zip(*rows, strict=True)
+
+    scores = calculate_walking_scores(aqi, temperature, pm25)
+
+    assert scores.dtype == np.int64
+    assert scores.tolist() == [calculate_walking_score(*row) for row in rows]
+
+
+def test_batch_accepts_empty_columns():
+    assert calculate_walking_scores([], [], []).tolist() == []
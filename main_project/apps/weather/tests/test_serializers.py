@@ -0,0 +1,57 @@
+from datetime import datetime
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from main_project.apps.weather.api.renderers import ORJSONRenderer
+from main_project.apps.weather.api.serializers import WeatherDataSerializer
+from main_project.apps.weather.models import WeatherData
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+
+pytestmark = pytest.mark.django_db
+
+SEOUL = ZoneInfo("Asia/Seoul")
+START = datetime(2024, 5, 1, 0, 30, 15, 123456, tzinfo=SEOUL)
+
+
+def fast_rows(fields=None):
+    request = Request(APIRequestFactory().get("/", {"fields": ",".join(fields)} if fields else {}))
+    representation = WeatherDataSerializer.values_representation(request)
+    rows = WeatherData.objects.order_by("id").values(*representation.columns)
+    return [representation.to_representation(row) for row in rows]
+
+
+def drf_rows():
+    queryset = WeatherData.objects.select_related("walking_condition").order_by("id")
+    return WeatherDataSerializer(queryset, many=True).data
+
+
+class TestValuesRepresentation:
+    def test_matches_model_serializer_byte_for_byte(self):
+        WeatherDataFactory(forecast_time=START)
+        WeatherDataFactory(forecast_time=START + timedelta(hours=1), walking_condition__warning="미세먼지 주의")
+        # 비어 있는 측정값과 WalkingCondition이 없는 행
+        WeatherDataFactory(forecast_time=START, aqi=None, pm25=None, precipitation=None, walking_condition=None)
+
+        renderer = JSONRenderer()
+        assert renderer.render(fast_rows()) == renderer.render(drf_rows())
+
+    def test_sparse_fieldset_matches(self):
+        WeatherDataFactory()
+        fields = {"id", "aqi", "walking_condition"}
+
+        expected = [{key: row[key] for key in row if key in fields} for row in drf_rows()]
+        assert fast_rows(fields) == expected
+
+
+class TestORJSONRenderer:
+    def test_matches_json_renderer(self):
+        WeatherDataFactory(forecast_time=START)
+        data = {"results": drf_rows(), "next": None}
+
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
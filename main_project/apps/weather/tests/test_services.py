@@ -0,0 +1,155 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from main_project.apps.weather.cache import WeatherCache
+from main_project.apps.weather.models import WeatherData
+from main_project.apps.weather.providers import WeatherPipeline
+from main_project.apps.weather.services import WeatherService
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def weather_cache(settings) -> WeatherCache:
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    settings.WEATHER_FETCH_WAIT_TIMEOUT = 1.0
+    settings.WEATHER_FETCH_POLL_INTERVAL = 0.01
+    cache = WeatherCache()
+    cache.cache.clear()
+    return cache
+
+
+class TestSingleFlight:
+    def test_follower_reuses_leader_result(self, weather_cache: WeatherCache):
+        weather_data = WeatherDataFactory(district="강남구")
+        service = WeatherService(cache=weather_cache)
+        assert weather_cache.acquire_lock("강남구", "역삼동")
+
+        timer = threading.Timer(0.05, weather_cache.set, ("강남구", "역삼동", weather_data))
+        timer.start()
+        with mock.patch.object(service, "fetch_weather_data") as fetch:
+            assert service.get_weather_data("강남구", "역삼동") == weather_data
+        timer.join()
+
+        fetch.assert_not_called()
+        assert weather_cache.stats()["coalesced"] == 1
+
+    def test_follower_falls_back_when_leader_fails(self, weather_cache: WeatherCache):
+        last_known = WeatherDataFactory(district="강남구", neighborhood="역삼동")
+        service = WeatherService(cache=weather_cache)
+        token = weather_cache.acquire_lock("강남구", "역삼동")
+
+        timer = threading.Timer(0.05, weather_cache.release_lock, ("강남구", "역삼동", token))
+        timer.start()
+        assert service.get_weather_data("강남구", "역삼동") == last_known
+        timer.join()
+
+        assert weather_cache.stats()["fallback"] == 1
+
+    def test_leader_falls_back_to_last_known_row(self, weather_cache: WeatherCache):
+        now = timezone.now()
+        WeatherDataFactory(district="강남구", neighborhood="역삼동", forecast_time=now - timedelta(days=2))
+        WeatherDataFactory(district="강남구", neighborhood="역삼동", forecast_time=now - timedelta(hours=2))
+        latest = WeatherDataFactory(district="강남구", neighborhood="역삼동", forecast_time=now - timedelta(hours=1))
+        # 같은 구의 다른 동 행은 더 최근이어도 대체 값으로 쓰지 않는다
+        WeatherDataFactory(district="강남구", neighborhood="삼성동", forecast_time=now)
+        service = WeatherService(cache=weather_cache)
+
+        with mock.patch.object(service, "fetch_weather_data", side_effect=Exception("down")):
+            assert service.get_weather_data("강남구", "역삼동") == latest
+
+        assert not weather_cache.is_locked("강남구", "역삼동")
+
+    def test_fallback_ignores_rows_outside_recent_window(self, weather_cache: WeatherCache):
+        WeatherDataFactory(district="강남구", neighborhood="역삼동", forecast_time=timezone.now() - timedelta(days=2))
+        service = WeatherService(cache=weather_cache)
+
+        with (
+            mock.patch.object(service, "fetch_weather_data", side_effect=Exception("down")),
+            pytest.raises(Exception, match="down"),
+        ):
+            service.get_weather_data("강남구", "역삼동")
+
+    def test_leader_raises_without_fallback(self, weather_cache: WeatherCache):
+        service = WeatherService(cache=weather_cache)
+
+        with (
+            mock.patch.object(service, "fetch_weather_data", side_effect=Exception("down")),
+            pytest.raises(Exception, match="down"),
+        ):
+            service.get_weather_data("강남구", "역삼동")
+
+        assert not weather_cache.is_locked("강남구", "역삼동")
+
+    def test_lock_is_exclusive(self, weather_cache: WeatherCache):
+        token = weather_cache.acquire_lock("강남구", "역삼동")
+        assert token
+        assert weather_cache.acquire_lock("강남구 ", "역삼동") is None
+
+        weather_cache.release_lock("강남구", "역삼동", "someone-else")
+        assert weather_cache.is_locked("강남구", "역삼동")
+        weather_cache.release_lock("강남구", "역삼동", token)
+        assert not weather_cache.is_locked("강남구", "역삼동")
+
+
+class TestGetMany:
+    def test_fetches_only_misses_and_reports_failures(self, weather_cache: WeatherCache):
+        now = timezone.now()
+        cached = WeatherDataFactory(district="강남구")
+        weather_cache.set("강남구", "역삼동", cached)
+        # 신선도는 관측 시각(정각)이 아니라 저장 시각(updated_at) 기준이다
+        fresh_row = WeatherDataFactory(
+            district="마포구", neighborhood="합정동", forecast_time=now.replace(minute=0, second=0, microsecond=0),
+        )
+        WeatherDataFactory(district="서초구", neighborhood="반포동", forecast_time=now - timedelta(hours=2))
+        stale_row = WeatherDataFactory(district="종로구", neighborhood="사직동", forecast_time=now - timedelta(hours=3))
+        WeatherData.objects.exclude(pk=fresh_row.pk).update(updated_at=now - timedelta(hours=2))
+        fetched = WeatherDataFactory.build(district="서초구")
+        service = WeatherService(cache=weather_cache)
+
+        locations = [("강남구", "역삼동"), ("마포구", "합정동"), ("서초구", "반포동"), ("종로구", "사직동"), ("중구", "명동")]
+        with mock.patch.object(service, "refresh_many") as refresh_many:
+            refresh_many.return_value = {
+                ("서초구", "반포동"): fetched,
+                ("종로구", "사직동"): Exception("down"),
+                ("중구", "명동"): Exception("down"),
+            }
+            results = service.get_many(locations)
+
+        refresh_many.assert_called_once_with([("서초구", "반포동"), ("종로구", "사직동"), ("중구", "명동")])
+        assert list(results) == locations
+        assert results[("강남구", "역삼동")] == cached
+        assert results[("마포구", "합정동")] == fresh_row
+        assert results[("서초구", "반포동")] is fetched
+        # 조회에 실패해도 최근 DB 값이 있으면 그 값을, 없으면 위치별 예외를 돌려준다
+        assert results[("종로구", "사직동")] == stale_row
+        assert str(results[("중구", "명동")]) == "down"
+        assert weather_cache.peek("마포구", "합정동")[1]
+
+    def test_other_neighborhood_in_district_is_not_reused(self, weather_cache: WeatherCache):
+        WeatherDataFactory(district="강남구", neighborhood="삼성동", aqi=250, forecast_time=timezone.now())
+        fetched = WeatherDataFactory.build(district="강남구", neighborhood="역삼동")
+        service = WeatherService(cache=weather_cache)
+
+        with mock.patch.object(service, "refresh_many") as refresh_many:
+            refresh_many.return_value = {("강남구", "역삼동"): fetched}
+            results = service.get_many([("강남구", "역삼동")])
+
+        refresh_many.assert_called_once_with([("강남구", "역삼동")])
+        assert results[("강남구", "역삼동")] is fetched
+
+
+class TestPipeline:
+    def test_pipeline_is_built_once(self, weather_cache: WeatherCache):
+        with mock.patch.object(WeatherPipeline, "from_settings") as from_settings:
+            service = WeatherService(cache=weather_cache)
+            assert service.pipeline is service.pipeline
+
+        from_settings.assert_called_once_with(service.index)
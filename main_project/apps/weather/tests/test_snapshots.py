@@ -0,0 +1,170 @@
+from datetime import time
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import orjson
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from main_project.apps.users.models import User
+from main_project.apps.weather.cache import WeatherCache
+from main_project.apps.weather.circuit import CircuitOpenError
+from main_project.apps.weather.models import LocationWalkSnapshot
+from main_project.apps.weather.providers import FixtureProvider
+from main_project.apps.weather.providers import WeatherPipeline
+from main_project.apps.weather.services import WeatherService
+from main_project.apps.weather.snapshots import WalkCardStore
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+
+pytestmark = pytest.mark.django_db
+
+AIR = {"aqi": 42, "temperature": 18.0, "humidity": 40.0, "pm10": 30.0, "pm25": 12.0}
+PARAMS = {"district": "강남구", "neighborhood": "역삼동"}
+
+
+@pytest.fixture
+def cache(settings) -> WeatherCache:
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    cache = WeatherCache()
+    cache.cache.clear()
+    return cache
+
+
+@pytest.fixture
+def service(cache: WeatherCache) -> WeatherService:
+    return WeatherService(cache=cache, pipeline=WeatherPipeline([FixtureProvider({"*": AIR}, required=True)]))
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(User.objects.create(email="a@example.com", nickname="a"))
+    return client
+
+
+def make_reading(**overrides) -> dict:
+    reading = {
+        "district": "강남구",
+        "aqi": 42,
+        "temperature": 18.0,
+        "humidity": 40.0,
+        "wind_speed": 1.0,
+        "pm10": 30.0,
+        "pm25": 12.0,
+        "precipitation": 0.0,
+        "precipitation_type": None,
+        "walking_score": 90,
+        "forecast_time": timezone.now(),
+    }
+    reading.update(overrides)
+    return reading
+
+
+class TestSaveSnapshots:
+    def test_save_writes_snapshot_and_card(self, service: WeatherService, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            weather_data = service.save_many([make_reading()], [("강남구", " 역삼동 ")])[0]
+
+        snapshot = LocationWalkSnapshot.objects.get()
+        assert (snapshot.district, snapshot.neighborhood) == ("강남구", "역삼동")
+        assert snapshot.weather_data_id == weather_data.pk
+        assert (snapshot.best_time_start, snapshot.best_time_end) == (time(6, 0), time(9, 0))
+
+        card, is_fresh = service.cards.get("강남구", "역삼동")
+        assert is_fresh
+        assert orjson.loads(card)["walking_score"] == 90  # noqa: PLR2004
+
+    def test_refresh_updates_existing_snapshot(self, service: WeatherService):
+        service.save_many([make_reading()], [("강남구", "역삼동")])
+        service.save_many([make_reading(walking_score=40)], [("강남구", "역삼동")])
+
+        assert LocationWalkSnapshot.objects.get().walking_score == 40  # noqa: PLR2004
+
+    def test_without_locations_skips_snapshots(self, service: WeatherService):
+        service.save_many([make_reading()])
+
+        assert not LocationWalkSnapshot.objects.exists()
+
+
+class TestWalkCardStore:
+    def test_load_repopulates_cache_from_snapshot(self, service: WeatherService):
+        service.save_many([make_reading()], [("강남구", "역삼동")])
+        store = WalkCardStore(service.cache)
+        assert store.get("강남구", "역삼동") == (None, False)
+
+        card, is_fresh = store.load("강남구", "역삼동")
+
+        assert is_fresh
+        assert store.get("강남구", "역삼동") == (card, True)
+
+
+class TestWalkCardView:
+    def test_cache_hit_skips_database(self, api_client: APIClient, service: WeatherService,
+                                      django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            service.save_many([make_reading()], [("강남구", "역삼동")])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get("/api/weather/card/", PARAMS)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "application/json"
+        assert orjson.loads(response.content)["aqi"] == 42  # noqa: PLR2004
+        assert not [query for query in queries if "SELECT" in query["sql"]]
+
+    def test_missing_snapshot_fetches(self, api_client: APIClient, cache: WeatherCache, settings):
+        settings.WEATHER_PROVIDERS = [
+            {"class": "main_project.apps.weather.providers.FixtureProvider", "readings": {"*": AIR}, "required": True},
+        ]
+
+        response = api_client.get("/api/weather/card/", PARAMS)
+
+        assert response.status_code == HTTPStatus.OK
+        assert orjson.loads(response.content)["aqi"] == 42  # noqa: PLR2004
+        assert LocationWalkSnapshot.objects.filter(district="강남구", neighborhood="역삼동").exists()
+
+    def test_fetch_failure_serves_stale_card(self, api_client: APIClient, service: WeatherService):
+        service.save_many([make_reading()], [("강남구", "역삼동")])
+        LocationWalkSnapshot.objects.update(updated_at=timezone.now() - timedelta(days=1))
+
+        with mock.patch.object(WeatherService, "get_weather_data", side_effect=CircuitOpenError("open")):
+            response = api_client.get("/api/weather/card/", PARAMS)
+
+        assert response.status_code == HTTPStatus.OK
+        assert orjson.loads(response.content)["aqi"] == 42  # noqa: PLR2004
+
+    def test_stale_fallback_is_not_saved_as_card(self, api_client: APIClient, cache: WeatherCache):
+        weather_data = WeatherDataFactory(district="강남구", forecast_time=timezone.now() - timedelta(hours=5))
+        weather_data.is_stale = True
+
+        with mock.patch.object(WeatherService, "get_weather_data", return_value=weather_data):
+            response = api_client.get("/api/weather/card/", PARAMS)
+
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert not LocationWalkSnapshot.objects.exists()
+
+    def test_stale_fallback_keeps_old_card(self, api_client: APIClient, service: WeatherService):
+        service.save_many([make_reading()], [("강남구", "역삼동")])
+        LocationWalkSnapshot.objects.update(updated_at=timezone.now() - timedelta(days=1))
+        weather_data = WeatherDataFactory(district="강남구", aqi=300, forecast_time=timezone.now() - timedelta(hours=5))
+        weather_data.is_stale = True
+
+        with mock.patch.object(WeatherService, "get_weather_data", return_value=weather_data):
+            response = api_client.get("/api/weather/card/", PARAMS)
+
+        assert response.status_code == HTTPStatus.OK
+        assert orjson.loads(response.content)["aqi"] == 42  # noqa: PLR2004
+        assert LocationWalkSnapshot.objects.get().aqi == 42  # noqa: PLR2004
+
+    def test_open_circuit_without_card_returns_503(self, api_client: APIClient, cache: WeatherCache):
+        with mock.patch.object(WeatherService, "get_weather_data", side_effect=CircuitOpenError("open")):
+            response = api_client.get("/api/weather/card/", PARAMS)
+
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert int(response["Retry-After"]) >= 1
@@ -0,0 +1,140 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from main_project.apps.weather.cache import WeatherCache
+from main_project.apps.weather.services import WeatherService
+from main_project.apps.weather.stations import DISTRICT_CENTROIDS
+from main_project.apps.weather.stations import LocationIndex
+from main_project.apps.weather.stations import Station
+from main_project.apps.weather.stations import build_index
+from main_project.apps.weather.tests.waqi_stub import WaqiStubServer
+from main_project.apps.weather.tests.waqi_stub import make_feed
+
+pytestmark = pytest.mark.django_db
+
+STATIONS = [
+    Station("1", "강남구", 37.5172, 127.0473),
+    Station("2", "종로구", 37.5720, 126.9794),
+]
+NEIGHBORHOODS = [
+    ("강남구", "역삼동", 37.5006, 127.0366),
+    ("강남구", "삼성동", 37.5145, 127.0565),
+    ("종로구", "청운동", 37.5861, 126.9696),
+    ("제주시", "연동", 33.4890, 126.4983),
+]
+
+
+@pytest.fixture
+def index() -> LocationIndex:
+    return LocationIndex(build_index(STATIONS, NEIGHBORHOODS, max_distance_km=50)["locations"])
+
+
+@pytest.fixture
+def service(settings, index: LocationIndex) -> WeatherService:
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    cache = WeatherCache()
+    cache.cache.clear()
+    return WeatherService(cache=cache, index=index)
+
+
+class TestBuildIndex:
+    def test_maps_to_nearest_station(self):
+        locations = build_index(STATIONS, NEIGHBORHOODS)["locations"]
+
+        assert locations["강남구|역삼동"] == "1"
+        assert locations["강남구|삼성동"] == "1"
+        assert locations["종로구|청운동"] == "2"
+
+    def test_far_neighborhoods_are_left_unmapped(self):
+        index = build_index(STATIONS, NEIGHBORHOODS, max_distance_km=50)
+
+        assert "제주시|연동" not in index["locations"]
+        assert set(index["stations"]) == {"1", "2"}
+
+    def test_command_writes_index(self, tmp_path):
+        stations = tmp_path / "stations.csv"
+        stations.write_text(
+            "station_id,name,lat,lon\n" + "".join(f"{s.id},{s.name},{s.lat},{s.lon}\n" for s in STATIONS),
+            encoding="utf-8",
+        )
+        neighborhoods = tmp_path / "neighborhoods.csv"
+        neighborhoods.write_text(
+            "district,neighborhood,lat,lon\n" + "".join(f"{d},{n},{lat},{lon}\n" for d, n, lat, lon in NEIGHBORHOODS),
+            encoding="utf-8",
+        )
+        output = tmp_path / "index.json"
+
+        call_command(
+            "build_location_index",
+            stations=stations,
+            neighborhoods=neighborhoods,
+            output=output,
+            max_distance_km=50,
+        )
+
+        index = LocationIndex.from_file(output)
+        assert index.resolve("강남구", "역삼동") == ("강남구", "@1")
+        assert json.loads(output.read_text(encoding="utf-8"))["stations"]["2"]["name"] == "종로구"
+
+
+class TestLocationIndex:
+    def test_resolve(self, index: LocationIndex):
+        assert index.resolve("강남구", "삼성동") == ("강남구", "@1")
+        assert index.resolve(" 강남구", "삼성동 ") == (" 강남구", "@1")
+
+    def test_unmapped_location_is_unchanged(self, index: LocationIndex):
+        assert index.resolve("제주시", "연동") == ("제주시", "연동")
+        assert index.resolve("강남구", "@1") == ("강남구", "@1")
+
+    def test_members(self, index: LocationIndex):
+        members = index.members(" 강남구", "@1")
+
+        assert ("강남구", "삼성동") in members
+        assert all(neighborhood != "@1" for _, neighborhood in members)
+        assert index.members("제주시", "연동") == [("제주시", "연동")]
+
+    def test_feed_location(self):
+        assert LocationIndex.feed_location("강남구", "@1") == "@1"
+        assert LocationIndex.feed_location("제주시", "연동") == "제주시-연동"
+
+    def test_coordinates(self):
+        index = LocationIndex(
+            build_index(STATIONS, NEIGHBORHOODS, max_distance_km=50)["locations"],
+            {"1": {"name": "강남구", "lat": 37.5172, "lon": 127.0473}},
+        )
+
+        assert index.coordinates("강남구", "삼성동") == (37.5172, 127.0473)
+        assert index.coordinates("종로구", "청운동") == DISTRICT_CENTROIDS["종로구"]
+        assert LocationIndex().coordinates(" 마포구", "합정동") == DISTRICT_CENTROIDS["마포구"]
+        assert LocationIndex().coordinates("제주시", "연동") is None
+
+    def test_missing_file_is_empty(self, tmp_path):
+        assert LocationIndex.from_file(tmp_path / "missing.json").locations == {}
+
+
+class TestSharedStation:
+    def test_neighborhoods_share_one_fetch(self, service: WeatherService, settings):
+        with WaqiStubServer({"@1": make_feed(aqi=7)}) as server:
+            settings.WEATHER_API_BASE_URL = server.base_url
+            first = service.get_weather_data("강남구", "역삼동")
+            second = service.get_weather_data("강남구", "삼성동")
+
+        assert server.requests == ["@1"]
+        assert first.pk == second.pk
+        assert first.aqi == 7
+
+    def test_get_many_keeps_requested_locations(self, service: WeatherService, settings):
+        locations = [("강남구", "역삼동"), ("강남구", "삼성동"), ("종로구", "청운동")]
+        feeds = {"@1": make_feed(aqi=1), "@2": make_feed(aqi=2)}
+
+        with WaqiStubServer(feeds) as server:
+            settings.WEATHER_API_BASE_URL = server.base_url
+            results = service.get_many(locations)
+
+        assert list(results) == locations
+        assert [results[location].aqi for location in locations] == [1, 1, 2]
+        assert sorted(server.requests) == ["@1", "@2"]
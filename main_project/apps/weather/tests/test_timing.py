@@ -0,0 +1,74 @@
+import logging
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from main_project.apps.users.models import User
+from main_project.apps.weather import timing
+from main_project.apps.weather.timing import RequestTimingMiddleware
+from main_project.apps.weather.timing import TimedCache
+
+pytestmark = pytest.mark.django_db
+
+
+def view(request):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.execute("SELECT 2")
+    TimedCache(caches["default"]).get("weather:test")
+    timing.add("upstream", 0.25)
+    return HttpResponse("ok")
+
+
+@pytest.fixture
+def timing_settings(settings):
+    settings.REQUEST_TIMING_SAMPLE_RATE = 1.0
+    settings.REQUEST_TIMING_SLOW_THRESHOLD_MS = 10_000
+    settings.REQUEST_TIMING_HEADER = True
+    return settings
+
+
+class TestRequestTimingMiddleware:
+    def test_server_timing_header(self, timing_settings):
+        response = RequestTimingMiddleware(view)(RequestFactory().get("/api/weather/"))
+
+        header = response["Server-Timing"]
+        assert header.startswith("total;dur=")
+        assert 'desc="2 queries"' in header
+        assert "cache;dur=" in header
+        assert "upstream;dur=250.0" in header
+        # 요청이 끝나면 커넥션 wrapper와 contextvar가 정리된다
+        assert connection.execute_wrappers == []
+        assert timing.current() is None
+
+    def test_header_is_staff_only_by_default(self, timing_settings):
+        timing_settings.REQUEST_TIMING_HEADER = False
+        request = RequestFactory().get("/api/weather/")
+        request.user = AnonymousUser()
+        staff_request = RequestFactory().get("/api/weather/")
+        staff_request.user = User(email="admin@example.com", nickname="admin", is_staff=True)
+
+        assert "Server-Timing" not in RequestTimingMiddleware(view)(request)
+        assert "Server-Timing" in RequestTimingMiddleware(view)(staff_request)
+
+    def test_unsampled_requests_skip_breakdown(self, timing_settings):
+        timing_settings.REQUEST_TIMING_SAMPLE_RATE = 0.0
+
+        response = RequestTimingMiddleware(view)(RequestFactory().get("/api/weather/"))
+
+        assert "Server-Timing" not in response
+
+    def test_slow_request_log(self, timing_settings, caplog):
+        timing_settings.REQUEST_TIMING_SLOW_THRESHOLD_MS = 0
+
+        with caplog.at_level(logging.WARNING, logger="main_project.apps.weather.timing"):
+            RequestTimingMiddleware(view)(RequestFactory().get("/api/weather/"))
+
+        (record,) = caplog.records
+        assert record.getMessage().startswith("slow_request method=GET path=/api/weather/ status=200")
+        assert record.request_timing["db_queries"] == 2  # noqa: PLR2004
+        assert record.request_timing["upstream_ms"] == 250.0  # noqa: PLR2004
@@ -0,0 +1,248 @@
+from base64 import b64decode
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from main_project.apps.users.models import User
+from main_project.apps.users.models import UserLocation
+from main_project.apps.weather.circuit import CircuitOpenError
+from main_project.apps.weather.models import WeatherData
+from main_project.apps.weather.services import WeatherService
+from main_project.apps.weather.tests.factories import WeatherDataFactory
+
+pytestmark = pytest.mark.django_db
+
+SEOUL = ZoneInfo("Asia/Seoul")
+START = datetime(2024, 5, 1, tzinfo=SEOUL)
+
+
+@pytest.fixture
+def user() -> User:
+    return User.objects.create(email="a@example.com", nickname="a")
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class TestWeatherList:
+    def test_cursor_pagination_walks_every_row_once(self, api_client: APIClient):
+        rows = [WeatherDataFactory(forecast_time=START + timedelta(hours=n)) for n in range(7)]
+        # 같은 forecast_time을 가진 행도 id로 순서가 정해진다
+        rows += WeatherDataFactory.create_batch(3, forecast_time=START + timedelta(hours=3))
+
+        seen = []
+        response = api_client.get("/api/weather/", {"page_size": 3})
+        while True:
+            assert response.status_code == HTTPStatus.OK
+            seen += [row["id"] for row in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = api_client.get(response.data["next"])
+
+        assert sorted(seen) == sorted(row.pk for row in rows)
+        assert len(seen) == len(set(seen))
+
+    def test_cursor_filters_on_forecast_time_and_id(self, api_client: APIClient):
+        rows = WeatherDataFactory.create_batch(5, forecast_time=START)
+
+        first = api_client.get("/api/weather/", {"page_size": 2})
+        second = api_client.get(first.data["next"])
+        previous = api_client.get(second.data["previous"])
+
+        ids = sorted((row.pk for row in rows), reverse=True)
+        assert [row["id"] for row in second.data["results"]] == ids[2:4]
+        assert [row["id"] for row in previous.data["results"]] == ids[:2]
+        # 같은 forecast_time이어도 위치가 유일하므로 offset 없이 (forecast_time, id)만 담긴다
+        cursor = parse_qs(b64decode(parse_qs(urlsplit(second.data["next"]).query)["cursor"][0]).decode())
+        assert "o" not in cursor
+        assert cursor["p"][0].endswith(f"|{ids[3]}")
+
+    def test_invalid_cursor_returns_404(self, api_client: APIClient):
+        response = api_client.get("/api/weather/", {"cursor": "cD1ub3QtYS1kYXRl"})
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_filters_by_district_and_time_range(self, api_client: APIClient):
+        expected = WeatherDataFactory(district="강남구", forecast_time=START + timedelta(hours=1))
+        WeatherDataFactory(district="강남구", forecast_time=START + timedelta(hours=5))
+        WeatherDataFactory(district="마포구", forecast_time=START + timedelta(hours=1))
+
+        response = api_client.get(
+            "/api/weather/",
+            {"district": "강남구", "start": START.isoformat(), "end": (START + timedelta(hours=2)).isoformat()},
+        )
+
+        assert [row["id"] for row in response.data["results"]] == [expected.pk]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"start": "2024-02-30T00:00:00"},
+            {"end": "garbage"},
+        ],
+    )
+    def test_invalid_time_range_returns_400(self, api_client: APIClient, params: dict):
+        response = api_client.get("/api/weather/", params)
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert set(response.data) == set(params)
+
+    def test_sparse_fieldset(self, api_client: APIClient):
+        weather_data = WeatherDataFactory()
+
+        response = api_client.get("/api/weather/", {"fields": "id,aqi,walking_score"})
+        assert response.data["results"] == [
+            {"id": weather_data.pk, "aqi": weather_data.aqi, "walking_score": weather_data.walking_score},
+        ]
+
+        response = api_client.get(f"/api/weather/{weather_data.pk}/", {"fields": "id, walking_condition"})
+        assert set(response.data) == {"id", "walking_condition"}
+
+
+class TestConditionalGet:
+    def test_retrieve_returns_304_for_matching_etag(self, api_client: APIClient):
+        weather_data = WeatherDataFactory()
+        url = f"/api/weather/{weather_data.pk}/"
+
+        response = api_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response["Last-Modified"]
+        assert "private" in response["Cache-Control"]
+        assert "public" not in response["Cache-Control"]
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.content == b""
+        assert response["ETag"]
+
+    def test_etag_changes_with_values_and_fields(self, api_client: APIClient):
+        weather_data = WeatherDataFactory(walking_score=10)
+        url = f"/api/weather/{weather_data.pk}/"
+        etag = api_client.get(url)["ETag"]
+
+        assert api_client.get(url, {"fields": "id"})["ETag"] != etag
+
+        # 같은 행이 upsert로 덮어써지면 다시 내려준다
+        weather_data.walking_score = 90
+        weather_data.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["walking_score"] == 90  # noqa: PLR2004
+
+    def test_if_modified_since(self, api_client: APIClient):
+        weather_data = WeatherDataFactory()
+        url = f"/api/weather/{weather_data.pk}/"
+        last_modified = api_client.get(url)["Last-Modified"]
+
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_etag_changes_with_walking_condition(self, api_client: APIClient):
+        weather_data = WeatherDataFactory()
+        url = f"/api/weather/{weather_data.pk}/"
+        etag = api_client.get(url)["ETag"]
+
+        condition = weather_data.walking_condition
+        condition.best_time_start = time(14, 0)
+        condition.best_time_end = time(17, 0)
+        condition.save()
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == HTTPStatus.OK
+
+    def test_upsert_moves_last_modified(self, api_client: APIClient):
+        weather_data = WeatherDataFactory(created_at=START)
+        url = f"/api/weather/{weather_data.pk}/"
+        last_modified = api_client.get(url)["Last-Modified"]
+
+        WeatherData.objects.filter(pk=weather_data.pk).update(walking_score=5, updated_at=timezone.now() + timedelta(hours=1))
+
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["walking_score"] == 5  # noqa: PLR2004
+
+    def test_current_skips_serialization_when_unchanged(self, api_client: APIClient):
+        # forecast_time은 WAQI 관측 시각(정각)이므로 max-age는 저장 시각 기준이어야 한다
+        weather_data = WeatherDataFactory(forecast_time=timezone.now().replace(minute=0, second=0, microsecond=0))
+        params = {"district": "강남구", "neighborhood": "역삼동"}
+
+        with mock.patch.object(WeatherService, "get_weather_data", return_value=weather_data):
+            response = api_client.get("/api/weather/current/", params)
+            assert response.status_code == HTTPStatus.OK
+            max_age = int(response["Cache-Control"].split("max-age=")[1].split(",")[0])
+            assert 0 < max_age <= 60 * 60
+
+            with mock.patch("main_project.apps.weather.api.views.WeatherViewSet.get_serializer") as get_serializer:
+                response = api_client.get("/api/weather/current/", params, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        get_serializer.assert_not_called()
+
+
+class TestWeatherBulk:
+    def test_defaults_to_user_locations_with_partial_failures(self, api_client: APIClient, user: User):
+        UserLocation.objects.create(user=user, district="마포구", neighborhood="합정동", is_primary=False)
+        UserLocation.objects.create(user=user, district="강남구", neighborhood="역삼동")
+        weather_data = WeatherDataFactory(district="강남구")
+        outcomes = {("강남구", "역삼동"): weather_data, ("마포구", "합정동"): Exception("Weather API Error: down")}
+
+        with mock.patch.object(WeatherService, "get_many", return_value=outcomes) as get_many:
+            response = api_client.get("/api/weather/bulk/")
+
+        get_many.assert_called_once_with([("강남구", "역삼동"), ("마포구", "합정동")])
+        assert response.status_code == HTTPStatus.OK
+        first, second = response.data["results"]
+        assert first["weather_data"]["id"] == weather_data.pk
+        assert first["error"] is None
+        assert second["weather_data"] is None
+        assert second["error"] == "Weather API Error: down"
+
+    def test_explicit_locations(self, api_client: APIClient):
+        locations = [{"district": "중구", "neighborhood": "명동"}]
+
+        with mock.patch.object(WeatherService, "get_many", return_value={("중구", "명동"): Exception("x")}) as get_many:
+            response = api_client.post("/api/weather/bulk/", {"locations": locations}, format="json")
+
+        get_many.assert_called_once_with([("중구", "명동")])
+        assert response.status_code == HTTPStatus.OK
+
+    def test_rejects_too_many_locations(self, api_client: APIClient, settings):
+        locations = [{"district": f"d{n}", "neighborhood": "n"} for n in range(settings.WEATHER_BULK_MAX_LOCATIONS + 1)]
+
+        response = api_client.post("/api/weather/bulk/", {"locations": locations}, format="json")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+class TestWeatherCurrent:
+    def test_flags_stale_data(self, api_client: APIClient):
+        weather_data = WeatherDataFactory()
+        weather_data.is_stale = True
+        params = {"district": "강남구", "neighborhood": "역삼동"}
+
+        with mock.patch.object(WeatherService, "get_weather_data", return_value=weather_data):
+            response = api_client.get("/api/weather/current/", params)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["is_stale"] is True
+
+    def test_open_circuit_returns_503(self, api_client: APIClient):
+        params = {"district": "강남구", "neighborhood": "역삼동"}
+
+        with mock.patch.object(WeatherService, "get_weather_data", side_effect=CircuitOpenError("open")):
+            response = api_client.get("/api/weather/current/", params)
+
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert int(response["Retry-After"]) >= 1
@@ -0,0 +1,30 @@
+from collections.abc import Iterable
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def assert_list_queries_constant(
+    client: APIClient,
+    url: str,
+    max_queries: int,
+    page_sizes: Iterable[int] = (1, 10, 50),
+    params: dict | None = None,
+) -> None:
+    """
+    Fail if a list endpoint issues more than ``max_queries`` queries for any
+    page size, or if the count grows with the page size (an N+1 regression).
+    """
+    counts = {}
+    for page_size in page_sizes:
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {**(params or {}), "page_size": page_size})
+        assert response.status_code < 400, response.data  # noqa: PLR2004
+        counts[page_size] = len(queries)
+        assert len(queries) <= max_queries, (
+            f"{url} issued {len(queries)} queries for page_size={page_size} "
+            f"(max {max_queries}):\n" + "\n".join(q["sql"] for q in queries.captured_queries)
+        )
+
+    assert len(set(counts.values())) == 1, f"{url} query count depends on page size: {counts}"
@@ -0,0 +1,151 @@
+"""
+Local stand-in for api.waqi.info serving ``/feed/<location>/``.
+
+Used by the client tests and by ``benchmarks.load_test``. Latency and error
+injection can be changed while the server is running. It can also be started
+on its own::
+
+    python -m main_project.apps.weather.tests.waqi_stub --port 8081 --latency-ms 80 --error-rate 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import unquote
+from urllib.parse import urlparse
+
+
+def make_feed(aqi: int = 42, temperature: float = 20.0, pm25: float = 12.0, observed_at: str = None) -> dict:
+    return {
+        "status": "ok",
+        "data": {
+            "aqi": aqi,
+            "time": {"iso": observed_at} if observed_at else {},
+            "iaqi": {
+                "t": {"v": temperature},
+                "h": {"v": 50.0},
+                "w": {"v": 1.5},
+                "pm10": {"v": 30.0},
+                "pm25": {"v": pm25},
+            },
+        },
+    }
+
+
+UNKNOWN_STATION = {"status": "error", "data": "Unknown station"}
+
+
+class WaqiStubServer:
+    """
+    ``feeds`` maps locations to payloads. With ``serve_any`` every other location
+    gets ``make_feed()``; otherwise unknown locations get WAQI's error payload.
+
+    ``latency`` (+ up to ``jitter``) seconds are slept before every response, and
+    ``error_rate`` of responses are replaced by ``error_status`` (e.g. 500/503).
+    """
+
+    def __init__(
+        self,
+        feeds: dict | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        serve_any: bool = False,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+    ):
+        self.feeds = feeds or {}
+        self.serve_any = serve_any
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests: list[str] = []
+        self.connections: set[tuple] = set()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/feed/"
+
+    def __enter__(self) -> "WaqiStubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def respond(self, location: str) -> tuple[int, dict | str]:
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)  # noqa: S311
+        if delay:
+            time.sleep(delay)
+        if self.error_rate and random.random() < self.error_rate:  # noqa: S311
+            return self.error_status, "injected upstream error"
+        feed = self.feeds.get(location)
+        if feed is None:
+            feed = make_feed() if self.serve_any else UNKNOWN_STATION
+        return 200, feed
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # noqa: N802
+                location = unquote(urlparse(self.path).path).removeprefix("/feed/").strip("/")
+                stub.requests.append(location)
+                stub.connections.add(self.client_address)
+                status, payload = stub.respond(location)
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local WAQI stub server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    stub = WaqiStubServer(
+        host=args.host,
+        port=args.port,
+        serve_any=True,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    with stub:
+        print(f"WAQI stub listening on {stub.base_url}")  # noqa: T201
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+요청 단위 시간 측정: 전체/DB/캐시/WAQI 시간을 Server-Timing 헤더와 느린 요청 로그로 남긴다.
+
+측정 중인 요청은 contextvar에 RequestTimings를 두고, 캐시(TimedCache)·업스트림
+(metrics.UpstreamTimer) 호출 지점은 ``timing.add()``로 시간을 더한다.
+측정 중이 아니면 add()는 contextvar 조회 한 번으로 끝난다.
+"""
+import logging
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional['RequestTimings']] = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    __slots__ = ('db', 'db_queries', 'cache', 'upstream')
+
+    def __init__(self):
+        self.db = 0.0
+        self.db_queries = 0
+        self.cache = 0.0
+        self.upstream = 0.0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.db_queries += 1
+
+    def header(self, total: float) -> str:
+        return (
+            f'total;dur={total * 1000:.1f}, '
+            f'db;dur={self.db * 1000:.1f};desc="{self.db_queries} queries", '
+            f'cache;dur={self.cache * 1000:.1f}, '
+            f'upstream;dur={self.upstream * 1000:.1f}'
+        )
+
+
+def current() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def add(name: str, seconds: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        setattr(timings, name, getattr(timings, name) + seconds)
+
+
+class TimedCache:
+    """Django 캐시 백엔드를 감싸 측정 중인 요청에서 호출 시간을 cache 항목에 더한다."""
+
+    def __init__(self, cache):
+        self._cache = cache
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._cache, name)
+        if _current.get() is None or not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                add('cache', time.perf_counter() - started)
+        return timed
+
+
+class RequestTimingMiddleware:
+    """
+    MIDDLEWARE 맨 앞에 두어 전체 처리 시간을 잰다.
+
+    REQUEST_TIMING_SAMPLE_RATE 비율의 요청만 DB/캐시/업스트림 시간을 나눠 측정하고,
+    나머지 요청은 전체 시간만 재서 느린 요청 로그에만 쓴다.
+    Server-Timing 헤더는 내부 처리 시간을 드러내므로 측정한 요청 중 스태프 사용자에게만 붙이고,
+    REQUEST_TIMING_HEADER가 켜져 있을 때(로컬 개발)만 모든 사용자에게 붙인다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        self.slow_threshold = settings.REQUEST_TIMING_SLOW_THRESHOLD_MS / 1000
+        self.emit_header = settings.REQUEST_TIMING_HEADER
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            timings = None
+            response = self.get_response(request)
+        else:
+            timings = RequestTimings()
+            response = self._measure(request, timings)
+        total = time.perf_counter() - started
+
+        if timings is not None and (self.emit_header or self._is_staff(request)):
+            response.headers['Server-Timing'] = timings.header(total)
+        if total >= self.slow_threshold:
+            self._log_slow_request(request, response, total, timings)
+        return response
+
+    @staticmethod
+    def _is_staff(request) -> bool:
+        # DRF 인증(토큰 등) 결과도 request.user에 반영된 뒤다
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_staff)
+
+    def _measure(self, request, timings: RequestTimings):
+        wrapper = timings.execute_wrapper
+        wrapper_lists = [connections[alias].execute_wrappers for alias in connections]
+        for execute_wrappers in wrapper_lists:
+            execute_wrappers.append(wrapper)
+        token = _current.set(timings)
+        try:
+            return self.get_response(request)
+        finally:
+            _current.reset(token)
+            for execute_wrappers in wrapper_lists:
+                execute_wrappers.remove(wrapper)
+
+    def _log_slow_request(self, request, response, total: float, timings: Optional[RequestTimings]) -> None:
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+        }
+        if timings is not None:
+            fields.update(
+                db_ms=round(timings.db * 1000, 1),
+                db_queries=timings.db_queries,
+                cache_ms=round(timings.cache * 1000, 1),
+                upstream_ms=round(timings.upstream * 1000, 1),
+            )
+        logger.warning(
+            'slow_request %s', ' '.join(f'{key}={value}' for key, value in fields.items()),
+            extra={'request_timing': fields},
+        )
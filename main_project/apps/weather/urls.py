@@ -1,10 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .api.views import WeatherViewSet
+from .api.views import MetricsView, WeatherDailyViewSet, WeatherHourlyViewSet, WeatherViewSet
 
 router = DefaultRouter()
 router.register(r'weather', WeatherViewSet)
+router.register(r'weather-hourly', WeatherHourlyViewSet)
+router.register(r'weather-daily', WeatherDailyViewSet)
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file